@@ -209,7 +209,7 @@ class Launcher:
 
     def show_inspector_ui(self):
         if not hasattr(self, 'inspector_window') or self.inspector_window is None:
-            self.inspector_window = StateInspectorWindow(self.state_service)
+            self.inspector_window = StateInspectorWindow(self.state_service, debug_overlay=getattr(self, 'debug_manager', None))
         self.inspector_window.show()
         self.inspector_window.raise_()
         self.inspector_window.activateWindow()
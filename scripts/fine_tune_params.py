@@ -5,11 +5,12 @@ import sys
 import time
 import csv
 import collections
+import json
 from concurrent.futures import ThreadPoolExecutor
 
 # Ensure src is in path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-from src.utils.tesseract_api import TesseractAPI
+from src.utils.tesseract_api import TesseractAPI, library_paths
 
 # --- Configuration ---
 FIXED_THRESHOLD = 240
@@ -52,14 +53,14 @@ def get_image_stats(gray_img):
         "mean": float(np.mean(gray_img))
     }
 
-def run_fine_tuning(directory, max_images=1000):
+def run_fine_tuning(directory, max_images=1000, config=None):
     print(f"--- Advanced Fine Tuning (Threshold={FIXED_THRESHOLD}) ---")
     
     # 1. Setup Resources
     project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     words_file = os.path.join(project_root, "data", "ocr_words.txt")
-    dll_path = r"C:\Program Files\Tesseract-OCR\libtesseract-5.dll"
-    tessdata_path = r"C:\Program Files\Tesseract-OCR\tessdata"
+    # Same Tesseract install as the app (config tesseract_cmd / tesseract_lib / tessdata_dir)
+    dll_path, tessdata_path = library_paths(config or {})
     
     if not os.path.exists(words_file):
         print("Words file missing!")
@@ -207,5 +208,12 @@ def run_fine_tuning(directory, max_images=1000):
 
 
 if __name__ == "__main__":
-    target_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "debug_images", "fine tune")
-    run_fine_tuning(target_dir, max_images=1000)
+    # Profile search on the app pipeline: tools/tune_ocr_params.py. This script compares threshold methods per image.
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    target_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join(project_root, "debug_images", "fine tune")
+    config_path = os.path.join(project_root, "data", "config.json")
+    config = {}
+    if os.path.exists(config_path):
+        with open(config_path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+    run_fine_tuning(target_dir, max_images=1000, config=config)
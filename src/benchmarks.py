@@ -0,0 +1,360 @@
+"""
+Benchmarks - Microbenchmarks of the vision and state hot paths
+
+Every benchmark runs on fixed fixtures (seeded synthetic HUD crops, generated
+pattern sets, pre-filled tickets and curves), times each call individually and
+reports median / p99 in microseconds. Results are JSON files; `compare()`
+flags the benchmarks that got slower between two result files.
+
+OCR backend: "lib" loads the Tesseract shared library (config `tesseract_lib` /
+`tessdata_dir`, e.g. /usr/lib/x86_64-linux-gnu/libtesseract.so.5 on Linux),
+"stub" replaces it with a no-op engine so the surrounding code is measured on
+any machine, "auto" tries the library then falls back to the stub.
+"""
+
+import datetime
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.headless import percentile
+from src.logger import logger
+
+
+class SkipBenchmark(Exception):
+    """Raised by a fixture when its benchmark cannot run here (missing module, template...)."""
+
+
+class _StubTessLib:
+    """ctypes-free stand-in for the libtesseract functions VisionEngine calls directly."""
+
+    def __getattr__(self, name):
+        return lambda *args: 0
+
+
+class StubTesseractAPI:
+    """No-op OCR engine: same interface as TesseractAPI, returns an empty reading."""
+
+    def __init__(self):
+        self.lib = _StubTessLib()
+        self.handle = None
+
+    def get_text(self, image):
+        return "", 0
+
+
+def measure(fn: Callable[[], Any], min_time: float = 0.5, min_iterations: int = 20,
+            max_iterations: int = 100000, warmup: int = 3) -> List[float]:
+    """Times each call of `fn` (microseconds) until both min_time and min_iterations are reached."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    clock = time.perf_counter_ns
+    deadline = time.perf_counter() + min_time
+    while len(samples) < max_iterations:
+        t0 = clock()
+        fn()
+        samples.append((clock() - t0) / 1000.0)
+        if len(samples) >= min_iterations and time.perf_counter() >= deadline:
+            break
+    return samples
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "iterations": len(ordered),
+        "median_us": round(percentile(ordered, 50), 3),
+        "p99_us": round(percentile(ordered, 99), 3),
+        "mean_us": round(sum(ordered) / len(ordered), 3),
+        "min_us": round(ordered[0], 3),
+    }
+
+
+class BenchmarkSuite:
+    """
+    Registry of hot-path benchmarks. Fixtures are built lazily (a Vision-only run
+    never imports the StateService) and are deterministic for a given seed.
+    """
+
+    PATTERN_SIZES = (50, 500, 5000)
+    PENDING_TICKETS = 500
+    CURVE_LENGTH = 1680  # One full run (28 min of farming) at 1 Hz
+
+    def __init__(self, config: Dict[str, Any], tess: str = "auto", seed: int = 0,
+                 min_time: float = 0.5, config_path: Optional[str] = None):
+        self.config = dict(config)
+        self.tess_mode = tess
+        self.seed = seed
+        self.min_time = min_time
+        self.config_path = config_path
+        self.tess_backend = None  # "lib" | "stub" once the engine is built
+
+        self._engine = None
+        self._hud = None
+        self._state = None
+        self._workdir = None
+
+        self.benchmarks: List[Tuple[str, Callable[[], Callable[[], Any]]]] = []
+        self._register()
+
+    # --- Fixtures ---
+
+    def hud(self):
+        if self._hud is None:
+            from src.utils.synthetic_hud import SyntheticHUD
+            self._hud = SyntheticHUD(self.config, seed=self.seed)
+        return self._hud
+
+    def engine(self):
+        if self._engine is not None:
+            return self._engine
+        from src.vision_engine import VisionEngine
+        from src.utils.synthetic_hud import SyntheticFrameSource
+
+        engine = VisionEngine(self.config)
+        if engine.tess_api_secondary is not None and self.tess_mode != "stub":
+            self.tess_backend = "lib"
+        elif self.tess_mode == "lib":
+            raise SkipBenchmark("Tesseract library not loaded (set tesseract_lib / tessdata_dir)")
+        else:
+            engine.tess_pool_main = [StubTesseractAPI() for _ in range(3)]
+            engine.tess_api_main = engine.tess_pool_main[0]
+            engine.tess_api_secondary = StubTesseractAPI()
+            self.tess_backend = "stub"
+
+        # One fixed synthetic frame: every ROI grab returns the same crops
+        source = SyntheticFrameSource(self.hud(), kinds=("banner", "level", "runes"), frames=1)
+        source.advance()
+        engine.set_frame_source(source)
+        self._engine = engine
+        return engine
+
+    def state(self):
+        if self._state is not None:
+            return self._state
+        try:
+            from src.headless import prepare_workdir
+            from src.replay import ReplayVisionService
+            from src.core.clock import VirtualClock
+            from src.services.database_service import DatabaseService
+            from src.services.state_service import StateService
+            from src.services.headless_services import HeadlessOverlayService, HeadlessTrayService, HeadlessAudioService
+        except ImportError as e:
+            raise SkipBenchmark(f"StateService unavailable: {e}")
+
+        cwd = os.getcwd()
+        self._workdir = tempfile.mkdtemp(prefix="er_bench_")
+        config_path = self.config_path or os.path.join(cwd, "data", "config.json")
+        try:
+            config = prepare_workdir(self._workdir, config_path, {"auto_hibernate": False, "resume_on_restart": False, "record_sensors": False})
+            clock = VirtualClock(1_700_000_000.0)
+            db = DatabaseService()
+            db.initialize()
+            state = StateService(config, ReplayVisionService(clock), HeadlessOverlayService(clock), db,
+                                 HeadlessAudioService(clock), HeadlessTrayService(), clock=clock)
+            state.initialize(start_capture=False, hotkeys=False, actor_thread=False)
+        finally:
+            os.chdir(cwd)
+
+        # Mid-run session: Day 2, level 9, a full curve behind it
+        rng = random.Random(self.seed)
+        history, total = [], 0
+        for _ in range(self.CURVE_LENGTH):
+            total += rng.randint(0, 600)
+            history.append(total)
+        state.session.run_accumulated_history = history
+        state.session.phase_index = 5
+        state.session.start_time = clock() - 120
+        state.session.current_run_level = 9
+        state.session.current_runes = 23456
+        self._state = state
+        return state
+
+    def close(self):
+        if self._state is not None:
+            self._state.shutdown()
+            self._state = None
+        if self._workdir:
+            shutil.rmtree(self._workdir, ignore_errors=True)
+            self._workdir = None
+
+    # --- Benchmarks ---
+
+    def add(self, name: str, setup: Callable[[], Callable[[], Any]]):
+        self.benchmarks.append((name, setup))
+
+    def _register(self):
+        for pass_name in ("OTSU", "ADAPTIVE", "INVERTED", "FIXED", "RED"):
+            self.add(f"vision.preprocess_image[{pass_name}]", lambda p=pass_name: self._bench_preprocess(p))
+        self.add("vision.process_numeric_region[Level]", lambda: self._bench_numeric("Level"))
+        self.add("vision.process_numeric_region[Runes]", lambda: self._bench_numeric("Runes"))
+        self.add("vision.detect_rune_icon", self._bench_rune_icon)
+        self.add("vision.detect_menu_screen", self._bench_menu)
+        for size in self.PATTERN_SIZES:
+            self.add(f"patterns.evaluate[{size}]", lambda n=size: self._bench_patterns(n))
+        self.add("state.update_runes_display", self._bench_runes_display)
+        self.add(f"tickets.check_pending[{self.PENDING_TICKETS} pending]", self._bench_tickets_idle)
+        self.add("tickets.create_resolve", self._bench_tickets_churn)
+        self.add(f"overlay.get_clean_history[{self.CURVE_LENGTH}]", self._bench_clean_history)
+
+    def _bench_preprocess(self, pass_name: str):
+        from src.vision_engine import OCRPass
+        from src.utils.synthetic_hud import HudStyle
+        engine = self.engine()
+        style = HudStyle(font=self.hud().fonts[0] if self.hud().fonts else "", glow=3.0)
+        img = self.hud().render("banner", "JOUR II", style)
+        if pass_name == "RED":
+            return lambda: engine.preprocess_image(img, pass_type="RED", gamma=0.6)
+        custom_val = 220 if pass_name == "FIXED" else 0
+        pass_type = OCRPass[pass_name]
+        return lambda: engine.preprocess_image(img, pass_type=pass_type, custom_val=custom_val, gamma=0.6)
+
+    def _bench_numeric(self, process_name: str):
+        engine = self.engine()
+        region = engine.level_region if process_name == "Level" else engine.runes_region
+        if process_name == "Runes":
+            engine.runes_motion = None  # Measure the full read, not the unchanged-crop cache
+        return lambda: engine._process_numeric_region(region, lambda value, conf: None, process_name)
+
+    def _bench_rune_icon(self):
+        import numpy as np
+        engine = self.engine()
+        if engine.icon_template is None:
+            reg = engine.runes_icon_region
+            if not reg or not reg.get("width"):
+                raise SkipBenchmark("no runes_icon_region")
+            size = max(8, min(reg["width"], reg["height"]) - 4)
+            engine.icon_template = np.random.default_rng(self.seed).integers(0, 255, (size, size), dtype=np.uint8)
+        return lambda: engine.detect_rune_icon(None)
+
+    def _bench_menu(self):
+        import numpy as np
+        engine = self.engine()
+        reg = self.config.get("menu_region", {})
+        if not reg or not reg.get("width"):
+            raise SkipBenchmark("no menu_region")
+        if engine.menu_template is None:
+            size = max(8, min(reg["width"], reg["height"]) - 4)
+            engine.menu_template = np.random.default_rng(self.seed).integers(0, 255, (size, size), dtype=np.uint8)
+        return lambda: engine.detect_menu_screen()
+
+    def _bench_patterns(self, size: int):
+        from src.pattern_manager import PatternManager
+        rng = random.Random(self.seed)
+        manager = PatternManager(os.path.join(tempfile.mkdtemp(prefix="er_bench_"), "ocr_patterns.json"))
+        patterns = dict(manager.defaults)
+        alphabet = "JOURIL1T HE"
+        while len(patterns) < size:
+            text = "JOUR " + "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4)))
+            patterns.setdefault(text.strip(), {"target": rng.choice(["DAY 1", "DAY 2", "DAY 3"]), "weight": rng.randint(5, 70)})
+        manager.patterns = dict(list(patterns.items())[:size])
+        word_data = [{"text": "JOUR", "left": 120}, {"text": "II", "left": 330}]
+        return lambda: manager.evaluate("JOUR II", text_width=420, center_offset=12, word_data=word_data)
+
+    def _bench_runes_display(self):
+        state = self.state()
+        return lambda: state.update_runes_display(state.session.current_run_level)
+
+    def _bench_tickets_idle(self):
+        from src.core.clock import VirtualClock
+        from src.core.ticket_manager import TicketManager
+        clock = VirtualClock(1_700_000_000.0)
+        manager = TicketManager({}, clock=clock)
+        for i in range(self.PENDING_TICKETS):
+            manager.create_ticket(1234 + i, 50000, 48766 - i)
+        now = clock() + 0.1  # Nothing due yet
+        return lambda: manager.check_pending_tickets(now)
+
+    def _bench_tickets_churn(self):
+        from src.core.clock import VirtualClock
+        from src.core.ticket_manager import TicketManager
+        clock = VirtualClock(1_700_000_000.0)
+        manager = TicketManager({}, clock=clock)
+
+        def _cycle():
+            manager.create_ticket(1500, 20000, 18500)
+            clock.advance(TicketManager.RESOLVE_TIMEOUT + 0.01)
+            manager.check_pending_tickets()
+            manager.drain_validated()
+        return _cycle
+
+    def _bench_clean_history(self):
+        from src.core.history_cleaning import clean_history
+        rng = random.Random(self.seed)
+        history, total = [], 0
+        for i in range(self.CURVE_LENGTH):
+            total += rng.randint(0, 600)
+            # OCR spikes every ~100 s
+            history.append(total + (9000 if i % 97 == 0 else 0))
+        return lambda: clean_history(history)
+
+    # --- Run ---
+
+    def run(self, only: Optional[List[str]] = None, progress: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        results: Dict[str, Any] = {}
+        for name, setup in self.benchmarks:
+            if only and not any(token in name for token in only):
+                continue
+            try:
+                fn = setup()
+                entry = summarize(measure(fn, min_time=self.min_time))
+            except SkipBenchmark as e:
+                entry = {"skipped": str(e)}
+            except ImportError as e:
+                entry = {"skipped": f"missing module: {e.name}"}
+            except Exception as e:
+                logger.error(f"Benchmark {name} failed: {e}", exc_info=True)
+                entry = {"error": f"{type(e).__name__}: {e}"}
+            results[name] = entry
+            if progress:
+                progress(name, entry)
+        return {
+            "meta": {
+                "created": datetime.datetime.now().isoformat(timespec="seconds"),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "machine": platform.machine(),
+                "tesseract": self.tess_backend or "-",
+                "seed": self.seed,
+                "min_time_s": self.min_time,
+            },
+            "results": results,
+        }
+
+
+def compare(base: Dict[str, Any], new: Dict[str, Any], threshold: float = 0.10,
+            noise_floor_us: float = 1.0) -> List[Dict[str, Any]]:
+    """
+    Rows for every benchmark present in both result files. A benchmark regresses
+    when its median grew by more than `threshold` (relative) and `noise_floor_us`
+    (absolute, sub-microsecond calls are mostly timer noise).
+    """
+    rows = []
+    for name, old in base.get("results", {}).items():
+        cur = new.get("results", {}).get(name)
+        if cur is None or "median_us" not in old or "median_us" not in cur:
+            continue
+        ratio = cur["median_us"] / old["median_us"] if old["median_us"] > 0 else 1.0
+        delta = cur["median_us"] - old["median_us"]
+        if ratio > 1 + threshold and delta > noise_floor_us:
+            status = "REGRESSION"
+        elif ratio < 1 - threshold and -delta > noise_floor_us:
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append({
+            "name": name,
+            "base_median_us": old["median_us"],
+            "median_us": cur["median_us"],
+            "ratio": round(ratio, 3),
+            "base_p99_us": old.get("p99_us"),
+            "p99_us": cur.get("p99_us"),
+            "status": status,
+        })
+    return rows
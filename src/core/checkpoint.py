@@ -0,0 +1,94 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from src.logger import logger
+
+
+class SessionCheckpointer:
+    """
+    Crash-safe session checkpoint (warm restart).
+
+    The state is written as compact JSON to a temp file, then swapped in with
+    os.replace (atomic on Windows and POSIX): a crash mid-write leaves the
+    previous checkpoint intact. Writes happen at most once per `min_interval`
+    and only when the state was marked dirty.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: str, min_interval: float = 1.0):
+        self.path = path
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.last_write = 0.0
+
+        # Stats
+        self.writes = 0
+        self.last_write_ms = 0.0
+
+    def mark_dirty(self):
+        self._dirty = True
+
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    def maybe_write(self, state_provider: Callable[[], Dict[str, Any]], now: Optional[float] = None) -> bool:
+        """Writes the checkpoint if dirty and the rate limit allows it. Returns True if written."""
+        if now is None:
+            now = time.time()
+        if not self._dirty or now - self.last_write < self.min_interval:
+            return False
+        return self.write(state_provider())
+
+    def write(self, state: Dict[str, Any]) -> bool:
+        with self._lock:
+            t0 = time.perf_counter()
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                data = {"version": self.VERSION, "saved_at": time.time(), "state": state}
+                tmp_path = self.path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, separators=(",", ":"))
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                logger.error(f"Checkpoint: write failed: {e}")
+                return False
+            self._dirty = False
+            self.last_write = time.time()
+            self.writes += 1
+            self.last_write_ms = (time.perf_counter() - t0) * 1000
+            return True
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Returns {"saved_at", "state"} or None if missing/unreadable/incompatible."""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != self.VERSION:
+                return None
+            return data
+        except Exception as e:
+            logger.error(f"Checkpoint: unreadable checkpoint ignored: {e}")
+            return None
+
+    def clear(self):
+        with self._lock:
+            try:
+                if os.path.exists(self.path):
+                    os.remove(self.path)
+            except OSError:
+                pass
+
+    def get_stats(self) -> dict:
+        return {
+            "writes": self.writes,
+            "last_write_ms": round(self.last_write_ms, 2),
+            "dirty": self._dirty,
+        }
@@ -0,0 +1,33 @@
+import threading
+import time
+from typing import Callable
+
+# A clock is any zero-argument callable returning epoch seconds (time.time by default).
+Clock = Callable[[], float]
+
+SYSTEM_CLOCK: Clock = time.time
+
+
+class VirtualClock:
+    """
+    Manually driven clock for replays: time only moves when the driver
+    advances it, so a recorded run can be re-played at any speed while the
+    state logic still sees the original timestamps.
+    """
+
+    def __init__(self, start: float = 0.0):
+        self._now = start
+        self._lock = threading.Lock()
+
+    def __call__(self) -> float:
+        return self._now
+
+    def set(self, when: float):
+        """Moves the clock to `when` (never backwards)."""
+        with self._lock:
+            if when > self._now:
+                self._now = when
+
+    def advance(self, seconds: float):
+        with self._lock:
+            self._now += max(0.0, seconds)
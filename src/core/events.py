@@ -1,9 +1,114 @@
-from typing import List, Dict, Any, Callable, Type
+from typing import List, Dict, Any, Callable, Type, ClassVar, Optional
 from dataclasses import dataclass, field
+from collections import deque
+import threading
 import time
 from src.logger import logger
 
 # --- EVENT BUS ---
+class Subscription:
+    """
+    One listener of the bus, with its own dispatch mode and metrics.
+
+    - "sync": called inline on the publisher thread (legacy behaviour).
+    - "async": events go to a bounded per-subscriber queue drained by a worker
+      thread, so a slow listener never stalls the publisher (e.g. the OCR thread).
+      Overflow policy: "latest" (keep only the newest pending event),
+      "drop_oldest" or "drop_new".
+    """
+    
+    def __init__(self, event_type: Type, callback: Callable, mode: str = "sync",
+                 maxsize: int = 64, policy: str = "drop_oldest"):
+        self.event_type = event_type
+        self.callback = callback
+        self.mode = mode
+        self.policy = policy
+        self.name = getattr(callback, "__qualname__", repr(callback))
+        
+        # Metrics
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.last_latency_ms = 0.0
+        self.max_latency_ms = 0.0
+        self.avg_latency_ms = 0.0
+        
+        self._queue = None
+        self._stopped = False
+        if mode == "async":
+            self._queue = deque(maxlen=None if policy == "drop_new" else (1 if policy == "latest" else maxsize))
+            self._maxsize = 1 if policy == "latest" else maxsize
+            self._cond = threading.Condition()
+            self._worker = threading.Thread(target=self._run, name=f"EventBus-{self.name}", daemon=True)
+            self._worker.start()
+    
+    def deliver(self, event: Any):
+        if self._queue is None:
+            self._invoke(event, time.perf_counter())
+            return
+        with self._cond:
+            if self._stopped:
+                return
+            if len(self._queue) >= self._maxsize:
+                if self.policy == "drop_new":
+                    self.dropped += 1
+                    return
+                self.dropped += 1  # deque(maxlen) evicts the oldest (latest-wins when maxlen=1)
+            self._queue.append((event, time.perf_counter()))
+            self._cond.notify()
+    
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return  # Pending events are dropped with the listener
+                event, enqueued_at = self._queue.popleft()
+            self._invoke(event, enqueued_at)
+    
+    def close(self, timeout: float = 1.0):
+        """Stops the async worker (after the event it is handling, if any) and joins it."""
+        if self._queue is None:
+            return
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if threading.current_thread() is not self._worker:  # A listener may unsubscribe itself
+            self._worker.join(timeout)
+    
+    def _invoke(self, event: Any, enqueued_at: float):
+        try:
+            self.callback(event)
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"EventBus Error processing {self.event_type.__name__} in {self.name}: {e}")
+        # Latency: publish -> handler done (includes queueing for async subscribers)
+        ms = (time.perf_counter() - enqueued_at) * 1000
+        self.delivered += 1
+        self.last_latency_ms = ms
+        self.avg_latency_ms += (ms - self.avg_latency_ms) / self.delivered
+        if ms > self.max_latency_ms:
+            self.max_latency_ms = ms
+    
+    @property
+    def depth(self) -> int:
+        return len(self._queue) if self._queue is not None else 0
+    
+    def get_stats(self) -> dict:
+        return {
+            "event": self.event_type.__name__,
+            "mode": self.mode,
+            "policy": self.policy if self.mode == "async" else "-",
+            "depth": self.depth,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "avg_ms": round(self.avg_latency_ms, 3),
+            "max_ms": round(self.max_latency_ms, 3),
+        }
+
+
 class EventBus:
     _instance = None
     
@@ -15,22 +120,43 @@ class EventBus:
 
     def __init__(self):
         if not hasattr(self, '_listeners'):
-            self._listeners: Dict[Type, List[Callable]] = {}
+            self._listeners: Dict[Type, List[Subscription]] = {}
 
-    def subscribe(self, event_type: Type, callback: Callable):
-        if event_type not in self._listeners:
-            self._listeners[event_type] = []
-        self._listeners[event_type].append(callback)
-        logger.debug(f"EventBus: Subscribed to {event_type.__name__}")
+    def subscribe(self, event_type: Type, callback: Callable, mode: str = "sync",
+                  maxsize: int = 64, policy: Optional[str] = None) -> Subscription:
+        """
+        Registers a listener. `mode="async"` gives it a bounded worker queue.
+        Default async policy: latest-wins for coalescable events (Level/Runes readings), else drop_oldest.
+        """
+        if policy is None:
+            policy = "latest" if getattr(event_type, "coalesce", False) else "drop_oldest"
+        sub = Subscription(event_type, callback, mode, maxsize, policy)
+        # Copy-on-write: publish() iterates without locking
+        self._listeners[event_type] = self._listeners.get(event_type, []) + [sub]
+        logger.debug(f"EventBus: Subscribed to {event_type.__name__} ({mode})")
+        return sub
+
+    def unsubscribe(self, sub: Optional[Subscription]):
+        if sub is None:
+            return
+        listeners = self._listeners.get(sub.event_type, [])
+        # Copy-on-write (see subscribe)
+        self._listeners[sub.event_type] = [s for s in listeners if s is not sub]
+        sub.close()
+
+    def has_listeners(self, event_type: Type) -> bool:
+        """Lets publishers skip building events nobody listens to."""
+        return bool(self._listeners.get(event_type))
 
     def publish(self, event: Any):
         event_type = type(event)
-        if event_type in self._listeners:
-            for callback in self._listeners[event_type]:
-                try:
-                    callback(event)
-                except Exception as e:
-                    logger.error(f"EventBus Error processing {event_type.__name__}: {e}")
+        if not self.has_listeners(event_type):
+            return  # Fast path: no listeners
+        for sub in self._listeners[event_type]:  # Copy-on-write snapshot: never mutated in place
+            sub.deliver(event)
+
+    def get_stats(self) -> List[dict]:
+        return [sub.get_stats() for subs in self._listeners.values() for sub in subs]
 
 # Global Accessor
 bus = EventBus()
@@ -39,12 +165,14 @@ bus = EventBus()
 
 @dataclass
 class LevelDetectedEvent:
+    coalesce: ClassVar[bool] = True  # Only the newest reading matters (latest-wins for async listeners)
     level: int
     confidence: float
     timestamp: float = field(default_factory=time.time)
 
 @dataclass
 class RunesDetectedEvent:
+    coalesce: ClassVar[bool] = True
     runes: int
     confidence: float
     timestamp: float = field(default_factory=time.time)
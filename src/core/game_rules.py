@@ -49,7 +49,7 @@ class GameRules:
 
     @staticmethod
     def is_death_confirmed(old_level: int, new_level: int, new_runes: int, 
-                          last_black_screen_time: float = 0.0) -> bool:
+                          last_black_screen_time: float = 0.0, now: Optional[float] = None) -> bool:
         """
         Determines if a state change represents a VALID Death.
         Rule (ALL 3 conditions required):
@@ -62,6 +62,7 @@ class GameRules:
             new_level: New level
             new_runes: New rune count
             last_black_screen_time: Timestamp of last black screen detection
+            now: Current time (default: time.time(), virtual clock in replays)
             
         Returns:
             True if all 3 death conditions are met
@@ -80,7 +81,9 @@ class GameRules:
         if last_black_screen_time == 0.0:
             return False  # No black screen detected yet
         
-        time_since_black = time.time() - last_black_screen_time
+        if now is None:
+            now = time.time()
+        time_since_black = now - last_black_screen_time
         if time_since_black > 5.0:
             return False  # Black screen too old
         
@@ -156,11 +159,12 @@ class GameRules:
                             current_run_level: int, current_runes: int, 
                             elapsed_in_run: float, last_black_screen_time: float, 
                             is_manual: bool = False, debug_mode: bool = False,
-                            is_startup: bool = False) -> bool:
+                            is_startup: bool = False, now: Optional[float] = None) -> bool:
         """
         Determines if a phase transition is legally allowed by the Game Rules.
         """
-        now = time.time()
+        if now is None:
+            now = time.time()
 
         if target_day == "DAY 1":
             # Guard: OCR triggers for Day 1 must follow a black screen (within 15s)
@@ -0,0 +1,30 @@
+def clean_history(history):
+    """
+    Simple outlier removal for the Green Curve.
+    Removes single-point spikes that do not sustain.
+    """
+    if len(history) < 3: return history
+    
+    cleaned = list(history)
+    # We only check internal points
+    for i in range(1, len(history) - 1):
+        prev = cleaned[i-1]
+        curr = cleaned[i]
+        nex = history[i+1] # Look ahead in original or cleaned? Original is safer for "next".
+        
+        # 1. Check for Spike (Up or Down)
+        # If current deviates signficantly from prev AND next is closer to prev
+        diff_prev = abs(curr - prev)
+        diff_next = abs(curr - nex)
+        
+        # Threshold: 10% change or > 5000 runes absolute?
+        # Let's say if jump is > 2000 and return is > 2000
+        if diff_prev > 2000 and diff_next > 2000:
+            # Check if we return somewhat to baseline
+            # If prev and next are close (within 20% of each other spread)
+            spread = abs(prev - nex)
+            if spread < diff_prev * 0.5: 
+                # It was a spike, smooth it
+                cleaned[i] = (prev + nex) / 2
+    
+    return cleaned
@@ -0,0 +1,128 @@
+from typing import Sequence, Tuple
+
+import numpy as np
+
+from src.services.rune_data import RuneData
+
+
+class IdealCurve:
+    """
+    Ideal total-runes curve of a Nightreign run (piecewise power law, 14m days).
+
+    Day 1: FARMING_GOAL * (t / TOTAL_TIME) ** SNOWBALL_D1
+    Day 2: starts at the Day 1 end + Boss 1 drop, reaches IDEAL_TARGET at
+           TOTAL_TIME with exponent SNOWBALL_D2
+    After: IDEAL_TARGET + Boss 2 drop (flat)
+
+    The whole curve is precomputed at 1 s resolution when the NR constants are
+    loaded, so the per-tick grade is an array lookup and whole histories can be
+    compared in one vectorized pass. The overlay draws the target line from the
+    same buffer.
+    """
+
+    # Grade thresholds on (current - ideal) / ideal, best first
+    GRADES: Tuple[Tuple[float, str], ...] = (
+        (0.10, "S"),   # +10%
+        (0.0, "A"),    # Ahead
+        (-0.10, "B"),  # -0% to -10%
+        (-0.20, "C"),  # -10% to -20%
+        (-0.30, "D"),  # -20% to -30%
+        (-0.40, "E"),
+    )
+    WORST_GRADE = "F"  # < -40%
+    MIN_IDEAL = 1000   # Below this the ratio is meaningless -> "A"
+
+    def __init__(self, farming_goal: float = 337578, ideal_target: float = 437578, boss_drops: float = 50000,
+                 day_duration: int = 840, total_time: int = 1680,
+                 snowball_d1: float = 1.35, snowball_d2: float = 1.15):
+        self.farming_goal = farming_goal
+        self.ideal_target = ideal_target
+        self.boss_drops = boss_drops
+        self.day_duration = int(day_duration)
+        self.total_time = int(total_time)
+        self.snowball_d1 = snowball_d1
+        self.snowball_d2 = snowball_d2
+
+        self.final_value = float(ideal_target + boss_drops)
+        self.values = self._build()
+        self.values.flags.writeable = False  # Shared with the overlay thread
+
+    @classmethod
+    def from_config(cls, nr: dict) -> "IdealCurve":
+        """Same keys/defaults as the "nightreign" config section."""
+        return cls(
+            farming_goal=nr.get("farming_goal", 337578),
+            ideal_target=RuneData.get_total_runes_for_level(nr.get("target_level", 14)) or 437578,
+            boss_drops=50000,  # Fixed for now
+            day_duration=nr.get("day_duration", 840),
+            total_time=nr.get("total_time", 1680),
+            snowball_d1=nr.get("snowball_d1", 1.35),
+            snowball_d2=nr.get("snowball_d2", 1.15),
+        )
+
+    def _build(self) -> np.ndarray:
+        # values[t] for t = 0..total_time (inclusive: the flat tail starts there)
+        t = np.arange(self.total_time + 1, dtype=np.float64)
+        values = np.full(t.shape, self.final_value)
+
+        day1 = t < self.day_duration
+        values[day1] = self.farming_goal * (t[day1] / self.total_time) ** self.snowball_d1
+
+        day2 = ~day1 & (t < self.total_time)
+        if self.day_duration > 0 and day2.any():
+            val_d1_end = self.farming_goal * (self.day_duration / self.total_time) ** self.snowball_d1
+            start_d2 = val_d1_end + self.boss_drops
+            rem_farming = self.ideal_target - start_d2
+            ratio_d2 = (t[day2] - self.day_duration) / self.day_duration
+            values[day2] = start_d2 + rem_farming * ratio_d2 ** self.snowball_d2
+        return values
+
+    # --- Point queries (per tick) ---
+
+    def value_at(self, t_seconds: float) -> float:
+        """O(1) lookup (1 s resolution)."""
+        idx = int(t_seconds)
+        if idx < 0:
+            return 0.0
+        if idx >= len(self.values):
+            return self.final_value
+        return float(self.values[idx])
+
+    @classmethod
+    def grade_for(cls, current: float, ideal: float) -> str:
+        if ideal < cls.MIN_IDEAL:
+            return "A"
+        pct_diff = (current - ideal) / ideal
+        for threshold, grade in cls.GRADES:
+            if pct_diff >= threshold:
+                return grade
+        return cls.WORST_GRADE
+
+    def grade_at(self, t_seconds: float, current: float) -> Tuple[str, float]:
+        """Returns (grade, delta runes vs ideal)."""
+        ideal = self.value_at(t_seconds)
+        return self.grade_for(current, ideal), current - ideal
+
+    # --- Vectorized queries (whole history, 1 sample per second) ---
+
+    def ideal_for(self, length: int) -> np.ndarray:
+        """Ideal values for t = 0..length-1 (view of the buffer when possible)."""
+        if length <= len(self.values):
+            return self.values[:length]
+        tail = np.full(length - len(self.values), self.final_value)
+        return np.concatenate((self.values, tail))
+
+    def deltas(self, history: Sequence[float]) -> np.ndarray:
+        """Runes ahead (+) / behind (-) the ideal for each second of a run history."""
+        actual = np.asarray(history, dtype=np.float64)
+        return actual - self.ideal_for(len(actual))
+
+    def grades(self, history: Sequence[float]) -> np.ndarray:
+        """Grade letter for each second of a run history."""
+        actual = np.asarray(history, dtype=np.float64)
+        ideal = self.ideal_for(len(actual))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pct = (actual - ideal) / ideal
+        conditions = [ideal < self.MIN_IDEAL] + [pct >= threshold for threshold, _ in self.GRADES]
+        choices = ["A"] + [grade for _, grade in self.GRADES]
+        return np.select(conditions, choices, default=self.WORST_GRADE)
@@ -0,0 +1,73 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from src.services.rune_data import RuneData
+
+
+@dataclass(frozen=True)
+class LevelGateDecision:
+    mode: str        # "FULL" or "VERIFY"
+    interval: float  # Seconds between Level OCR scans
+    reason: str
+
+
+class LevelScanGate:
+    """
+    Rune-aware gating policy for the Level OCR.
+
+    The level can only go up after runes are spent at a grace site (which is only
+    possible if the held runes afford at least one level) and can only drop by 1 on
+    death (which comes with a black screen). Outside those windows the level region
+    is only re-read at a slow verification cadence.
+    """
+
+    def __init__(self, full_interval: float = 0.2, verify_interval: float = 2.0,
+                 spend_window: float = 8.0, black_screen_window: float = 10.0):
+        self.full_interval = full_interval
+        self.verify_interval = verify_interval
+        self.spend_window = spend_window
+        self.black_screen_window = black_screen_window
+
+        self.hot_until = 0.0
+        self.hot_reason = ""
+        self.last_decision: Optional[LevelGateDecision] = None
+        self.switches = 0
+
+    def note_runes(self, level: int, old_runes: int, new_runes: int, now: float):
+        """Feed every runes reading. A drop while a level-up was affordable opens a FULL window."""
+        if new_runes >= old_runes or level < 1:
+            return
+        potential = RuneData.calculate_potential_level(level, old_runes)
+        if potential > level:
+            self.hot_until = now + self.spend_window
+            self.hot_reason = f"Runes spent ({old_runes}->{new_runes}, Lvl {level}->{potential} affordable)"
+
+    def decide(self, now: float, phase_index: int, level: int, runes: int,
+               in_black_screen: bool, last_black_screen_end: float,
+               consensus_pending: bool) -> LevelGateDecision:
+        if phase_index < 0:
+            return self._full("Pre-run (Level sync)")
+        if consensus_pending:
+            return self._full("Level consensus pending")
+        if in_black_screen:
+            return self._full("Black screen (death possible)")
+        if last_black_screen_end and now - last_black_screen_end < self.black_screen_window:
+            return self._full("After black screen (death possible)")
+        if now < self.hot_until:
+            return self._full(self.hot_reason)
+
+        potential = RuneData.calculate_potential_level(level, runes) if level >= 1 else level
+        if potential > level:
+            return LevelGateDecision("VERIFY", self.verify_interval, f"Level-up affordable (Lvl {potential}), waiting for spend")
+        return LevelGateDecision("VERIFY", self.verify_interval, "No level change possible")
+
+    def _full(self, reason: str) -> LevelGateDecision:
+        return LevelGateDecision("FULL", self.full_interval, reason)
+
+    def update(self, decision: LevelGateDecision) -> bool:
+        """Stores the decision. Returns True if the scan interval changed."""
+        changed = self.last_decision is None or self.last_decision.interval != decision.interval
+        if changed:
+            self.switches += 1
+        self.last_decision = decision
+        return changed
@@ -0,0 +1,125 @@
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Tuple
+
+from src.core.tracing import tracer
+from src.logger import logger
+
+
+@dataclass
+class StateMessage:
+    kind: str  # "ocr", "level", "runes", "menu", "hotkey", "call"
+    handler: Callable
+    args: Tuple[Any, ...] = ()
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class Mailbox:
+    """
+    Bounded mailbox of the state actor.
+
+    Producer threads (vision main/secondary loops, hotkeys, Qt) only enqueue;
+    every handler runs on the scheduler thread, which owns the GameSession and
+    StateService state. A drain job is armed on the scheduler when the first
+    message arrives, so the actor thread still sleeps when idle.
+
+    Overflow policy: the oldest sensor reading (ocr/level/runes/menu) is evicted
+    first since a newer one supersedes it; hotkeys and calls are never evicted.
+    """
+
+    SENSOR_KINDS = ("ocr", "level", "runes", "menu")
+
+    def __init__(self, scheduler, maxsize: int = 256, batch: int = 64, name: str = "State"):
+        self.scheduler = scheduler
+        self.maxsize = maxsize
+        self.batch = batch  # Max messages per drain (timer jobs interleave between batches)
+        self.name = name
+
+        self._queue: Deque[StateMessage] = deque()
+        self._lock = threading.Lock()
+        self._armed = False
+
+        # Stats
+        self.posted = 0
+        self.processed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.latency: Dict[str, Dict[str, float]] = {}
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def post(self, kind: str, handler: Callable, *args) -> bool:
+        """Thread-safe enqueue. Returns False if the message was dropped (mailbox full)."""
+        msg = StateMessage(kind, handler, args)
+        with self._lock:
+            self.posted += 1
+            if len(self._queue) >= self.maxsize and not self._evict_sensor():
+                self.dropped += 1
+                return False
+            self._queue.append(msg)
+            if len(self._queue) > self.max_depth:
+                self.max_depth = len(self._queue)
+            arm = not self._armed
+            self._armed = True
+        if arm:
+            self.scheduler.schedule_at(self.scheduler.clock(), self.drain, name="mailbox", group="mailbox")
+        return True
+
+    def _evict_sensor(self) -> bool:
+        for i, queued in enumerate(self._queue):
+            if queued.kind in self.SENSOR_KINDS:
+                del self._queue[i]
+                self.dropped += 1
+                return True
+        return False
+
+    def drain(self):
+        """Runs on the actor (scheduler) thread."""
+        for _ in range(self.batch):
+            with self._lock:
+                if not self._queue:
+                    self._armed = False
+                    return
+                msg = self._queue.popleft()
+
+            self._record_latency(msg.kind, (time.perf_counter() - msg.enqueued_at) * 1000)
+            try:
+                with tracer.span(f"actor.{msg.kind}"):
+                    msg.handler(*msg.args)
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"{self.name} Mailbox: '{msg.kind}' handler crashed: {e}", exc_info=True)
+            self.processed += 1
+
+        # Batch exhausted: yield to due timer jobs, then continue
+        with self._lock:
+            if self._queue:
+                self.scheduler.schedule_at(self.scheduler.clock(), self.drain, name="mailbox", group="mailbox")
+            else:
+                self._armed = False
+
+    def _record_latency(self, kind: str, ms: float):
+        stats = self.latency.get(kind)
+        if stats is None:
+            stats = self.latency[kind] = {"count": 0, "avg_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0}
+        stats["count"] += 1
+        stats["last_ms"] = ms
+        stats["avg_ms"] += (ms - stats["avg_ms"]) / stats["count"]
+        if ms > stats["max_ms"]:
+            stats["max_ms"] = ms
+
+    def get_stats(self) -> dict:
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "posted": self.posted,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "latency": {k: {sk: round(sv, 2) for sk, sv in v.items()} for k, v in self.latency.items()},
+        }
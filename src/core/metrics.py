@@ -0,0 +1,268 @@
+import json
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.logger import logger
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# Prometheus default buckets, in seconds (OCR passes, cycles, latencies)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in key) + "}"
+
+
+def _fmt_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonic count (reset only by a process restart)."""
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str):
+        super().__init__(name, help_text)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = _key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def set_total(self, value: float, **labels):
+        """Collectors: mirrors a monotonic count kept elsewhere (mailbox, bus, dispatcher stats)."""
+        with self._lock:
+            self._values[_key(labels)] = float(value)
+
+    def value(self, **labels) -> float:
+        return self._values.get(_key(labels), 0.0)
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, key, v) for key, v in self._values.items()]
+
+    def snapshot(self) -> Dict[str, float]:
+        return {_fmt_labels(key) or "total": v for _, key, v in self.samples()}
+
+
+class Gauge(Counter):
+    """Value that goes up and down (depths, sizes, resources)."""
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        self.set_total(value, **labels)
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram (Prometheus `le` buckets), values in seconds."""
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[LabelKey, List[float]] = {}  # bucket counts + [sum, count]
+
+    def observe(self, value: float, **labels):
+        key = _key(labels)
+        n = len(self.buckets)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (n + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[n] += value
+            series[n + 1] += 1
+
+    def samples(self):
+        out = []
+        n = len(self.buckets)
+        with self._lock:
+            items = [(key, list(series)) for key, series in self._series.items()]
+        for key, series in items:
+            cumulative = 0.0
+            for i, bound in enumerate(self.buckets):
+                cumulative += series[i]
+                out.append((f"{self.name}_bucket", key + (("le", _fmt_value(bound)),), cumulative))
+            out.append((f"{self.name}_bucket", key + (("le", "+Inf"),), series[n + 1]))
+            out.append((f"{self.name}_sum", key, series[n]))
+            out.append((f"{self.name}_count", key, series[n + 1]))
+        return out
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        n = len(self.buckets)
+        with self._lock:
+            items = [(key, list(series)) for key, series in self._series.items()]
+        return {
+            _fmt_labels(key) or "total": {"count": s[n + 1], "sum": round(s[n], 6),
+                                           "mean": round(s[n] / s[n + 1], 6) if s[n + 1] else 0.0}
+            for key, s in items
+        }
+
+
+class MetricsRegistry:
+    """
+    Process-wide metrics (like the event bus): services push counters and
+    histograms where things happen, and register collectors that refresh
+    gauges from their own stats (mailbox, bus, tickets...) at scrape time,
+    so nothing is polled on the hot paths.
+    """
+
+    def __init__(self, prefix: str = "er_"):
+        self.prefix = prefix
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[["MetricsRegistry"], None]] = []
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, help_text: str, **kwargs):
+        full = self.prefix + name
+        metric = self._metrics.get(full)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(full)
+                if metric is None:
+                    metric = self._metrics[full] = cls(full, help_text, **kwargs)
+        return metric
+
+    def counter(self, name: str, help_text: str = "") -> Counter:
+        return self._get(Counter, name, help_text)
+
+    def gauge(self, name: str, help_text: str = "") -> Gauge:
+        return self._get(Gauge, name, help_text)
+
+    def histogram(self, name: str, help_text: str = "", buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help_text, buckets=buckets)
+
+    def add_collector(self, collector: Callable[["MetricsRegistry"], None]):
+        with self._lock:
+            self._collectors.append(collector)
+
+    def remove_collector(self, collector: Callable[["MetricsRegistry"], None]):
+        with self._lock:
+            if collector in self._collectors:
+                self._collectors.remove(collector)
+
+    def collect(self):
+        for collector in list(self._collectors):
+            try:
+                collector(self)
+            except Exception as e:
+                logger.debug(f"Metrics: collector failed: {e}")
+
+    def render_prometheus(self) -> str:
+        """Text exposition format 0.0.4."""
+        self.collect()
+        lines = []
+        for name in sorted(self._metrics):
+            metric = self._metrics[name]
+            samples = metric.samples()
+            if not samples:
+                continue
+            lines.extend(metric.header())
+            for sample_name, key, value in samples:
+                lines.append(f"{sample_name}{_fmt_labels(key)} {_fmt_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-friendly values of every metric (rollup file)."""
+        self.collect()
+        return {name: self._metrics[name].snapshot() for name in sorted(self._metrics)}
+
+
+class MetricsServer:
+    """Serves GET /metrics (Prometheus text format) on localhost from a daemon thread."""
+
+    def __init__(self, registry: MetricsRegistry, port: int = 9464, host: str = "127.0.0.1"):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> bool:
+        registry = self.registry
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Scrapes every 15s would flood the console
+
+        try:
+            self._server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        except OSError as e:
+            logger.error(f"Metrics: cannot listen on {self.host}:{self.port}: {e}")
+            return False
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="MetricsServer", daemon=True)
+        self._thread.start()
+        logger.info(f"Metrics: serving http://{self.host}:{self.port}/metrics")
+        return True
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+class MetricsRollup:
+    """Appends one JSON snapshot of the registry per call (data/logs/metrics_rollup.jsonl)."""
+
+    def __init__(self, registry: MetricsRegistry, path: str):
+        self.registry = registry
+        self.path = path
+
+    def write(self, now: Optional[float] = None):
+        record = {"timestamp": now if now is not None else time.time(), "metrics": self.registry.snapshot()}
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            logger.error(f"Metrics: rollup write failed: {e}")
+
+
+# Global Accessor
+metrics = MetricsRegistry()
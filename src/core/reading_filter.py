@@ -0,0 +1,146 @@
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class FilterDecision:
+    status: str            # "stable" (= current), "confirmed" (new value), "pending", "contested"
+    value: Optional[int]   # Leading candidate in the window
+    evidence: float        # Confidence-weighted votes x transition prior
+    share: float           # Leading candidate's share of the window weight
+    support: int           # Readings agreeing with the candidate in the window
+    streak: int            # Consecutive identical raw readings (legacy consensus counter)
+
+
+def level_transition_prior(current: int, candidate: int) -> float:
+    """Level moves by +1 (level-up) or -1 (death); multi-level jumps need more evidence."""
+    delta = candidate - current
+    if abs(delta) <= 1:
+        return 1.0
+    if 2 <= delta <= 3:
+        return 0.6  # Fast menuing at a grace site
+    return 0.2
+
+
+def runes_transition_prior(current: int, candidate: int) -> float:
+    """Runes gains/spends are free-form, but some deltas are typical OCR failures."""
+    if candidate == current:
+        return 1.0
+    if current > 100 and candidate < 10:
+        return 0.15  # Hidden/blank HUD read as 0: needs sustained evidence (real deaths persist)
+    s_curr, s_new = str(max(0, current)), str(candidate)
+    if len(s_curr) == len(s_new) and len(s_new) >= 5 and abs(candidate - current) >= 10000:
+        if sum(1 for a, b in zip(s_curr, s_new) if a != b) == 1:
+            return 0.5  # Digit-shift spike (15k -> 65k)
+    return 1.0
+
+
+class ReadingFilter:
+    """
+    Temporal-consensus estimator for a numeric HUD field.
+
+    Keeps a sliding window of (value, confidence, frame_ts) from the normal scan
+    stream and votes over the readings since the current value was last seen
+    (older readings of the old value must not outvote a change): each reading
+    weighs by its OCR confidence, a candidate's evidence is scaled by the
+    plausibility of the transition from the current value (prior). A new value
+    is confirmed once its evidence passes `threshold` and it dominates those
+    readings (`min_share`). Replaces the synchronous burst captures in the
+    common case; "contested" readings can still fall back to one.
+    """
+
+    def __init__(self, name: str, prior: Optional[Callable[[int, int], float]] = None,
+                 window: int = 12, max_age: float = 4.0, threshold: float = 1.8,
+                 min_share: float = 0.75, contested_after: int = 5):
+        self.name = name
+        self.prior = prior or (lambda current, candidate: 1.0)
+        self.max_age = max_age
+        self.threshold = threshold
+        self.min_share = min_share
+        self.contested_after = contested_after
+
+        self._window: Deque[Tuple[int, float, float]] = deque(maxlen=window)
+        self._last_value: Optional[int] = None
+        self.streak = 0
+
+        # Stats
+        self.readings = 0
+        self.confirmations = 0
+        self.contested = 0
+        self.last_decision: Optional[FilterDecision] = None
+
+    @staticmethod
+    def weight(confidence: float) -> float:
+        """OCR confidence -> vote weight (90%+ counts fully, <33% almost nothing)."""
+        return min(1.0, max(0.05, (confidence - 30.0) / 60.0))
+
+    def add(self, value: int, confidence: float, current: int, ts: Optional[float] = None) -> FilterDecision:
+        if ts is None:
+            ts = time.time()
+        self.readings += 1
+
+        if value == self._last_value:
+            self.streak += 1
+        else:
+            self._last_value = value
+            self.streak = 1
+
+        self._window.append((value, self.weight(confidence), ts))
+        while self._window and ts - self._window[0][2] > self.max_age:
+            self._window.popleft()
+
+        # Readings since the current value was last read (whole window if it was not)
+        since_current = []
+        for reading in reversed(self._window):
+            if reading[0] == current:
+                break
+            since_current.append(reading)
+
+        votes: Dict[int, float] = {}
+        counts: Dict[int, int] = {}
+        for v, w, _ in (since_current or self._window):
+            votes[v] = votes.get(v, 0.0) + w
+            counts[v] = counts.get(v, 0) + 1
+        total = sum(votes.values())
+        leader = current if not since_current else max(votes, key=votes.get)
+        share = votes[leader] / total if total > 0 else 0.0
+        evidence = votes[leader] * self.prior(current, leader)
+
+        if not since_current:
+            status = "stable"
+        elif share < self.min_share:
+            status = "contested" if len(since_current) >= self.contested_after else "pending"
+        elif leader == current:
+            status = "stable"
+        elif evidence >= self.threshold:
+            status = "confirmed"
+        else:
+            status = "pending"
+
+        if status == "confirmed":
+            self.confirmations += 1
+        elif status == "contested":
+            self.contested += 1
+
+        self.last_decision = FilterDecision(status, leader, evidence, share, counts[leader], self.streak)
+        return self.last_decision
+
+    def reset(self):
+        self._window.clear()
+        self._last_value = None
+        self.streak = 0
+
+    def get_stats(self) -> dict:
+        d = self.last_decision
+        return {
+            "status": d.status if d else "-",
+            "candidate": d.value if d else None,
+            "evidence": round(d.evidence, 2) if d else 0,
+            "share": round(d.share, 2) if d else 0,
+            "window": len(self._window),
+            "readings": self.readings,
+            "confirmations": self.confirmations,
+            "contested": self.contested,
+        }
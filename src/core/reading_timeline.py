@@ -0,0 +1,293 @@
+import json
+import re
+import threading
+import time
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+# Verdict of a reading: set by the vision engine (rejected before reaching the
+# state) or later by the StateService (trigger consensus, reading filters)
+PENDING, ACCEPTED, REJECTED, HELD = 0, 1, 2, 3
+VERDICTS = ("pending", "accepted", "rejected", "held")
+
+NO_VALUE = -1
+
+
+class ReadingRing:
+    """
+    Bounded history of one region's OCR readings in parallel typed arrays
+    (~40 bytes per reading plus the text), overwritten oldest-first.
+    Readings are addressed by their sequence number (total recorded so far).
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.ts = array("d", [0.0]) * capacity
+        self.conf = array("f", [0.0]) * capacity
+        self.brightness = array("f", [0.0]) * capacity
+        self.value = array("q", [NO_VALUE]) * capacity
+        self.pass_code = array("H", [0]) * capacity
+        self.verdict = array("B", [PENDING]) * capacity
+        self.reason_code = array("H", [0]) * capacity
+        self.texts: List[str] = [""] * capacity
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def append(self, ts: float, text: str, conf: float, value: int, pass_code: int,
+               brightness: float, verdict: int, reason_code: int) -> int:
+        with self.lock:
+            seq = self.count
+            i = seq % self.capacity
+            self.ts[i] = ts
+            self.conf[i] = conf
+            self.brightness[i] = brightness
+            self.value[i] = value
+            self.pass_code[i] = pass_code
+            self.verdict[i] = verdict
+            self.reason_code[i] = reason_code
+            self.texts[i] = text
+            self.count += 1
+            return seq
+
+    def newest_first(self):
+        """Slot indexes from the newest reading back to the oldest retained one (caller holds the lock)."""
+        oldest = max(0, self.count - self.capacity)
+        for seq in range(self.count - 1, oldest - 1, -1):
+            yield seq % self.capacity
+
+    @property
+    def stored(self) -> int:
+        return min(self.count, self.capacity)
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (self.ts, self.conf, self.brightness, self.value, self.pass_code, self.verdict, self.reason_code)
+        return sum(a.itemsize * len(a) for a in arrays)
+
+
+class ReadingTimeline:
+    """
+    Full-rate record of every OCR reading per region (Day, Level, Runes):
+    text, confidence, pass, brightness and whether it was accepted or
+    rejected and why, without going through the (sampled) DEBUG log lines.
+
+    The vision threads record, the state actor judges, the inspector queries:
+    each region's ring has its own lock, held only for array reads/writes.
+    """
+
+    # Judging looks this far back for the reading a decision refers to
+    JUDGE_WINDOW = 64
+
+    def __init__(self, capacity: int = 4096):
+        self.capacity = capacity
+        self._rings: Dict[str, ReadingRing] = {}
+        self._lock = threading.Lock()
+        # Interned pass names / reasons (stored as small ints in the rings)
+        self._labels: List[str] = [""]
+        self._label_codes: Dict[str, int] = {"": 0}
+
+    def set_capacity(self, capacity: int):
+        """Resizes the rings (drops the current history)."""
+        capacity = max(16, int(capacity))
+        with self._lock:
+            if capacity != self.capacity:
+                self.capacity = capacity
+                self._rings = {}
+
+    def clear(self):
+        with self._lock:
+            self._rings = {}
+
+    def regions(self) -> List[str]:
+        return sorted(self._rings)
+
+    def _ring(self, region: str) -> ReadingRing:
+        ring = self._rings.get(region)
+        if ring is None:
+            with self._lock:
+                ring = self._rings.setdefault(region, ReadingRing(self.capacity))
+        return ring
+
+    def _code(self, label: str) -> int:
+        code = self._label_codes.get(label)
+        if code is None:
+            with self._lock:
+                code = self._label_codes.get(label)
+                if code is None:
+                    code = self._label_codes[label] = len(self._labels)
+                    self._labels.append(label)
+        return code
+
+    # --- Recording ---
+
+    def record(self, region: str, ts: float, text: str, conf: float, value: Optional[int] = None,
+               pass_name: str = "", brightness: float = -1.0, verdict: int = PENDING, reason: str = "") -> int:
+        """Stores one reading. Returns its sequence number in the region."""
+        return self._ring(region).append(
+            ts, text or "", float(conf), NO_VALUE if value is None else int(value),
+            self._code(pass_name), float(brightness), verdict, self._code(reason),
+        )
+
+    def judge(self, region: str, verdict: int, reason: str = "", value: Optional[int] = None,
+              ts: Optional[float] = None) -> bool:
+        """
+        Sets the verdict of the newest still-pending reading of a region,
+        optionally the one with this value (Level/Runes) or capture time (Day).
+        Returns False if no such reading is left (overwritten, or the decision
+        came from a burst / cached read that was not recorded).
+        """
+        ring = self._rings.get(region)
+        if ring is None:
+            return False
+        reason_code = self._code(reason)
+        with ring.lock:
+            for n, i in enumerate(ring.newest_first()):
+                if n >= self.JUDGE_WINDOW:
+                    break
+                if ring.verdict[i] != PENDING:
+                    continue
+                if value is not None and ring.value[i] != value:
+                    continue
+                if ts is not None and ring.ts[i] != ts:
+                    continue
+                ring.verdict[i] = verdict
+                ring.reason_code[i] = reason_code
+                return True
+        return False
+
+    # --- Queries ---
+
+    def _row(self, ring: ReadingRing, i: int) -> Dict[str, Any]:
+        value = ring.value[i]
+        return {
+            "t": ring.ts[i],
+            "text": ring.texts[i],
+            "conf": round(ring.conf[i], 1),
+            "value": None if value == NO_VALUE else value,
+            "pass": self._labels[ring.pass_code[i]],
+            "brightness": round(ring.brightness[i], 1),
+            "verdict": VERDICTS[ring.verdict[i]],
+            "reason": self._labels[ring.reason_code[i]],
+        }
+
+    def query(self, region: str, since: Optional[float] = None, min_conf: Optional[float] = None,
+              max_conf: Optional[float] = None, verdict: Optional[str] = None, text: Optional[str] = None,
+              limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Readings of a region matching every given filter, oldest first.
+        `since` is an absolute timestamp; `max_conf` is exclusive ("conf < 70");
+        `limit` keeps the newest ones.
+        """
+        ring = self._rings.get(region)
+        if ring is None:
+            return []
+        verdict_code = VERDICTS.index(verdict) if verdict else None
+        text = text.upper() if text else None
+        rows = []
+        with ring.lock:
+            for i in ring.newest_first():
+                if since is not None and ring.ts[i] < since:
+                    break
+                if min_conf is not None and ring.conf[i] < min_conf:
+                    continue
+                if max_conf is not None and ring.conf[i] >= max_conf:
+                    continue
+                if verdict_code is not None and ring.verdict[i] != verdict_code:
+                    continue
+                if text is not None and text not in ring.texts[i].upper():
+                    continue
+                rows.append(self._row(ring, i))
+                if limit and len(rows) >= limit:
+                    break
+        rows.reverse()
+        return rows
+
+    def last(self, region: str, seconds: float, now: Optional[float] = None, **filters) -> List[Dict[str, Any]]:
+        """query() over the last `seconds`: last("Runes", 30, max_conf=70)."""
+        now = time.time() if now is None else now
+        return self.query(region, since=now - seconds, **filters)
+
+    def series(self, region: str, field: str = "conf", seconds: float = 60.0,
+               now: Optional[float] = None) -> List[Tuple[float, float, int]]:
+        """(t, value, verdict) points of one numeric field (conf, brightness, value) for sparklines."""
+        ring = self._rings.get(region)
+        if ring is None:
+            return []
+        data = getattr(ring, field)
+        since = (time.time() if now is None else now) - seconds
+        points = []
+        with ring.lock:
+            for i in ring.newest_first():
+                if ring.ts[i] < since:
+                    break
+                if data[i] == NO_VALUE and field == "value":
+                    continue
+                points.append((ring.ts[i], float(data[i]), ring.verdict[i]))
+        points.reverse()
+        return points
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        stats = {}
+        for region in self.regions():
+            ring = self._rings[region]
+            with ring.lock:
+                counts = [0] * len(VERDICTS)
+                for i in ring.newest_first():
+                    counts[ring.verdict[i]] += 1
+                stats[region] = {"recorded": ring.count, "stored": ring.stored, "capacity": ring.capacity,
+                                 "bytes": ring.nbytes, **dict(zip(VERDICTS, counts))}
+        return stats
+
+    def to_dict(self, since: Optional[float] = None) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "stats": self.get_stats(),
+            "regions": {region: self.query(region, since=since) for region in self.regions()},
+        }
+
+    def dump_json(self, path: str, since: Optional[float] = None) -> Optional[str]:
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(since), f)
+            return path
+        except OSError:
+            return None
+
+
+_FILLER = {"last", "of", "with", "readings", "since"}
+_TOKEN = re.compile(r"^(conf|confidence)\s*([<>]=?)\s*(\d+(?:\.\d+)?)$|^(\d+(?:\.\d+)?)\s*(s|m)$", re.IGNORECASE)
+
+
+def parse_query(expr: str, regions: List[str]) -> Tuple[Optional[str], Optional[float], Dict[str, Any]]:
+    """
+    Inspector filter box: "runes 30s conf<70 rejected" -> ("Runes", 30.0, {"max_conf": 70.0, "verdict": "rejected"}).
+    Filler words ("last", "of", "with"...) are ignored, any other word is matched against the reading text.
+    """
+    region, seconds, filters = None, None, {}
+    by_name = {r.lower(): r for r in regions}
+    expr = re.sub(r"\s*([<>]=?)\s*", r"\1", expr)
+    expr = re.sub(r"(\d)\s+([sm])\b", r"\1\2", expr, flags=re.IGNORECASE)
+    for token in expr.split():
+        low = token.lower()
+        m = _TOKEN.match(token)
+        if low in _FILLER:
+            continue
+        if low in by_name:
+            region = by_name[low]
+        elif low in VERDICTS:
+            filters["verdict"] = low
+        elif m and m.group(1):
+            op, val = m.group(2), float(m.group(3))
+            if op.startswith("<"):
+                filters["max_conf"] = val + (0.001 if op == "<=" else 0.0)
+            else:
+                filters["min_conf"] = val + (0.0 if op == ">=" else 0.001)
+        elif m:
+            seconds = float(m.group(4)) * (60.0 if m.group(5).lower() == "m" else 1.0)
+        else:
+            filters["text"] = token
+    return region, seconds, filters
+
+
+# Process-wide timeline (like the tracer): vision threads record, the state actor judges
+readings = ReadingTimeline()
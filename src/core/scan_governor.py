@@ -0,0 +1,75 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+class ScanMode:
+    ARMED = "ARMED"            # Day OCR on, full adaptive rate (banner expected)
+    FADE_WATCH = "FADE_WATCH"  # Day OCR off, fast capture for brightness fades (Day 3 logic)
+    HEARTBEAT = "HEARTBEAT"    # Day OCR off, minimal capture (black screen / death validation only)
+
+
+@dataclass(frozen=True)
+class ScanPolicy:
+    mode: str
+    ocr_enabled: bool
+    min_delay: float  # Floor applied to the vision main loop delay (0 = adaptive only)
+    reason: str
+
+
+class DayScanGovernor:
+    """
+    Predictive scan-rate governor for the Day banner.
+
+    The banner can only appear at the run start and on the Boss -> next day
+    transitions of the phase timeline. Day OCR is armed inside those windows
+    and the main capture loop drops to a heartbeat elsewhere.
+
+    Capture is never fully stopped during a run: brightness still drives the
+    black-screen death validation and the Day 3 fade triggers.
+    """
+
+    def __init__(self, phases: List[dict], boss_lead: float = 15.0,
+                 heartbeat_delay: float = 0.2, fade_watch_delay: float = 0.1):
+        self.phases = phases
+        self.boss_lead = boss_lead            # Arm this many seconds before a timed phase hands over to a boss
+        self.heartbeat_delay = heartbeat_delay
+        self.fade_watch_delay = fade_watch_delay
+
+    def _is_banner_boss(self, idx: int) -> bool:
+        # Boss phases followed by a new day (not the final boss)
+        if not (0 <= idx < len(self.phases) - 1):
+            return False
+        phase = self.phases[idx]
+        return phase["duration"] == 0 and "Boss" in phase["name"]
+
+    def decide(self, phase_index: int, elapsed: Optional[float] = None,
+               victory_detected: bool = False) -> ScanPolicy:
+        if victory_detected:
+            return ScanPolicy(ScanMode.ARMED, True, 0.0, "Post-victory (next run)")
+
+        if phase_index < 0:
+            return ScanPolicy(ScanMode.ARMED, True, 0.0, "Pre-run wait (JOUR I)")
+
+        if self._is_banner_boss(phase_index):
+            return ScanPolicy(ScanMode.ARMED, True, 0.0, f"{self.phases[phase_index]['name']} (next day banner)")
+
+        phase = self.phases[phase_index]
+        duration = phase["duration"]
+        if duration > 0 and elapsed is not None and self._is_banner_boss(phase_index + 1):
+            if duration - elapsed <= self.boss_lead:
+                return ScanPolicy(ScanMode.ARMED, True, 0.0, "Boss imminent")
+
+        if duration == 0:
+            # Day 3 Prep / Final Boss: transitions come from brightness fades
+            return ScanPolicy(ScanMode.FADE_WATCH, False, self.fade_watch_delay, f"{phase['name']} (fade watch)")
+
+        return ScanPolicy(ScanMode.HEARTBEAT, False, self.heartbeat_delay, f"{phase['name']} (no banner expected)")
+
+    def next_change(self, phase_index: int, start_time: Optional[float]) -> Optional[float]:
+        """Absolute time at which decide() changes within the current phase (arming lead), if any."""
+        if start_time is None or not (0 <= phase_index < len(self.phases)):
+            return None
+        duration = self.phases[phase_index]["duration"]
+        if duration > 0 and self._is_banner_boss(phase_index + 1):
+            return start_time + max(0.0, duration - self.boss_lead)
+        return None
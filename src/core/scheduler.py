@@ -0,0 +1,200 @@
+import heapq
+import itertools
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+from src.logger import logger
+
+
+@dataclass(order=True)
+class ScheduledJob:
+    """A single wakeup. Ordered by (when, seq) so the heap stays stable."""
+    when: float
+    seq: int
+    callback: Callable = field(compare=False)
+    name: str = field(default="", compare=False)
+    group: str = field(default="", compare=False)
+    interval: Optional[float] = field(default=None, compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+
+class EventScheduler:
+    """
+    Deadline-driven scheduler (min-heap of wakeups).
+
+    Replaces fixed-period polling: the loop thread sleeps until the next
+    deadline instead of waking every N ms. Jobs can be added/cancelled from any
+    thread; adding an earlier deadline wakes the loop immediately.
+    Recurring jobs are re-armed from their *scheduled* time (no drift).
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self._heap: List[ScheduledJob] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._running_job: Optional[ScheduledJob] = None
+
+        # Stats
+        self.wakeups = 0
+        self.jobs_run = 0
+        self.errors = 0
+        self.max_late_ms = 0.0
+
+    # --- Scheduling API ---
+
+    def schedule_at(self, when: float, callback: Callable, name: str = "", group: str = "",
+                    interval: Optional[float] = None) -> ScheduledJob:
+        job = ScheduledJob(when, next(self._seq), callback, name, group, interval)
+        with self._cond:
+            heapq.heappush(self._heap, job)
+            # Wake the loop if this is the new earliest deadline
+            if self._heap[0] is job:
+                self._cond.notify()
+        return job
+
+    def schedule_in(self, delay: float, callback: Callable, name: str = "", group: str = "") -> ScheduledJob:
+        return self.schedule_at(self.clock() + delay, callback, name, group)
+
+    def schedule_every(self, interval: float, callback: Callable, name: str = "", group: str = "",
+                       first_at: Optional[float] = None) -> ScheduledJob:
+        if first_at is None:
+            first_at = self.clock() + interval
+        return self.schedule_at(first_at, callback, name, group, interval=interval)
+
+    def cancel(self, job: Optional[ScheduledJob]):
+        # Lazy deletion: cancelled jobs are discarded when they reach the top of the heap
+        if job is not None:
+            job.cancelled = True
+
+    def cancel_group(self, group: str):
+        with self._cond:
+            for job in self._heap:
+                if job.group == group:
+                    job.cancelled = True
+            # The job currently executing is out of the heap: mark it so it is not re-armed
+            if self._running_job is not None and self._running_job.group == group:
+                self._running_job.cancelled = True
+
+    def next_deadline(self) -> Optional[float]:
+        with self._cond:
+            self._discard_cancelled()
+            return self._heap[0].when if self._heap else None
+
+    def pending(self, group: Optional[str] = None) -> List[Tuple[float, str]]:
+        """Snapshot of live (when, name) pairs, sorted. For debugging/inspector."""
+        with self._cond:
+            jobs = [j for j in self._heap if not j.cancelled and (group is None or j.group == group)]
+        return sorted((j.when, j.name) for j in jobs)
+
+    # --- Execution ---
+
+    def _discard_cancelled(self):
+        while self._heap and self._heap[0].cancelled:
+            heapq.heappop(self._heap)
+
+    def run_due(self, now: Optional[float] = None) -> int:
+        """Runs every job whose deadline is <= now. Returns the number of jobs executed."""
+        if now is None:
+            now = self.clock()
+        count = 0
+        while True:
+            with self._cond:
+                self._discard_cancelled()
+                if not self._heap or self._heap[0].when > now:
+                    break
+                job = heapq.heappop(self._heap)
+                self._running_job = job
+
+            late_ms = (now - job.when) * 1000
+            if late_ms > self.max_late_ms:
+                self.max_late_ms = late_ms
+
+            try:
+                job.callback()
+            except Exception as e:
+                self.errors += 1
+                logger.error(f"Scheduler: job '{job.name}' crashed: {e}", exc_info=True)
+            self.jobs_run += 1
+            count += 1
+            with self._cond:
+                self._running_job = None
+
+            # Re-arm recurring jobs (unless the callback cancelled them)
+            if job.interval and not job.cancelled:
+                job.when += job.interval
+                if job.when <= now:
+                    # Fell behind (suspend / long callback): skip missed beats, keep the phase
+                    missed = math.floor((now - job.when) / job.interval) + 1
+                    job.when += missed * job.interval
+                job.seq = next(self._seq)
+                with self._cond:
+                    heapq.heappush(self._heap, job)
+        return count
+
+    def run_forever(self, is_running: Callable[[], bool], max_wait: float = 5.0):
+        """Loop: sleep until the next deadline (or a new earlier job), run due jobs."""
+        while is_running() and not self._stopped:
+            self.run_due()
+            with self._cond:
+                if self._stopped:
+                    break
+                self._discard_cancelled()
+                timeout = max_wait
+                if self._heap:
+                    timeout = min(max_wait, max(0.0, self._heap[0].when - self.clock()))
+                if timeout > 0:
+                    self._cond.wait(timeout)
+                self.wakeups += 1
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def get_stats(self) -> dict:
+        with self._cond:
+            live = sum(1 for j in self._heap if not j.cancelled)
+        return {
+            "pending": live,
+            "wakeups": self.wakeups,
+            "jobs_run": self.jobs_run,
+            "errors": self.errors,
+            "max_late_ms": round(self.max_late_ms, 2),
+        }
+
+
+@dataclass
+class PhaseTimeline:
+    """
+    Precomputed instants for the current phase.
+    All values are absolute timestamps (same clock as session.start_time).
+    """
+    phase_index: int
+    start_time: float
+    duration: float
+    expiry: Optional[float]                       # None for stopwatch phases (duration 0)
+    announcements: List[Tuple[float, int]]        # (instant, remaining_seconds)
+
+    @classmethod
+    def build(cls, phases: list, phase_index: int, start_time: float,
+              announce_at: Tuple[int, ...] = ()) -> "PhaseTimeline":
+        phase = phases[phase_index]
+        duration = phase["duration"]
+        expiry = start_time + duration if duration > 0 else None
+        announcements = []
+        if expiry is not None:
+            for sec in announce_at:
+                if 0 < sec < duration:
+                    announcements.append((expiry - sec, sec))
+        announcements.sort()
+        return cls(phase_index, start_time, duration, expiry, announcements)
+
+    def next_second_boundary(self, now: float, epsilon: float = 0.005) -> float:
+        """Next whole-second instant relative to the phase start (timer display changes there)."""
+        elapsed = max(0.0, now - self.start_time)
+        return self.start_time + math.floor(elapsed) + 1 + epsilon
@@ -0,0 +1,170 @@
+"""
+Sensor Recording - Raw inputs of the state logic, for offline replay (src/replay.py)
+
+One JSON object per line, `t` is the StateService clock (epoch seconds):
+    {"t": 1718000000.12, "kind": "runes", "value": 12345, "confidence": 91.0}
+
+Input kinds (re-fed by the replay):
+    ocr     Day banner OCR result (text, width, offset, word_data, brightness, score)
+    level   Level reading (value, confidence)
+    runes   Runes reading (value, confidence)
+    menu    Menu screen detection (is_open)
+    tuning  Tuner open/closed (active)
+    hotkey  Global hotkey press (key)
+    vision  Return value of a synchronous vision call (call, value): bursts, victory scan
+
+Output kinds (reference for diffing a replay against the live run):
+    header  First line: format version + config snapshot
+    event   GAME_EVENT as logged by StateService.log_session_event (event_type, data)
+    phase   PhaseChangeEvent (index, name, manual)
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from src.logger import logger
+
+INPUT_KINDS = ("ocr", "level", "runes", "menu", "tuning", "hotkey", "vision")
+OUTPUT_KINDS = ("event", "phase")
+
+
+class SensorRecorder:
+    VERSION = 1
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time, flush_every: int = 50):
+        self.path = path
+        self.clock = clock
+        self.flush_every = flush_every
+        self._lock = threading.Lock()
+        self._file = None
+        self._pending = 0
+
+        # Stats
+        self.records = 0
+        self.errors = 0
+
+    def start(self, config: Optional[Dict[str, Any]] = None):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self.record("header", version=self.VERSION, config=config or {})
+        logger.info(f"SensorRecorder: recording to {self.path}")
+
+    def record(self, kind: str, **fields):
+        """Thread-safe (vision, keyboard and actor threads all record)."""
+        if self._file is None:
+            return
+        entry = {"t": self.clock(), "kind": kind}
+        entry.update(fields)
+        try:
+            line = json.dumps(entry, separators=(",", ":"), default=str)
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"SensorRecorder: cannot serialize {kind}: {e}")
+            return
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line + "\n")
+            self.records += 1
+            self._pending += 1
+            if self._pending >= self.flush_every:
+                self._file.flush()
+                self._pending = 0
+
+    def on_session_event(self, event: dict):
+        self.record("event", event_type=event.get("event_type"), data=event.get("data", {}))
+
+    def on_phase_change(self, event):
+        self.record("phase", index=event.new_phase_index, name=event.phase_name, manual=event.manual)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def get_stats(self) -> dict:
+        return {"path": self.path, "records": self.records, "errors": self.errors}
+
+
+class RecordingVision:
+    """
+    Transparent VisionService proxy: records what the synchronous calls returned
+    (bursts, victory scan) so the replay can answer them the same way.
+    """
+
+    RECORDED_CALLS = ("request_level_burst", "request_runes_burst", "scan_victory_region")
+    # Async variants are recorded under the synchronous name the replay answers
+    RECORDED_ASYNC_CALLS = {"request_level_burst_async": "request_level_burst",
+                            "request_runes_burst_async": "request_runes_burst"}
+
+    def __init__(self, vision, recorder: SensorRecorder):
+        self._vision = vision
+        self._recorder = recorder
+
+    @property
+    def wrapped(self):
+        return self._vision
+
+    def __getattr__(self, name):
+        attr = getattr(self._vision, name)
+        if name in self.RECORDED_ASYNC_CALLS:
+            call = self.RECORDED_ASYNC_CALLS[name]
+
+            def _recorded_async(callback):
+                def _done(value):
+                    self._recorder.record("vision", call=call, value=value)
+                    callback(value)
+                return attr(_done)
+            return _recorded_async
+        if name not in self.RECORDED_CALLS:
+            return attr
+
+        def _recorded(*args, **kwargs):
+            value = attr(*args, **kwargs)
+            self._recorder.record("vision", call=name, value=value)
+            return value
+        return _recorded
+
+
+def read_recording(path: str) -> Iterator[dict]:
+    """Yields the records of a sensor recording (corrupt lines are skipped)."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def load_game_events(log_path: str) -> List[dict]:
+    """
+    GAME_EVENTs of an application.jsonl log, as {"t", "kind": "event", "event_type", "data"}.
+    These are outputs only (the raw readings are not logged): usable as a diff
+    reference for a replay, not as its input.
+    """
+    events = []
+    with open(log_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if "GAME EVENT:" not in line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            event = entry.get("data")
+            if not isinstance(event, dict) or "event_type" not in event:
+                continue
+            events.append({
+                "t": event.get("timestamp", 0.0),
+                "kind": "event",
+                "event_type": event["event_type"],
+                "data": event.get("data", {}),
+            })
+    return events
@@ -10,9 +10,11 @@ class GameSession:
     NASA-grade Stats Freeze Gate: Level/Runes updates are blocked when stats_frozen=True
     """
     
-    def __init__(self, session_id: int = -1):
+    def __init__(self, session_id: int = -1, now: Optional[float] = None):
+        if now is None:
+            now = time.time()
         self.id = session_id
-        self.start_time = time.time()
+        self.start_time = now
         self.phase_index = -1
         
         # Identity
@@ -81,8 +83,21 @@ class GameSession:
         self.last_calculated_delta = 0
         
         # Timestamps
-        self.last_stat_change_time = time.time()
-        self.graph_start_time = time.time()
+        self.last_stat_change_time = now
+        self.graph_start_time = now
+    
+    def __setattr__(self, name, value):
+        # Dirty tracking for checkpointing: any attribute assignment marks the session modified
+        object.__setattr__(self, name, value)
+        if name != "_dirty":
+            object.__setattr__(self, "_dirty", True)
+    
+    @property
+    def dirty(self) -> bool:
+        return getattr(self, "_dirty", True)
+    
+    def clear_dirty(self):
+        object.__setattr__(self, "_dirty", False)
     
     # NASA-grade Property Gates for Stats
     @property
@@ -121,3 +136,29 @@ class GameSession:
             "runes": self.current_runes,
             "phase": self.phase_index
         }
+    
+    # Fields persisted by the checkpoint (timeline, stats, curve)
+    CHECKPOINT_FIELDS = (
+        "id", "run_name", "phase_index", "start_time", "boss3_start_time", "day1_detection_time",
+        "timer_frozen", "death_count", "recovery_count", "run_accumulated_history",
+        "graph_events", "day_transition_markers", "ui_transitions",
+    )
+    
+    def to_checkpoint(self) -> Dict[str, Any]:
+        """Compact, JSON-serializable snapshot for warm restart."""
+        data = {name: getattr(self, name, None) for name in self.CHECKPOINT_FIELDS}
+        # Gated stats are stored from their backing fields
+        data["stats_frozen"] = self._stats_frozen
+        data["current_run_level"] = self._current_run_level
+        data["current_runes"] = self._current_runes
+        return data
+    
+    def restore_checkpoint(self, data: Dict[str, Any]):
+        for name in self.CHECKPOINT_FIELDS:
+            if name in data and data[name] is not None:
+                setattr(self, name, data[name])
+        self.day_transition_markers = [tuple(m) for m in data.get("day_transition_markers") or []]
+        # Bypass the freeze gate: the checkpoint is authoritative
+        self._current_run_level = data.get("current_run_level", 1)
+        self._current_runes = data.get("current_runes", 0)
+        self._stats_frozen = data.get("stats_frozen", False)
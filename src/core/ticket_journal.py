@@ -0,0 +1,158 @@
+"""
+Ticket Journal - Append-only log of ticket lifecycle events
+
+Every TicketManager state change (created, evidence, resolved, applied,
+reverted, expired) is appended as one JSON line. Periodic compact snapshots
+(TicketManager + rune accumulators) record the journal offset they cover, so
+a restart rebuilds the state by loading the snapshot and replaying the tail.
+
+The current run is written to `tickets_current.jsonl`. It is archived as
+`tickets_<tag>.jsonl` when a new run starts, so past runs can be replayed
+offline (tools/replay_ticket_journal.py).
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.logger import logger
+
+
+class TicketJournal:
+    CURRENT = "tickets_current"
+
+    def __init__(self, journal_dir: str, snapshot_every: int = 50, clock: Callable[[], float] = time.time):
+        self.journal_dir = journal_dir
+        self.clock = clock
+        self.snapshot_every = snapshot_every
+        self.journal_path = os.path.join(journal_dir, f"{self.CURRENT}.jsonl")
+        self.snapshot_path = os.path.join(journal_dir, f"{self.CURRENT}.snapshot.json")
+
+        # Returns the compact state to snapshot (set by StateService)
+        self.snapshot_provider: Optional[Callable[[], Dict[str, Any]]] = None
+
+        self._lock = threading.Lock()
+        self._file = None
+        self.seq = 0
+        self.events_since_snapshot = 0
+        self.enabled = True
+
+    # --- Writing ---
+
+    def _open(self):
+        if self._file is None:
+            os.makedirs(self.journal_dir, exist_ok=True)
+            self._file = open(self.journal_path, "a", encoding="utf-8")
+
+    def append(self, event_type: str, **payload):
+        """Appends one lifecycle event. Triggers a snapshot every `snapshot_every` events."""
+        if not self.enabled:
+            return
+        snapshot_due = False
+        with self._lock:
+            try:
+                self._open()
+                self.seq += 1
+                event = {"seq": self.seq, "t": self.clock(), "type": event_type}
+                event.update(payload)
+                self._file.write(json.dumps(event, separators=(",", ":")) + "\n")
+                self._file.flush()
+                self.events_since_snapshot += 1
+                snapshot_due = self.events_since_snapshot >= self.snapshot_every
+            except Exception as e:
+                logger.error(f"Ticket Journal: append failed: {e}")
+        if snapshot_due:
+            self.snapshot()
+
+    def snapshot(self):
+        """Writes a compact snapshot covering the journal up to its current end (atomic replace)."""
+        if not self.enabled or self.snapshot_provider is None:
+            return
+        try:
+            state = self.snapshot_provider()
+            with self._lock:
+                self._open()
+                self._file.flush()
+                data = {"seq": self.seq, "offset": self._file.tell(), "t": self.clock(), "state": state}
+                tmp_path = self.snapshot_path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, separators=(",", ":"))
+                os.replace(tmp_path, self.snapshot_path)
+                self.events_since_snapshot = 0
+        except Exception as e:
+            logger.error(f"Ticket Journal: snapshot failed: {e}")
+
+    def rotate(self, tag: str):
+        """Archives the current journal (new run) and starts an empty one."""
+        with self._lock:
+            try:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                if os.path.exists(self.journal_path) and os.path.getsize(self.journal_path) > 0:
+                    os.replace(self.journal_path, os.path.join(self.journal_dir, f"tickets_{tag}.jsonl"))
+                if os.path.exists(self.snapshot_path):
+                    os.remove(self.snapshot_path)
+                self.seq = 0
+                self.events_since_snapshot = 0
+            except Exception as e:
+                logger.error(f"Ticket Journal: rotate failed: {e}")
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    # --- Reading ---
+
+    def last_write_time(self) -> Optional[float]:
+        try:
+            return os.path.getmtime(self.journal_path)
+        except OSError:
+            return None
+
+    def load(self) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Returns (snapshot_state, tail_events).
+        Only the events written after the snapshot are parsed.
+        """
+        state = None
+        offset = 0
+        seq = 0
+        if os.path.exists(self.snapshot_path):
+            try:
+                with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                    snap = json.load(f)
+                state = snap.get("state")
+                offset = snap.get("offset", 0)
+                seq = snap.get("seq", 0)
+            except Exception as e:
+                logger.error(f"Ticket Journal: unreadable snapshot, full replay: {e}")
+                state, offset, seq = None, 0, 0
+
+        tail = list(self.read_events(self.journal_path, offset))
+        if tail:
+            seq = tail[-1].get("seq", seq)
+        self.seq = max(self.seq, seq)
+        return state, tail
+
+    @staticmethod
+    def read_events(path: str, offset: int = 0) -> Iterator[Dict[str, Any]]:
+        """Streams events from a journal file. A truncated last line (crash mid-write) is ignored."""
+        if not os.path.exists(path):
+            return
+        # Binary mode: the snapshot offset is a byte position
+        with open(path, "rb") as f:
+            if offset:
+                f.seek(offset)
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line.decode("utf-8"))
+                except (UnicodeDecodeError, json.JSONDecodeError):
+                    continue
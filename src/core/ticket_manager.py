@@ -11,10 +11,14 @@ Key Concepts:
 - Graph updates are deferred until ticket validation
 """
 
+import heapq
+import itertools
+import threading
 import time
 import logging
-from typing import Dict, List, Optional
-from dataclasses import dataclass, field
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Set
+from dataclasses import asdict, dataclass, field
 
 logger = logging.getLogger(__name__)
 
@@ -80,59 +84,129 @@ class TicketManager:
     - Collect evidence from game events
     - Resolve tickets based on evidence priority
     - Apply validated tickets to game state
+    
+    Tickets are indexed by state and every time-based rule is a deadline in a
+    min-heap (0.5s merchant, 2s timeout, retention). A tick only touches the
+    tickets that are due: O(due) instead of O(all tickets).
     """
     
-    def __init__(self, config: dict):
+    MERCHANT_DELAY = 0.5   # Wait for a level change before calling it a merchant purchase
+    RESOLVE_TIMEOUT = 2.0  # Unresolved tickets are settled after this delay
+    STATES = ("PENDING", "VALIDATED", "REJECTED", "APPLIED", "REVERTED")
+    TERMINAL_STATES = ("REJECTED", "APPLIED", "REVERTED")
+    
+    def __init__(self, config: dict, clock: Callable[[], float] = time.time):
         self.config = config
+        self.clock = clock  # Injectable (virtual clock in replays)
         self.tickets: Dict[str, TransactionTicket] = {}
         self.next_ticket_id = 1
         self.debug_mode = config.get("debug_mode", False)
-    
-    def create_ticket(self, amount: int, old_runes: int, new_runes: int, 
-                     transaction_type: str = "SPENDING", context: Dict = None) -> TransactionTicket:
-        """Create a new transaction ticket."""
-        ticket_id = f"T{self.next_ticket_id:04d}"
-        self.next_ticket_id += 1
-        
-        ticket = TransactionTicket(
-            id=ticket_id,
-            timestamp=time.time(),
-            amount=amount,
-            old_runes=old_runes,
-            new_runes=new_runes,
-            transaction_type=transaction_type,
-            context=context or {}
-        )
-        
-        # Immediate evidence: Multiple of 100?
-        if amount % 100 == 0:
-            ticket.evidence["multiple_of_100"] = True
-        
-        self.tickets[ticket_id] = ticket
+        self.retention = config.get("ticket_retention", 300.0)
         
-        if self.debug_mode:
-            logger.info(f"TICKET_CREATED: {ticket_id} | Type: {transaction_type} | Amount: {amount:+d} | Old: {old_runes} → New: {new_runes}")
+        # Indexes
+        self._by_state: Dict[str, Set[str]] = {state: set() for state in self.STATES}
+        self._validated_queue: Deque[str] = deque()
+        # Deadlines: (when, seq, ticket_id, kind) with kind in ("resolve", "retention")
+        self._deadlines: list = []
+        self._seq = itertools.count()
+        self._lock = threading.RLock()
         
-        return ticket
+        # Optional TicketJournal (event sourcing). None = in-memory only.
+        self.journal = None
     
-    def add_evidence(self, ticket_id: str, evidence_type: str, value: any):
-        """Add evidence to a ticket."""
-        if ticket_id not in self.tickets:
+    # --- Internal helpers ---
+    
+    def _record(self, event_type: str, **payload):
+        if self.journal is not None:
+            self.journal.append(event_type, **payload)
+    
+    def _push_deadline(self, when: float, ticket_id: str, kind: str):
+        heapq.heappush(self._deadlines, (when, next(self._seq), ticket_id, kind))
+    
+    def _register(self, ticket: TransactionTicket):
+        """Indexes a new PENDING ticket and pushes its time-based resolution deadlines."""
+        self.tickets[ticket.id] = ticket
+        self._by_state["PENDING"].add(ticket.id)
+        if ticket.evidence["multiple_of_100"]:
+            self._push_deadline(ticket.timestamp + self.MERCHANT_DELAY, ticket.id, "resolve")
+        self._push_deadline(ticket.timestamp + self.RESOLVE_TIMEOUT, ticket.id, "resolve")
+    
+    def _transition(self, ticket: TransactionTicket, new_state: str):
+        """Single entry point for state changes: keeps the indexes and deadlines consistent."""
+        old_state = ticket.state
+        if old_state == new_state:
             return
+        self._by_state[old_state].discard(ticket.id)
+        self._by_state[new_state].add(ticket.id)
+        ticket.state = new_state
         
-        ticket = self.tickets[ticket_id]
-        if ticket.state != "PENDING":
-            return  # Already resolved
-        
-        ticket.evidence[evidence_type] = value
+        if new_state == "APPLIED":
+            self._record("applied", id=ticket.id)
+        elif new_state == "REVERTED":
+            self._record("reverted", id=ticket.id)
         
+        if new_state == "VALIDATED":
+            self._validated_queue.append(ticket.id)
+        elif new_state in self.TERMINAL_STATES:
+            # Retention is counted from creation (same rule as the old periodic sweep)
+            self._push_deadline(ticket.timestamp + self.retention, ticket.id, "retention")
+    
+    def _settle(self, ticket: TransactionTicket, resolution: str, state: str, how: str):
+        ticket.resolution = resolution
+        ticket.resolved_at = self.clock()
+        self._record("resolved", id=ticket.id, resolution=resolution, state=state, how=how)
+        self._transition(ticket, state)
         if self.debug_mode:
-            logger.info(f"TICKET_EVIDENCE: {ticket_id} | {evidence_type} = {value}")
-        
-        # Try to resolve immediately if we have strong evidence
-        self.resolve_ticket(ticket_id)
+            logger.info(f"TICKET_RESOLVED: {ticket.id} → {resolution} ({how})")
     
-    def resolve_ticket(self, ticket_id: str):
+    # --- Public API ---
+    
+    def create_ticket(self, amount: int, old_runes: int, new_runes: int, 
+                     transaction_type: str = "SPENDING", context: Dict = None) -> TransactionTicket:
+        """Create a new transaction ticket."""
+        with self._lock:
+            ticket_id = f"T{self.next_ticket_id:04d}"
+            self.next_ticket_id += 1
+            
+            ticket = TransactionTicket(
+                id=ticket_id,
+                timestamp=self.clock(),
+                amount=amount,
+                old_runes=old_runes,
+                new_runes=new_runes,
+                transaction_type=transaction_type,
+                context=context or {}
+            )
+            
+            # Immediate evidence: Multiple of 100?
+            if amount % 100 == 0:
+                ticket.evidence["multiple_of_100"] = True
+            
+            self._register(ticket)
+            self._record("created", ticket=asdict(ticket))
+            
+            if self.debug_mode:
+                logger.info(f"TICKET_CREATED: {ticket_id} | Type: {transaction_type} | Amount: {amount:+d} | Old: {old_runes} → New: {new_runes}")
+            
+            return ticket
+    
+    def add_evidence(self, ticket_id: str, evidence_type: str, value: any, now: Optional[float] = None):
+        """Add evidence to a ticket."""
+        with self._lock:
+            ticket = self.tickets.get(ticket_id)
+            if ticket is None or ticket.state != "PENDING":
+                return  # Unknown or already resolved
+            
+            ticket.evidence[evidence_type] = value
+            self._record("evidence", id=ticket_id, key=evidence_type, value=value)
+            
+            if self.debug_mode:
+                logger.info(f"TICKET_EVIDENCE: {ticket_id} | {evidence_type} = {value}")
+            
+            # Try to resolve immediately if we have strong evidence
+            self.resolve_ticket(ticket_id, now)
+    
+    def resolve_ticket(self, ticket_id: str, now: Optional[float] = None):
         """
         Resolve a ticket based on collected evidence and transaction type.
         
@@ -145,120 +219,194 @@ class TicketManager:
         Delayed Resolution:
         - SPENDING: 0.5-2s validation (wait for level change)
         """
-        if ticket_id not in self.tickets:
-            return
-        
-        ticket = self.tickets[ticket_id]
-        if ticket.state != "PENDING":
-            return  # Already resolved
-        
-        # Instant resolution for specific transaction types
-        if ticket.transaction_type == "GAIN":
-            ticket.resolution = "GAIN"
-            ticket.state = "VALIDATED"
-            ticket.resolved_at = time.time()
-            if self.debug_mode:
-                logger.info(f"TICKET_RESOLVED: {ticket_id} → GAIN (instant)")
-            return
-        
-        if ticket.transaction_type == "DEATH":
-            ticket.resolution = "DEATH"
-            ticket.state = "VALIDATED"
-            ticket.resolved_at = time.time()
-            if self.debug_mode:
-                logger.info(f"TICKET_RESOLVED: {ticket_id} → DEATH (instant)")
-            return
-        
-        if ticket.transaction_type == "RECOVERY":
-            ticket.resolution = "RECOVERY"
-            ticket.state = "VALIDATED"
-            ticket.resolved_at = time.time()
-            if self.debug_mode:
-                logger.info(f"TICKET_RESOLVED: {ticket_id} → RECOVERY (instant)")
-            return
-        
-        # Priority 1: Level-up (instant, no ambiguity)
-        if ticket.evidence["level_up_detected"]:
-            ticket.resolution = "LEVEL_UP"
-            ticket.state = "VALIDATED"
-            ticket.resolved_at = time.time()
+        with self._lock:
+            ticket = self.tickets.get(ticket_id)
+            if ticket is None or ticket.state != "PENDING":
+                return  # Unknown or already resolved
             
-            if self.debug_mode:
-                logger.info(f"TICKET_RESOLVED: {ticket_id} → LEVEL_UP (cost match)")
-            return
-        
-        # Priority 2: Ghost (quick recovery)
-        if ticket.evidence["ghost_recovery"]:
-            ticket.resolution = "GHOST"
-            ticket.state = "REJECTED"
-            ticket.resolved_at = time.time()
+            # Instant resolution for specific transaction types
+            if ticket.transaction_type in ("GAIN", "DEATH", "RECOVERY"):
+                self._settle(ticket, ticket.transaction_type, "VALIDATED", "instant")
+                return
             
-            if self.debug_mode:
-                logger.info(f"TICKET_RESOLVED: {ticket_id} → GHOST (OCR error)")
-            return
-        
-        # Priority 3: Merchant (multiple of 100, no level change)
-        # Wait at least 0.5s to ensure level change would have been detected
-        age = time.time() - ticket.timestamp
-        if ticket.evidence["multiple_of_100"] and age > 0.5:
-            ticket.resolution = "MERCHANT"
-            ticket.state = "VALIDATED"
-            ticket.resolved_at = time.time()
+            # Priority 1: Level-up (instant, no ambiguity)
+            if ticket.evidence["level_up_detected"]:
+                self._settle(ticket, "LEVEL_UP", "VALIDATED", "cost match")
+                return
             
-            if self.debug_mode:
-                logger.info(f"TICKET_RESOLVED: {ticket_id} → MERCHANT (multiple of 100)")
-            return
-        
-        # Default: Timeout (2s)
-        if age > 2.0:
-            if ticket.evidence["multiple_of_100"]:
-                ticket.resolution = "MERCHANT"
-                ticket.state = "VALIDATED"
-            else:
-                ticket.resolution = "ERROR"
-                ticket.state = "REJECTED"
+            # Priority 2: Ghost (quick recovery)
+            if ticket.evidence["ghost_recovery"]:
+                self._settle(ticket, "GHOST", "REJECTED", "OCR error")
+                return
             
-            ticket.resolved_at = time.time()
+            # Priority 3: Merchant (multiple of 100, no level change)
+            # Wait at least 0.5s to ensure level change would have been detected
+            age = (now if now is not None else self.clock()) - ticket.timestamp
+            if ticket.evidence["multiple_of_100"] and age >= self.MERCHANT_DELAY:
+                self._settle(ticket, "MERCHANT", "VALIDATED", "multiple of 100")
+                return
             
-            if self.debug_mode:
-                logger.info(f"TICKET_RESOLVED: {ticket_id} → {ticket.resolution} (timeout)")
+            # Default: Timeout (2s)
+            if age >= self.RESOLVE_TIMEOUT:
+                if ticket.evidence["multiple_of_100"]:
+                    self._settle(ticket, "MERCHANT", "VALIDATED", "timeout")
+                else:
+                    self._settle(ticket, "ERROR", "REJECTED", "timeout")
     
-    def check_pending_tickets(self):
-        """Check all pending tickets and try to resolve them."""
-        for ticket_id in list(self.tickets.keys()):
-            ticket = self.tickets[ticket_id]
-            if ticket.state == "PENDING":
-                self.resolve_ticket(ticket_id)
+    def check_pending_tickets(self, now: Optional[float] = None) -> int:
+        """
+        Processes due deadlines only (resolution timeouts and retention).
+        Returns the number of deadlines handled.
+        """
+        if now is None:
+            now = self.clock()
+        handled = 0
+        removed = 0
+        with self._lock:
+            while self._deadlines and self._deadlines[0][0] <= now:
+                _, _, ticket_id, kind = heapq.heappop(self._deadlines)
+                ticket = self.tickets.get(ticket_id)
+                if ticket is None:
+                    continue  # Stale entry
+                handled += 1
+                if kind == "resolve":
+                    if ticket.state == "PENDING":
+                        self.resolve_ticket(ticket_id, now)
+                elif kind == "retention":
+                    if ticket.state in self.TERMINAL_STATES:
+                        self._by_state[ticket.state].discard(ticket_id)
+                        del self.tickets[ticket_id]
+                        self._record("expired", id=ticket_id)
+                        removed += 1
+        
+        if removed and self.debug_mode:
+            logger.info(f"TICKET_CLEANUP: Removed {removed} old tickets")
+        return handled
+    
+    def next_deadline(self) -> Optional[float]:
+        """Earliest pending deadline (None if nothing is scheduled). Validated tickets waiting in the queue count as due now."""
+        with self._lock:
+            if self._validated_queue:
+                return self.clock()
+            while self._deadlines and self._deadlines[0][2] not in self.tickets:
+                heapq.heappop(self._deadlines)
+            return self._deadlines[0][0] if self._deadlines else None
+    
+    def drain_validated(self) -> List[TransactionTicket]:
+        """Pops the tickets validated since the last call, in validation order."""
+        drained = []
+        with self._lock:
+            while self._validated_queue:
+                ticket = self.tickets.get(self._validated_queue.popleft())
+                if ticket is not None and ticket.state == "VALIDATED":
+                    drained.append(ticket)
+        return drained
     
     def get_validated_tickets(self) -> List[TransactionTicket]:
         """Get all tickets that have been validated but not yet applied."""
-        return [t for t in self.tickets.values() if t.state == "VALIDATED"]
+        with self._lock:
+            return [self.tickets[tid] for tid in self._by_state["VALIDATED"]]
     
     def get_active_tickets(self) -> List[TransactionTicket]:
         """Get all pending tickets."""
-        return [t for t in self.tickets.values() if t.state == "PENDING"]
+        with self._lock:
+            return [self.tickets[tid] for tid in self._by_state["PENDING"]]
     
     def mark_applied(self, ticket_id: str):
         """Mark a ticket as applied to game state."""
-        if ticket_id in self.tickets:
-            self.tickets[ticket_id].state = "APPLIED"
+        with self._lock:
+            if ticket_id in self.tickets:
+                self._transition(self.tickets[ticket_id], "APPLIED")
     
     def mark_reverted(self, ticket_id: str):
         """Mark a ticket as reverted (ghost/error)."""
-        if ticket_id in self.tickets:
-            self.tickets[ticket_id].state = "REVERTED"
+        with self._lock:
+            if ticket_id in self.tickets:
+                self._transition(self.tickets[ticket_id], "REVERTED")
     
     def cleanup_old_tickets(self, max_age: float = 300.0):
-        """Remove tickets older than max_age seconds."""
-        now = time.time()
-        to_remove = []
-        
-        for ticket_id, ticket in self.tickets.items():
-            if ticket.state in ["APPLIED", "REVERTED"] and (now - ticket.timestamp) > max_age:
-                to_remove.append(ticket_id)
-        
-        for ticket_id in to_remove:
-            del self.tickets[ticket_id]
+        """Remove terminal tickets older than max_age seconds (retention deadlines do this automatically)."""
+        now = self.clock()
+        with self._lock:
+            to_remove = [tid for state in self.TERMINAL_STATES for tid in self._by_state[state]
+                         if (now - self.tickets[tid].timestamp) > max_age]
+            for ticket_id in to_remove:
+                self._by_state[self.tickets[ticket_id].state].discard(ticket_id)
+                del self.tickets[ticket_id]
+                self._record("expired", id=ticket_id)
         
         if to_remove and self.debug_mode:
             logger.info(f"TICKET_CLEANUP: Removed {len(to_remove)} old tickets")
+    
+    def get_stats(self) -> dict:
+        with self._lock:
+            stats = {state.lower(): len(ids) for state, ids in self._by_state.items()}
+            stats["deadlines"] = len(self._deadlines)
+            stats["queued"] = len(self._validated_queue)
+            return stats
+    
+    # --- Event Sourcing (TicketJournal) ---
+    
+    def to_snapshot(self) -> Dict[str, Any]:
+        """Compact serializable state (live tickets + id counter + validated queue)."""
+        with self._lock:
+            return {
+                "next_ticket_id": self.next_ticket_id,
+                "tickets": [asdict(t) for t in self.tickets.values()],
+                "validated_queue": list(self._validated_queue),
+            }
+    
+    def load_snapshot(self, data: Dict[str, Any]):
+        """Replaces the current state with a snapshot (indexes and deadlines are rebuilt)."""
+        with self._lock:
+            self.tickets = {}
+            self._by_state = {state: set() for state in self.STATES}
+            self._validated_queue = deque()
+            self._deadlines = []
+            self.next_ticket_id = data.get("next_ticket_id", 1)
+            for raw in data.get("tickets", []):
+                ticket = TransactionTicket(**raw)
+                self.tickets[ticket.id] = ticket
+                self._by_state[ticket.state].add(ticket.id)
+                if ticket.state == "PENDING":
+                    self._register(ticket)
+                elif ticket.state in self.TERMINAL_STATES:
+                    self._push_deadline(ticket.timestamp + self.retention, ticket.id, "retention")
+            for ticket_id in data.get("validated_queue", []):
+                if ticket_id in self._by_state["VALIDATED"]:
+                    self._validated_queue.append(ticket_id)
+    
+    def apply_event(self, event: Dict[str, Any]):
+        """
+        Replays one journal event. Recorded outcomes are applied as-is (no rule evaluation),
+        so replay reproduces exactly what happened live.
+        """
+        journal, self.journal = self.journal, None  # Never re-journal during replay
+        try:
+            with self._lock:
+                kind = event.get("type")
+                if kind == "created":
+                    ticket = TransactionTicket(**event["ticket"])
+                    if ticket.id not in self.tickets:
+                        self._register(ticket)
+                        self.next_ticket_id = max(self.next_ticket_id, int(ticket.id[1:]) + 1)
+                    return
+                
+                ticket = self.tickets.get(event.get("id"))
+                if ticket is None:
+                    return
+                if kind == "evidence":
+                    ticket.evidence[event["key"]] = event["value"]
+                elif kind == "resolved":
+                    ticket.resolution = event["resolution"]
+                    ticket.resolved_at = event.get("t")
+                    self._transition(ticket, event["state"])
+                elif kind == "applied":
+                    self._transition(ticket, "APPLIED")
+                elif kind == "reverted":
+                    self._transition(ticket, "REVERTED")
+                elif kind == "expired":
+                    self._by_state[ticket.state].discard(ticket.id)
+                    del self.tickets[ticket.id]
+        finally:
+            self.journal = journal
@@ -0,0 +1,212 @@
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram (HDR-style, microseconds).
+
+    Values below 32us get one bucket each; above, every power of two is split in
+    16 linear sub-buckets, so any recorded value is known within ~6% up to ~19h
+    with 544 integer counters and no allocation on record().
+    """
+
+    SUB_BITS = 5                      # 32 exact buckets, then 16 per octave
+    SUB_COUNT = 1 << SUB_BITS
+    HALF_COUNT = SUB_COUNT >> 1
+    MAX_SHIFT = 32
+    BUCKETS = SUB_COUNT + MAX_SHIFT * HALF_COUNT
+    MAX_VALUE = (1 << (SUB_BITS + MAX_SHIFT)) - 1
+
+    def __init__(self):
+        self.counts = [0] * self.BUCKETS
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def bucket_index(cls, value: int) -> int:
+        if value < cls.SUB_COUNT:
+            return value
+        shift = value.bit_length() - cls.SUB_BITS
+        return cls.SUB_COUNT + (shift - 1) * cls.HALF_COUNT + (value >> shift) - cls.HALF_COUNT
+
+    @classmethod
+    def bucket_range(cls, index: int):
+        """(lowest, highest) value of a bucket, in us."""
+        if index < cls.SUB_COUNT:
+            return index, index
+        shift = (index - cls.SUB_COUNT) // cls.HALF_COUNT + 1
+        top = (index - cls.SUB_COUNT) % cls.HALF_COUNT + cls.HALF_COUNT
+        return top << shift, ((top + 1) << shift) - 1
+
+    def record(self, value_us: int):
+        value = min(max(int(value_us), 0), self.MAX_VALUE)
+        idx = self.bucket_index(value)
+        with self._lock:
+            self.counts[idx] += 1
+            if self.count == 0 or value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+            self.count += 1
+            self.total += value
+
+    def percentile(self, q: float) -> int:
+        """Highest value equivalent to the q-th percentile (us)."""
+        if self.count == 0:
+            return 0
+        target = max(1, int(round(q / 100.0 * self.count)))
+        seen = 0
+        for idx, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return min(self.bucket_range(idx)[1], self.max)
+        return self.max
+
+    def get_stats(self) -> Dict[str, Any]:
+        if self.count == 0:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "min_us": self.min,
+            "p50_us": self.percentile(50),
+            "p90_us": self.percentile(90),
+            "p99_us": self.percentile(99),
+            "max_us": self.max,
+            "mean_us": round(self.total / self.count, 1),
+            "total_ms": round(self.total / 1000.0, 1),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Stats plus the non-empty buckets [low_us, high_us, count] (JSON dumps)."""
+        data = self.get_stats()
+        data["buckets"] = [list(self.bucket_range(i)) + [n] for i, n in enumerate(self.counts) if n]
+        return data
+
+
+class _NullSpan:
+    """Shared no-op span/stopwatch: the whole cost of tracing while it is disabled."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def lap(self, stage: str):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "start")
+
+    def __init__(self, tracer: "Tracer", name: str):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.record_ns(self.name, time.perf_counter_ns() - self.start)
+        return False
+
+
+class _Stopwatch:
+    """Sequential stages of one loop: lap(stage) records the time since the previous lap."""
+    __slots__ = ("tracer", "prefix", "last")
+
+    def __init__(self, tracer: "Tracer", prefix: str):
+        self.tracer = tracer
+        self.prefix = prefix
+        self.last = time.perf_counter_ns()
+
+    def lap(self, stage: str):
+        now = time.perf_counter_ns()
+        self.tracer.record_ns(f"{self.prefix}.{stage}", now - self.last)
+        self.last = now
+
+
+class Tracer:
+    """
+    Span instrumentation of the vision/state pipeline.
+
+    Disabled by default (config "trace_spans"): span() and stopwatch() then
+    return a shared no-op object, so instrumented code pays one attribute check.
+    Each span name feeds its own LatencyHistogram.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.started_at = time.time()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def set_enabled(self, enabled: bool):
+        self.enabled = bool(enabled)
+
+    def span(self, name: str):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def stopwatch(self, prefix: str):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Stopwatch(self, prefix)
+
+    def record(self, name: str, seconds: float):
+        """Records an already measured duration (e.g. a loop's sleep)."""
+        if self.enabled:
+            self._histogram(name).record(seconds * 1e6)
+
+    def record_ns(self, name: str, ns: int):
+        self._histogram(name).record(ns // 1000)
+
+    def _histogram(self, name: str) -> LatencyHistogram:
+        hist = self._histograms.get(name)
+        if hist is None:
+            with self._lock:
+                hist = self._histograms.setdefault(name, LatencyHistogram())
+        return hist
+
+    def names(self) -> List[str]:
+        return sorted(self._histograms)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: self._histograms[name].get_stats() for name in self.names()}
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+        self.started_at = time.time()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "started_at": self.started_at,
+            "duration_s": round(time.time() - self.started_at, 1),
+            "spans": {name: self._histograms[name].to_dict() for name in self.names()},
+        }
+
+    def dump_json(self, path: str) -> Optional[str]:
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, indent=2)
+            return path
+        except OSError:
+            return None
+
+
+# Process-wide tracer (like the event bus): vision threads, state actor and inspector share it
+tracer = Tracer()
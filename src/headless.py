@@ -0,0 +1,225 @@
+"""
+Headless Pipeline - Production logic on recorded frames, without Qt
+
+Wires the real VisionEngine (fed by a RecordedFrameSource), StateService,
+TicketManager and DatabaseService to recording overlay/tray/audio stubs.
+Frames are pushed synchronously through the vision cycles as fast as they
+are processed (or at recording speed with `realtime=True`), so a recorded run
+can be re-analyzed many times faster than real time on a machine without a
+display (Linux CI, batch jobs).
+
+Time is a VirtualClock driven by the frame timestamps (as in src/replay.py):
+grace periods, ticket deadlines and the Level gate run on recording time, and
+the state actor is driven synchronously after each frame instead of by a thread.
+
+Every file the services write (config, stats.db, journals, checkpoints, run
+logs) goes to `workdir`: the live install's data/ is never touched.
+"""
+
+import os
+import shutil
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.core.clock import VirtualClock
+from src.service_container import ServiceContainer
+from src.services.base_service import IConfigService, IVisionService, IOverlayService, IStateService, IDatabaseService, ITrayService, IAudioService
+from src.services.config_service import ConfigService
+from src.services.vision_service import VisionService
+from src.services.database_service import DatabaseService
+from src.services.state_service import StateService
+from src.services.headless_services import HeadlessOverlayService, HeadlessTrayService, HeadlessAudioService
+from src.utils.frame_source import RecordedFrameSource
+from src.logger import logger
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round(q / 100.0 * (len(sorted_values) - 1)))))
+    return sorted_values[idx]
+
+
+def latency_summary(values_ms: List[float]) -> Dict[str, float]:
+    ordered = sorted(values_ms)
+    return {
+        "p50": round(percentile(ordered, 50), 2),
+        "p95": round(percentile(ordered, 95), 2),
+        "max": round(ordered[-1], 2) if ordered else 0.0,
+    }
+
+
+def prepare_workdir(workdir: str, config_path: str, overrides: Dict[str, Any]) -> ConfigService:
+    """
+    Copies the config into workdir/data, moves there (StateService/DatabaseService
+    resolve data/ from the working directory) and returns the loaded config.
+    """
+    data_dir = os.path.join(workdir, "data")
+    os.makedirs(data_dir, exist_ok=True)
+    if os.path.exists(config_path):
+        shutil.copyfile(config_path, os.path.join(data_dir, "config.json"))
+    os.chdir(workdir)
+
+    config = ConfigService(os.path.join("data", "config.json"))
+    config.initialize()
+    for key, value in overrides.items():
+        config.set(key, value)
+    return config
+
+
+class HeadlessPipeline:
+    SECONDARY_PERIOD = 0.2  # Level/Runes pass cadence of the secondary thread (recording time)
+
+    # The recorded game process is not running here and there is nothing to resume
+    CONFIG_OVERRIDES = {"auto_hibernate": False, "resume_on_restart": False}
+
+    def __init__(self, recording: str, workdir: str, config_path: Optional[str] = None,
+                 origin: Tuple[int, int] = (0, 0), fps: Optional[float] = None,
+                 realtime: bool = False, config_overrides: Optional[Dict[str, Any]] = None):
+        self.recording = os.path.abspath(recording)
+        self.workdir = os.path.abspath(workdir)
+        self.config_path = os.path.abspath(config_path or os.path.join("data", "config.json"))
+        self.origin = origin
+        self.fps = fps
+        self.realtime = realtime
+        self.config_overrides = dict(self.CONFIG_OVERRIDES, **(config_overrides or {}))
+
+        self.source: Optional[RecordedFrameSource] = None
+        self.state: Optional[StateService] = None
+        self.epoch = time.time()  # Wall time of frame 0 (frame timestamps are relative)
+        self.clock = VirtualClock(self.epoch)
+
+        # Stats
+        self.frames = 0
+        self.secondary_cycles = 0
+        self.main_ms: List[float] = []
+        self.secondary_ms: List[float] = []
+        self.sensor_counts: Counter = Counter()
+        self.wall_time = 0.0
+
+    # --- Setup ---
+
+    def setup(self):
+        self.source = RecordedFrameSource(self.recording, origin=self.origin, fps=self.fps)
+
+        container = ServiceContainer()
+        self.config = prepare_workdir(self.workdir, self.config_path, self.config_overrides)
+        container.register(IConfigService, self.config)
+
+        self.vision = VisionService(self.config, clock=self.clock)
+        self.vision.initialize()
+        self.vision.set_frame_source(self.source)
+        container.register(IVisionService, self.vision)
+
+        self.overlay = HeadlessOverlayService(clock=self.clock)
+        self.tray = HeadlessTrayService()
+        self.audio = HeadlessAudioService(clock=self.clock)
+        container.register(IOverlayService, self.overlay)
+        container.register(ITrayService, self.tray)
+        container.register(IAudioService, self.audio)
+
+        self.db = DatabaseService()
+        self.db.initialize()
+        container.register(IDatabaseService, self.db)
+
+        self.state = StateService(self.config, self.vision, self.overlay, self.db, self.audio, self.tray, clock=self.clock)
+        container.register(IStateService, self.state)
+        self.state.initialize(start_capture=False, hotkeys=False, actor_thread=False)
+
+        # Sensor counters (registered after the StateService bridge)
+        self.vision.add_observer(self._count_day)
+        self.vision.add_level_observer(lambda lvl, conf: self.sensor_counts.update(["level"]))
+        self.vision.add_runes_observer(lambda runes, conf: self.sensor_counts.update(["runes"]))
+
+        logger.info(f"Headless: {len(self.source)} frames from {self.recording} ({self.source.fps:.1f} fps)")
+
+    def _count_day(self, text, width, offset, word_data, brightness=0, score=0):
+        self.sensor_counts["day_text" if text else "day_empty"] += 1
+
+    # --- Run ---
+
+    def run(self, max_frames: Optional[int] = None) -> Dict[str, Any]:
+        if self.state is None:
+            self.setup()
+
+        last_secondary = None
+        t_start = time.perf_counter()
+        while (max_frames is None or self.frames < max_frames) and self.source.advance():
+            if self.realtime:
+                wait = self.source.timestamp - (time.perf_counter() - t_start)
+                if wait > 0:
+                    time.sleep(wait)
+
+            self.advance_to(self.epoch + self.source.timestamp)
+            secondary = last_secondary is None or self.source.timestamp - last_secondary >= self.SECONDARY_PERIOD
+            t0 = time.perf_counter()
+            self.vision.run_main_cycle()
+            t1 = time.perf_counter()
+            self.main_ms.append((t1 - t0) * 1000)
+            if secondary:
+                self.vision.run_secondary_cycle()
+                self.secondary_ms.append((time.perf_counter() - t1) * 1000)
+                self.secondary_cycles += 1
+                last_secondary = self.source.timestamp
+            self.state.scheduler.run_due()  # Readings of this frame
+            self.frames += 1
+
+        self._wait_for_actor()
+        self.wall_time = time.perf_counter() - t_start
+        return self.summary()
+
+    def advance_to(self, when: float):
+        """Runs every scheduler job due up to `when`, each at its own deadline."""
+        scheduler = self.state.scheduler
+        while True:
+            deadline = scheduler.next_deadline()
+            if deadline is None or deadline > when:
+                break
+            self.clock.set(deadline)
+            scheduler.run_due()
+        self.clock.set(when)
+
+    def _wait_for_actor(self, timeout: float = 5.0):
+        """Drains the messages still posted after the last frame (burst verdicts come from a worker thread)."""
+        deadline = time.time() + timeout
+        while True:
+            self.state.scheduler.run_due()
+            if self.state.mailbox.depth == 0 or time.time() >= deadline:
+                break
+            time.sleep(0.01)
+
+    # --- Report ---
+
+    def summary(self) -> Dict[str, Any]:
+        recorded = self.source.timestamp if self.source else 0.0
+        debug_state = self.state.get_debug_state() if self.state else {}
+        return {
+            "frames": self.frames,
+            "secondary_cycles": self.secondary_cycles,
+            "wall_s": round(self.wall_time, 3),
+            "recording_s": round(recorded, 3),
+            "fps": round(self.frames / self.wall_time, 1) if self.wall_time > 0 else 0.0,
+            "speedup": round(recorded / self.wall_time, 2) if self.wall_time > 0 else 0.0,
+            "main_ms": latency_summary(self.main_ms),
+            "secondary_ms": latency_summary(self.secondary_ms),
+            "sensors": dict(self.sensor_counts),
+            "mailbox": self.state.mailbox.get_stats() if self.state else {},
+            "tickets": self.state.ticket_manager.get_stats() if self.state else {},
+            "final": {
+                "phase": debug_state.get("phase"),
+                "level": debug_state.get("level"),
+                "runes": debug_state.get("runes"),
+                "deaths": debug_state.get("death_count"),
+            },
+            "overlay_calls": dict(self.overlay.calls) if self.state else {},
+            "announcements": len(self.audio.announcements) if self.state else 0,
+        }
+
+    def shutdown(self):
+        if self.state:
+            self.state.shutdown()
+            self.vision.shutdown()
+            self.db.shutdown()
+        if self.source:
+            self.source.close()
@@ -0,0 +1,383 @@
+"""
+Latency Harness - Banner-to-timer detection latency
+
+Replays day-banner sequences (synthetic fades rendered by SyntheticHUD, or a
+recorded frame directory with a known banner onset) through the real
+VisionEngine, StateService consensus and Trigger(index), and measures the time
+from the banner's first appearance on screen to the timer restart.
+
+Time is a VirtualClock that runs at wall speed while the pipeline works
+(capture, OCR passes, state actor) and jumps over the loop's sleeps, so each
+trial pays the real OCR cost on this machine but follows the capture pacing
+(fast mode, power save, bursts) of the live loop. Per trial the report has:
+latency from onset, first useful reading, readings used by the consensus,
+and the Day frames and Tesseract calls consumed since onset.
+
+Requires the Tesseract library (config `tesseract_lib` / `tessdata_dir`).
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.core.clock import VirtualClock
+from src.core.events import bus, PhaseChangeEvent
+from src.headless import percentile, prepare_workdir
+from src.service_container import ServiceContainer
+from src.services.base_service import IConfigService, IVisionService, IOverlayService, IStateService, IDatabaseService, ITrayService, IAudioService
+from src.services.database_service import DatabaseService
+from src.services.state_service import StateService
+from src.services.vision_service import VisionService
+from src.services.headless_services import HeadlessOverlayService, HeadlessTrayService, HeadlessAudioService
+from src.utils.synthetic_hud import HudStyle, SyntheticHUD
+from src.logger import logger
+
+# Banner -> (phase it is read in, phase it starts)
+BANNER_PHASES = {"JOUR II": (4, 5), "JOUR III": (9, 10)}
+
+
+class PacedClock(VirtualClock):
+    """VirtualClock that also runs at wall speed inside `live()` (pipeline work)."""
+
+    def __init__(self, start: float = 0.0):
+        super().__init__(start)
+        self._live_since: Optional[float] = None
+
+    def __call__(self) -> float:
+        live_since = self._live_since
+        if live_since is None:
+            return self._now
+        return self._now + (time.perf_counter() - live_since)
+
+    @contextmanager
+    def live(self):
+        self._live_since = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - self._live_since
+            self._live_since = None
+            self.advance(elapsed)
+
+
+@dataclass
+class BannerTiming:
+    """Shape of a synthetic banner sequence (seconds)."""
+    lead: float = 3.0      # Gameplay before the banner (fast mode / power save settle)
+    fade_in: float = 0.6
+    hold: float = 2.5
+    fade_out: float = 0.6
+    tail: float = 1.0      # Still waiting after the banner is gone
+
+    @property
+    def duration(self) -> float:
+        return self.lead + self.fade_in + self.hold + self.fade_out + self.tail
+
+
+class SyntheticBannerSequence:
+    """
+    Frame source of one banner fade: background plate, then the banner alpha-blended
+    in, held and faded out, rendered for the clock time of each grab().
+    """
+
+    def __init__(self, hud: SyntheticHUD, text: str, clock: Callable[[], float],
+                 timing: BannerTiming, style: Optional[HudStyle] = None):
+        self.hud = hud
+        self.text = text
+        self.clock = clock
+        self.timing = timing
+        self.style = style or hud.random_style("banner")
+        self.onset = timing.lead
+        self.duration = timing.duration
+        self.t0 = 0.0
+
+        # Same rng state for both renders: identical plate and noise under the text
+        rng_state = hud.rng.getstate()
+        self._background = hud.render("banner", "", self.style).astype(np.float32)
+        hud.rng.setstate(rng_state)
+        self._banner = hud.render("banner", text, self.style).astype(np.float32)
+        region = hud.regions["banner"]
+        self.region = (int(region.get("left", 0)), int(region.get("top", 0)),
+                       int(region.get("width", 0)), int(region.get("height", 0)))
+
+    def start(self, t0: float):
+        self.t0 = t0
+
+    def alpha(self, elapsed: float) -> float:
+        t = self.timing
+        x = elapsed - t.lead
+        if x < 0:
+            return 0.0
+        if x < t.fade_in:
+            return x / t.fade_in if t.fade_in > 0 else 1.0
+        x -= t.fade_in
+        if x < t.hold:
+            return 1.0
+        x -= t.hold
+        if x < t.fade_out:
+            return 1.0 - x / t.fade_out
+        return 0.0
+
+    def grab(self, monitor: Dict[str, int]) -> Optional[np.ndarray]:
+        x, y = int(monitor.get("left", 0)), int(monitor.get("top", 0))
+        w, h = int(monitor.get("width", 0)), int(monitor.get("height", 0))
+        if w <= 0 or h <= 0:
+            return None
+        cx, cy, cw, ch = self.region
+        if not (cx <= x and cy <= y and x + w <= cx + cw and y + h <= cy + ch):
+            return self.hud.render("banner", "", HudStyle(background="dark"), size=(w, h))
+        a = self.alpha(self.clock() - self.t0)
+        frame = self._background if a <= 0 else self._background * (1.0 - a) + self._banner * a
+        return frame[y - cy:y - cy + h, x - cx:x - cx + w].astype(np.uint8)
+
+    def describe(self) -> Dict[str, Any]:
+        return {"text": self.text, "style": asdict(self.style)}
+
+    def close(self):
+        pass
+
+
+class RecordedBannerSequence:
+    """
+    Frame source playing a recorded banner (RecordedFrameSource) on the clock:
+    each grab() shows the frame on screen at that recording time. `onset` is the
+    recording time at which the banner starts to appear.
+    """
+
+    def __init__(self, path: str, onset: float, clock: Callable[[], float],
+                 origin: Tuple[int, int] = (0, 0), fps: Optional[float] = None, tail: float = 1.0):
+        from src.utils.frame_source import RecordedFrameSource
+        self.source = RecordedFrameSource(path, origin=origin, fps=fps)
+        self.path = path
+        self.clock = clock
+        self.onset = onset
+        self.duration = self.source.duration + tail
+        self.t0 = 0.0
+
+    def start(self, t0: float):
+        self.t0 = t0
+        self.source.advance()
+
+    def _next_timestamp(self) -> Optional[float]:
+        nxt = self.source.index + 1
+        if nxt >= len(self.source):
+            return None
+        if self.source.timestamps and nxt < len(self.source.timestamps):
+            return self.source.timestamps[nxt] - self.source.timestamps[0]
+        return nxt / self.source.fps
+
+    def grab(self, monitor: Dict[str, int]) -> Optional[np.ndarray]:
+        elapsed = self.clock() - self.t0
+        while True:
+            ts = self._next_timestamp()
+            if ts is None or ts > elapsed or not self.source.advance():
+                break
+        return self.source.grab(monitor)
+
+    def describe(self) -> Dict[str, Any]:
+        return {"recording": self.path, "onset": self.onset}
+
+    def close(self):
+        self.source.close()
+
+
+def distribution(values: List[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+    if not ordered:
+        return {"n": 0}
+    return {
+        "n": len(ordered),
+        "p50": round(percentile(ordered, 50), 1),
+        "p90": round(percentile(ordered, 90), 1),
+        "p99": round(percentile(ordered, 99), 1),
+        "max": round(ordered[-1], 1),
+        "mean": round(sum(ordered) / len(ordered), 1),
+    }
+
+
+def summarize_trials(trials: List[Dict[str, Any]]) -> Dict[str, Any]:
+    detected = [t for t in trials if t["detected"]]
+    return {
+        "trials": len(trials),
+        "detected": len(detected),
+        "missed": len(trials) - len(detected),
+        "latency_ms": distribution([t["latency_ms"] for t in detected]),
+        "first_reading_ms": distribution([t["first_reading_ms"] for t in detected if t.get("first_reading_ms") is not None]),
+        "pipeline_ms": distribution([t["pipeline_ms"] for t in detected if t.get("pipeline_ms") is not None]),
+        "readings": distribution([t["readings"] for t in detected if t.get("readings") is not None]),
+        "frames": distribution([t["frames"] for t in detected]),
+        "ocr_calls": distribution([t["ocr_calls"] for t in detected]),
+        "frames_missed": distribution([t["frames"] for t in trials if not t["detected"]]),
+    }
+
+
+class LatencyHarness:
+    GAP = 6.0  # Clock time between trials (trigger cooldown, trigger buffer, fast mode expiry)
+
+    # No game process, nothing to resume, no training samples written per trigger
+    CONFIG_OVERRIDES = {
+        "auto_hibernate": False,
+        "resume_on_restart": False,
+        "record_sensors": False,
+        "save_raw_samples": False,
+    }
+
+    def __init__(self, workdir: str, config_path: Optional[str] = None, text: str = "JOUR II",
+                 config_overrides: Optional[Dict[str, Any]] = None):
+        if text not in BANNER_PHASES:
+            raise ValueError(f"Unsupported banner {text!r} (expected one of {list(BANNER_PHASES)})")
+        self.workdir = os.path.abspath(workdir)
+        self.config_path = os.path.abspath(config_path or os.path.join("data", "config.json"))
+        self.text = text
+        self.config_overrides = dict(self.CONFIG_OVERRIDES, **(config_overrides or {}))
+
+        self.clock = PacedClock(10000.0)  # Far from 0: the "last seen" timestamps start long expired
+        self.state: Optional[StateService] = None
+        self.trials: List[Dict[str, Any]] = []
+        self._phase_changes: List[Tuple[float, int]] = []
+
+    # --- Setup ---
+
+    def setup(self):
+        container = ServiceContainer()
+        self.config = prepare_workdir(self.workdir, self.config_path, self.config_overrides)
+        container.register(IConfigService, self.config)
+
+        self.vision = VisionService(self.config, clock=self.clock)
+        self.vision.initialize()
+        if not self.vision.engine.tess_pool_main:
+            raise RuntimeError("Tesseract library not loaded (set tesseract_lib / tessdata_dir)")
+        container.register(IVisionService, self.vision)
+
+        self.overlay = HeadlessOverlayService(clock=self.clock)
+        self.tray = HeadlessTrayService()
+        self.audio = HeadlessAudioService(clock=self.clock)
+        container.register(IOverlayService, self.overlay)
+        container.register(ITrayService, self.tray)
+        container.register(IAudioService, self.audio)
+
+        self.db = DatabaseService()
+        self.db.initialize()
+        container.register(IDatabaseService, self.db)
+
+        self.state = StateService(self.config, self.vision, self.overlay, self.db, self.audio, self.tray, clock=self.clock)
+        container.register(IStateService, self.state)
+        self._phase_subscription = bus.subscribe(PhaseChangeEvent, self._on_phase_change)
+        self.state.initialize(start_capture=False, hotkeys=False, actor_thread=False)
+
+    def _on_phase_change(self, event: PhaseChangeEvent):
+        self._phase_changes.append((self.clock(), event.new_phase_index))
+
+    # --- Clock ---
+
+    def _advance(self, seconds: float):
+        """Sleeps `seconds` of clock time, running the scheduler jobs at their deadlines."""
+        target = self.clock() + seconds
+        scheduler = self.state.scheduler
+        while True:
+            deadline = scheduler.next_deadline()
+            if deadline is None or deadline > target:
+                break
+            self.clock.set(deadline)
+            scheduler.run_due()
+        self.clock.set(target)
+
+    def _drain(self):
+        """State actor: processes the readings the last cycle posted."""
+        while self.state.scheduler.run_due():
+            pass
+
+    # --- Trials ---
+
+    def run_trial(self, sequence) -> Dict[str, Any]:
+        if self.state is None:
+            self.setup()
+        armed_phase, target_phase = BANNER_PHASES[self.text]
+
+        self._advance(self.GAP)
+        self.state.Trigger(armed_phase)
+        self._drain()
+        latencies_before = len(self.state.trigger_latencies)
+        self._phase_changes = []
+
+        self.vision.set_frame_source(sequence)
+        t0 = self.clock()
+        sequence.start(t0)
+        onset, end = t0 + sequence.onset, t0 + sequence.duration
+
+        at_onset = None
+        triggered_at = None
+        while self.clock() < end:
+            if at_onset is None and self.clock() >= onset:
+                at_onset = self.vision.get_capture_stats()
+            with self.clock.live():
+                delay = self.vision.run_main_cycle()
+                self._drain()
+            hits = [t for t, idx in self._phase_changes if idx == target_phase]
+            if hits:
+                triggered_at = hits[0]
+                break
+            self._advance(delay)
+
+        stats = self.vision.get_capture_stats()
+        at_onset = at_onset or stats
+        trial = {
+            "trial": len(self.trials),
+            "detected": triggered_at is not None,
+            "latency_ms": round((triggered_at - onset) * 1000, 1) if triggered_at is not None else None,
+            "frames": stats["captures"] - at_onset["captures"],
+            "ocr_calls": stats["ocr_calls"] - at_onset["ocr_calls"],
+            "first_reading_ms": None,
+            "pipeline_ms": None,
+            "readings": None,
+            "sequence": sequence.describe(),
+        }
+        if triggered_at is not None and len(self.state.trigger_latencies) > latencies_before:
+            entry = self.state.trigger_latencies[-1]
+            trial["first_reading_ms"] = round((entry["first_capture_ts"] - onset) * 1000, 1)
+            trial["pipeline_ms"] = entry["pipeline_ms"]
+            trial["readings"] = entry["readings"]
+        elif triggered_at is not None:
+            trial["via"] = "fade"  # Phase changed without an OCR consensus (Day 3 fade logic)
+
+        self.vision.set_frame_source(None)
+        sequence.close()
+        self.trials.append(trial)
+        if not trial["detected"]:
+            logger.warning(f"Latency Harness: trial {trial['trial']} missed {self.text} ({trial['frames']} frames)")
+        return trial
+
+    def run(self, sequences, progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """`sequences`: iterable of frame sources (SyntheticBannerSequence / RecordedBannerSequence)."""
+        t_start = time.perf_counter()
+        for sequence in sequences:
+            trial = self.run_trial(sequence)
+            if progress:
+                progress(trial)
+        return {
+            "banner": self.text,
+            "wall_s": round(time.perf_counter() - t_start, 2),
+            "summary": summarize_trials(self.trials),
+            "trials": self.trials,
+        }
+
+    def synthetic_sequences(self, count: int, seed: int = 0, timing: Optional[BannerTiming] = None,
+                            fonts: Optional[List[str]] = None, plates_dir: Optional[str] = None):
+        """`count` banner fades with random SyntheticHUD styles (same seed = same styles)."""
+        if self.state is None:
+            self.setup()
+        hud = SyntheticHUD(self.config.get_all(), fonts=fonts, plates_dir=plates_dir, seed=seed)
+        timing = timing or BannerTiming()
+        for _ in range(count):
+            yield SyntheticBannerSequence(hud, self.text, self.clock, timing)
+
+    def shutdown(self):
+        if self.state:
+            self.state.shutdown()
+            self.vision.shutdown()
+            self.db.shutdown()
+            bus.unsubscribe(self._phase_subscription)
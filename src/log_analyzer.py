@@ -0,0 +1,378 @@
+"""
+Log Analyzer - Per-session report of the rotated application.jsonl logs
+
+Streams application.jsonl.5 ... .1 then application.jsonl (RotatingFileHandler,
+10 MB x5) line by line in a single pass: memory stays bounded by the number of
+sessions and events, not by the log size. Each session (context.session_id)
+gets OCR/trigger latency percentiles (fixed-bucket histograms), its trigger
+timeline, death / merchant / level-up counts and per-minute resource trends.
+
+The same pass maintains a sidecar offset index (application.jsonl.idx.json):
+per file, the byte ranges of each session and the offsets of each event type.
+Files are identified by a hash of their first line, so the index survives the
+renames of a rotation, and the growing live file is indexed incrementally.
+A report on one session, or a dump of one event type, then seeks straight to
+its lines instead of re-reading 60 MB.
+"""
+
+import hashlib
+import json
+import os
+import re
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.core.tracing import LatencyHistogram
+
+INDEX_VERSION = 1
+
+_TRIGGER_LATENCY = re.compile(r"Trigger latency (DAY \d): (\d+)ms from first capture \((\d+) readings, last frame (\d+)ms\)")
+_ACTIVATING = re.compile(r"ACTIVATING TRIGGER (DAY \d)")
+_CANDIDATE = re.compile(r"(?:Trigger|MATCHED) Candidate '(.*)' -> (DAY \d) \(Score: ([\d.]+)\)")
+
+
+def log_files(log_path: str) -> List[str]:
+    """The rotated files of a log, oldest first (application.jsonl.5 ... application.jsonl)."""
+    rotated = []
+    for name in os.listdir(os.path.dirname(os.path.abspath(log_path)) or "."):
+        base = os.path.basename(log_path)
+        if name.startswith(base + ".") and name[len(base) + 1:].isdigit():
+            rotated.append((int(name[len(base) + 1:]), os.path.join(os.path.dirname(log_path), name)))
+    files = [path for _, path in sorted(rotated, reverse=True)]
+    if os.path.exists(log_path):
+        files.append(log_path)
+    return files
+
+
+def file_signature(path: str) -> Optional[str]:
+    """Hash of the first line: stable across rotation renames (None for an empty file)."""
+    with open(path, "rb") as f:
+        first = f.readline()
+    return hashlib.sha1(first).hexdigest() if first else None
+
+
+def classify(entry: dict) -> Optional[str]:
+    """Event type of a log record for the index (None = not indexed)."""
+    message = entry.get("message", "")
+    if message.startswith("GAME EVENT: "):
+        return message[12:]
+    if message.startswith("Trigger latency "):
+        return "TRIGGER_LATENCY"
+    if message.startswith("ACTIVATING TRIGGER"):
+        return "TRIGGER"
+    if "Candidate '" in message:
+        return "TRIGGER_CANDIDATE"
+    if message.startswith("HEARTBEAT"):
+        return "HEARTBEAT"
+    if entry.get("level") in ("ERROR", "CRITICAL"):
+        return "ERROR"
+    return None
+
+
+def session_of(entry: dict) -> str:
+    return str(entry.get("context", {}).get("session_id", "?"))
+
+
+class LogIndex:
+    """
+    Sidecar offset index: {signature: {"size", "lines", "sessions": {id: {"ranges": [[start, end]],
+    "events": {type: [offsets]}}}}}. Ranges are merged while consecutive lines share a session.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+
+    def load(self) -> "LogIndex":
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                self.files = data.get("files", {})
+        except (OSError, ValueError):
+            self.files = {}
+        return self
+
+    def save(self, keep: List[str]):
+        """Writes the index, dropping the files that rotated out (signatures not in `keep`)."""
+        stale = [sig for sig in self.files if sig not in keep]
+        for sig in stale:
+            del self.files[sig]
+        if not self.dirty and not stale:
+            return
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "files": self.files}, f)
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+    def entry(self, signature: str, size: int) -> Dict[str, Any]:
+        """Index of a file; reset if the file is smaller than what was indexed (truncated/replaced)."""
+        entry = self.files.get(signature)
+        if entry is None or entry.get("size", 0) > size:
+            entry = self.files[signature] = {"size": 0, "lines": 0, "sessions": {}}
+            self.dirty = True
+        return entry
+
+    def add(self, entry: Dict[str, Any], session: str, offset: int, end: int, event_type: Optional[str]):
+        sess = entry["sessions"].get(session)
+        if sess is None:
+            sess = entry["sessions"][session] = {"ranges": [], "events": {}}
+        ranges = sess["ranges"]
+        if ranges and ranges[-1][1] == offset:
+            ranges[-1][1] = end
+        else:
+            ranges.append([offset, end])
+        if event_type:
+            sess["events"].setdefault(event_type, []).append(offset)
+        entry["size"] = end
+        entry["lines"] += 1
+        self.dirty = True
+
+    def sessions(self) -> List[str]:
+        seen = OrderedDict()
+        for entry in self.files.values():
+            for session in entry["sessions"]:
+                seen[session] = True
+        return list(seen)
+
+
+class SessionReport:
+    """Aggregates of one session, fed one record at a time (bounded memory)."""
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.first_ts = None
+        self.last_ts = None
+        self.lines = 0
+        self.levels: Dict[str, int] = {}
+        self.phases: List[str] = []
+        self.events: Dict[str, int] = {}
+        self.deaths = 0
+        self.merchant_count = 0
+        self.merchant_spent = 0
+        self.merchant_reverted = 0     # Spendings later recognized as a death / level up / misread
+        self.level_ups = 0
+        self.triggers: List[Dict[str, Any]] = []
+        self.latency = {
+            "trigger_ms": LatencyHistogram(),      # First banner capture -> timer restart
+            "trigger_pipeline_ms": LatencyHistogram(),  # Deciding frame: capture -> OCR -> actor -> trigger
+            "ocr_cycle_ms": LatencyHistogram(),    # Day loop work time (sampled every 10s)
+            "ocr_queue_ms": LatencyHistogram(),    # OCR result wait in the state mailbox (sampled)
+        }
+        self.resources: Dict[int, List[float]] = {}  # minute -> [samples, cpu_sum, ram_sum, mem_max]
+        self._resource_start = None
+
+    def add(self, entry: dict, event_type: Optional[str]):
+        ts = entry.get("timestamp")
+        if self.first_ts is None:
+            self.first_ts = ts
+        self.last_ts = ts
+        self.lines += 1
+        level = entry.get("level", "?")
+        self.levels[level] = self.levels.get(level, 0) + 1
+        phase = entry.get("context", {}).get("phase")
+        if phase and (not self.phases or self.phases[-1] != phase):
+            self.phases.append(phase)
+        if not event_type:
+            return
+        self.events[event_type] = self.events.get(event_type, 0) + 1
+
+        data = entry.get("data") or {}
+        payload = data.get("data", {}) if isinstance(data, dict) else {}
+        if event_type == "DEATH":
+            self.deaths += 1
+        elif event_type == "SPENDING":
+            self.merchant_count += 1
+            self.merchant_spent += payload.get("spent", 0)
+        elif event_type == "SPENDING_REVERTED":
+            self.merchant_reverted += payload.get("amount", 0)
+        elif event_type == "LEVEL_UP":
+            self.level_ups += 1
+        elif event_type == "SYSTEM_RESOURCE_STATS":
+            self._add_resources(data.get("timestamp"), payload)
+        elif event_type == "TRIGGER_LATENCY":
+            self._add_trigger_latency(entry, data)
+        elif event_type == "TRIGGER":
+            m = _ACTIVATING.search(entry.get("message", ""))
+            self.triggers.append({"time": ts, "kind": "trigger", "target": m.group(1) if m else "?", "phase": phase})
+        elif event_type == "TRIGGER_CANDIDATE":
+            m = _CANDIDATE.search(entry.get("message", ""))
+            if m:
+                self.triggers.append({"time": ts, "kind": "candidate", "target": m.group(2), "text": m.group(1),
+                                      "score": float(m.group(3)), "phase": phase})
+
+    def _add_trigger_latency(self, entry: dict, data: dict):
+        if "latency_ms" not in data:
+            # Logs written before the structured payload: parse the message
+            m = _TRIGGER_LATENCY.search(entry.get("message", ""))
+            if not m:
+                return
+            data = {"target": m.group(1), "latency_ms": float(m.group(2)), "readings": int(m.group(3)),
+                    "pipeline_ms": float(m.group(4))}
+        self.latency["trigger_ms"].record(data["latency_ms"] * 1000)
+        self.latency["trigger_pipeline_ms"].record(data.get("pipeline_ms", 0) * 1000)
+        self.triggers.append({"time": entry.get("timestamp"), "kind": "latency", "target": data.get("target"),
+                              "latency_ms": data["latency_ms"], "pipeline_ms": data.get("pipeline_ms"),
+                              "readings": data.get("readings")})
+
+    def _add_resources(self, t: Optional[float], payload: dict):
+        if "ocr_cycle_ms" in payload:
+            self.latency["ocr_cycle_ms"].record(payload["ocr_cycle_ms"] * 1000)
+        if "ocr_queue_ms" in payload:
+            self.latency["ocr_queue_ms"].record(payload["ocr_queue_ms"] * 1000)
+        if t is None:
+            return
+        if self._resource_start is None:
+            self._resource_start = t
+        minute = int((t - self._resource_start) // 60)
+        bucket = self.resources.get(minute)
+        if bucket is None:
+            bucket = self.resources[minute] = [0, 0.0, 0.0, 0.0]
+        bucket[0] += 1
+        bucket[1] += payload.get("cpu", 0.0)
+        bucket[2] += payload.get("ram", 0.0)
+        bucket[3] = max(bucket[3], payload.get("process_memory_mb", 0.0))
+
+    def resource_trend(self) -> List[Dict[str, float]]:
+        return [{"minute": m, "cpu": round(b[1] / b[0], 1), "ram": round(b[2] / b[0], 1), "memory_mb": round(b[3], 1)}
+                for m, b in sorted(self.resources.items())]
+
+    def to_dict(self) -> Dict[str, Any]:
+        latency = {}
+        for name, hist in self.latency.items():
+            st = hist.get_stats()
+            if st["count"]:
+                latency[name] = {"count": st["count"], "p50": st["p50_us"] / 1000, "p90": st["p90_us"] / 1000,
+                                 "p99": st["p99_us"] / 1000, "max": st["max_us"] / 1000}
+        trend = self.resource_trend()
+        return {
+            "session_id": self.session_id,
+            "first": self.first_ts,
+            "last": self.last_ts,
+            "lines": self.lines,
+            "levels": self.levels,
+            "phases": self.phases,
+            "deaths": self.deaths,
+            "merchant": {"count": self.merchant_count, "spent": self.merchant_spent,
+                         "reverted": self.merchant_reverted, "net": self.merchant_spent - self.merchant_reverted},
+            "level_ups": self.level_ups,
+            "events": self.events,
+            "triggers": self.triggers,
+            "latency_ms": latency,
+            "resources": {
+                "cpu_max": max((r["cpu"] for r in trend), default=0.0),
+                "memory_max_mb": max((r["memory_mb"] for r in trend), default=0.0),
+                "trend": trend,
+            },
+        }
+
+
+class LogAnalyzer:
+    def __init__(self, log_path: str, index_path: Optional[str] = None):
+        self.log_path = log_path
+        self.index = LogIndex(index_path or log_path + ".idx.json").load()
+        self.bytes_read = 0
+        self.bytes_seeked = 0
+
+    def _read_lines(self, f, start: int, end: Optional[int]) -> Iterator[Tuple[int, int, dict]]:
+        """(offset, end offset, record) of the complete lines in [start, end)."""
+        f.seek(start)
+        offset = start
+        while end is None or offset < end:
+            line = f.readline()
+            if not line or not line.endswith(b"\n"):
+                break  # EOF, or a line the logger is still writing
+            next_offset = offset + len(line)
+            self.bytes_read += len(line)
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                entry = None
+            if isinstance(entry, dict):
+                yield offset, next_offset, entry
+            offset = next_offset
+
+    def iter_records(self, session: Optional[str] = None,
+                     progress: Optional[Callable[[str], None]] = None) -> Iterator[Tuple[dict, Optional[str]]]:
+        """
+        (record, event type) of every file in order, for one session or all. The already
+        indexed part of a file is seeked (session) or streamed as-is; the rest is streamed
+        and indexed on the way.
+        """
+        signatures = []
+        for path in log_files(self.log_path):
+            signature = file_signature(path)
+            if signature is None:
+                continue
+            signatures.append(signature)
+            entry = self.index.entry(signature, os.path.getsize(path))
+            indexed = entry["size"]
+            if progress:
+                progress(path)
+            with open(path, "rb") as f:
+                if session is not None:
+                    sess = entry["sessions"].get(session, {"ranges": []})
+                    for start, end in sess["ranges"]:
+                        self.bytes_seeked += end - start
+                        for _, _, record in self._read_lines(f, start, end):
+                            yield record, classify(record)
+                else:
+                    for _, _, record in self._read_lines(f, 0, indexed):
+                        yield record, classify(record)
+                for offset, end, record in self._read_lines(f, indexed, None):
+                    event_type = classify(record)
+                    sid = session_of(record)
+                    self.index.add(entry, sid, offset, end, event_type)
+                    if session is None or sid == session:
+                        yield record, event_type
+        self.index.save(signatures)
+
+    def refresh_index(self):
+        """Indexes what was appended since the last run (new rotated files, live file tail)."""
+        signatures = []
+        for path in log_files(self.log_path):
+            signature = file_signature(path)
+            if signature is None:
+                continue
+            signatures.append(signature)
+            entry = self.index.entry(signature, os.path.getsize(path))
+            with open(path, "rb") as f:
+                for offset, end, record in self._read_lines(f, entry["size"], None):
+                    self.index.add(entry, session_of(record), offset, end, classify(record))
+        self.index.save(signatures)
+
+    def events(self, event_type: str, session: Optional[str] = None) -> Iterator[dict]:
+        """Records of one event type, read at their indexed offsets (call refresh_index() first)."""
+        for path in log_files(self.log_path):
+            signature = file_signature(path)
+            entry = self.index.files.get(signature) if signature else None
+            if not entry:
+                continue
+            offsets = sorted(offset for sid, sess in entry["sessions"].items()
+                             if session is None or sid == session
+                             for offset in sess["events"].get(event_type, []))
+            with open(path, "rb") as f:
+                for offset in offsets:
+                    f.seek(offset)
+                    try:
+                        yield json.loads(f.readline())
+                    except ValueError:
+                        continue
+
+    def analyze(self, session: Optional[str] = None,
+                progress: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        reports: Dict[str, SessionReport] = OrderedDict()
+        for record, event_type in self.iter_records(session, progress):
+            sid = session_of(record)
+            report = reports.get(sid)
+            if report is None:
+                report = reports[sid] = SessionReport(sid)
+            report.add(record, event_type)
+        return {
+            "files": log_files(self.log_path),
+            "bytes_read": self.bytes_read,
+            "bytes_seeked": self.bytes_seeked,
+            "sessions": [r.to_dict() for r in reports.values()],
+        }
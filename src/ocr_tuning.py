@@ -0,0 +1,472 @@
+"""
+OCR Tuning - Parallel, cached search of the ocr_params profiles
+
+One engine for the offline tuning scripts. A candidate is a full `ocr_params`
+profile of one region (scale, gamma, thresh, dilate, psm, mode, padding) and a
+trial is one candidate read on one labeled crop, with the exact preprocessing
+VisionEngine applies: for Level / Runes the numeric pipeline (resize, gray,
+gamma LUT, fixed threshold with the Otsu fallback, dilate, white padding) and
+the profile's psm / whitelist; for Day the primary FIXED pass
+(vision_engine.preprocess_pass, or its dark-frame Otsu pass) read like the Day
+engines, with psm 6 and their fixed allowlist.
+
+Trials run in a process pool: each worker opens its Tesseract handle once and
+keeps an LRU cache of decoded and preprocessed crops keyed by (image hash,
+preprocessing params), so the psm / mode variants of a profile and duplicate
+crops reuse one binarized image. Candidates are pruned by successive halving:
+all of them are scored on a small sample subset, the best 1/eta move on to eta
+times more samples, until one is left or the whole set has been read.
+
+Samples are a synthetic corpus (labels.jsonl, see src/utils/synthetic_hud.py)
+or a directory of PNG crops labeled by their name (samples/JOUR II/...,
+level_42_*.png). The winner is written in the `ocr_params` format VisionEngine
+loads, into config.json or a standalone profile file.
+"""
+
+import hashlib
+import itertools
+import json
+import math
+import os
+import random
+import re
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from src.utils.tesseract_api import TesseractAPI, library_paths
+from src.vision_engine import (DAY_DARK_GAMMA, DAY_DARK_MEAN, DAY_OCR_ALLOWLIST, DAY_OCR_PSM,
+                               DEFAULT_OCR_PARAMS, OCR_WHITELISTS, OCRPass, preprocess_pass)
+
+# Synthetic corpus kinds read for each region
+REGION_KINDS = {"Level": ("level",), "Runes": ("runes",), "Day": ("banner", "negative")}
+
+# Default search spaces (merged over the current profile, see OCRTuner.candidates)
+DEFAULT_GRIDS = {
+    "Level": {"scale": [2.0, 3.0, 4.0, 5.0], "gamma": [0.4, 0.6, 0.8, 1.0, 1.2],
+              "thresh": [120, 140, 160, 180, 200], "dilate": [0, 1, 2], "psm": [7, 8]},
+    "Runes": {"scale": [1.0, 1.5, 2.0], "gamma": [1.0, 1.5, 1.9, 2.4],
+              "thresh": [200, 230, 245, 255], "dilate": [0, 1], "psm": [7, 8]},
+    "Day": {"gamma": [0.3, 0.4, 0.5, 0.6, 0.8, 1.0], "thresh": [160, 180, 200, 220, 240]},
+}
+
+# Profile keys the Day engines ignore (psm / allowlist are fixed, no dilate)
+DAY_IGNORED_KEYS = ("psm", "mode", "dilate")
+
+PREPROCESS_KEYS = ("scale", "gamma", "thresh", "dilate", "padding")
+INT_KEYS = ("thresh", "dilate", "psm", "padding")
+FLOAT_KEYS = ("scale", "gamma")
+
+_DAY_PATTERN = re.compile(r"JOUR(I{1,3})(?!I)")
+
+
+def coerce_param(key: str, value: Any) -> Any:
+    """Same types as VisionEngine.set_ocr_param (ints, floats, mode name)."""
+    if key in INT_KEYS:
+        return int(float(value))
+    if key in FLOAT_KEYS:
+        return float(value)
+    return str(value)
+
+
+def file_hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def label_from_path(path: str, region: str) -> Optional[str]:
+    """
+    Expected reading from a sample path: "JOUR II" from a JOURII / "JOUR II"
+    file or folder name ("" = no banner), digits from a numeric folder name or
+    a `level_42_*.png` / `runes_1234.png` file name. None = unlabeled.
+    """
+    folder = os.path.basename(os.path.dirname(path))
+    name = os.path.splitext(os.path.basename(path))[0]
+    if region == "Day":
+        m = _DAY_PATTERN.search(f"{folder}/{name}".upper().replace(" ", ""))
+        return f"JOUR {m.group(1)}" if m else ""
+    if folder.isdigit():
+        return str(int(folder))
+    m = re.match(rf"^{region.lower()}[_-](\d{{1,7}})(?:[_-]|$)", name.lower())
+    return str(int(m.group(1))) if m else None
+
+
+def load_samples(path: str, region: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Labeled crops of one region: {"path", "key" (sha1 of the file), "expected"}.
+    `expected` is the text to read (digits, "JOUR II"), "" for a crop that must
+    read nothing, None for an unlabeled numeric crop (any number counts).
+    """
+    samples = []
+    if os.path.exists(os.path.join(path, "labels.jsonl")):
+        from src.utils.synthetic_hud import read_corpus
+        for entry in read_corpus(path):
+            if entry["kind"] not in REGION_KINDS[region]:
+                continue
+            expected = entry["text"] if entry["label"] is not None else ""
+            samples.append({"path": entry["path"], "expected": expected})
+    else:
+        for root, _, files in os.walk(path):
+            for name in sorted(files):
+                if name.lower().endswith(".png"):
+                    file_path = os.path.join(root, name)
+                    samples.append({"path": file_path, "expected": label_from_path(file_path, region)})
+    if limit:
+        samples = samples[:limit]
+    for sample in samples:
+        sample["key"] = file_hash(sample["path"])
+    return samples
+
+
+def preprocess(img: np.ndarray, params: Dict[str, Any], gamma_table: Optional[np.ndarray] = None) -> np.ndarray:
+    """The VisionEngine numeric pipeline (Level / Runes) for one profile."""
+    scale = params.get("scale", 1.0)
+    if scale != 1.0:
+        img = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+    if gamma_table is not None:
+        gray = cv2.LUT(gray, gamma_table)
+
+    _, thresh = cv2.threshold(gray, int(params.get("thresh", 160)), 255, cv2.THRESH_BINARY_INV)
+    # Same Otsu fallback as the engine when the fixed threshold leaves an empty image
+    if np.mean(thresh) > 252:
+        _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+
+    dilate = int(params.get("dilate", 0))
+    if dilate > 0:
+        thresh = cv2.dilate(thresh, np.ones((2, 2), np.uint8), iterations=dilate)
+
+    padding = int(params.get("padding", 0))
+    if padding > 0:
+        thresh = cv2.copyMakeBorder(thresh, padding, padding, padding, padding, cv2.BORDER_CONSTANT, value=255)
+    return np.ascontiguousarray(thresh)
+
+
+def preprocess_day(img: np.ndarray, params: Dict[str, Any], adjust_gamma=None) -> np.ndarray:
+    """The Day primary pass for one profile, as VisionEngine runs it on this frame."""
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    scale = float(params.get("scale", 1.0))
+    if np.mean(gray) < DAY_DARK_MEAN:
+        # Dark frames only get the Otsu pass: the profile's gamma / thresh are not used
+        pass_type, val, gamma = OCRPass.OTSU, 0, DAY_DARK_GAMMA
+    else:
+        pass_type, val, gamma = OCRPass.FIXED, int(params.get("thresh", 180)), float(params.get("gamma", 1.0))
+    processed = preprocess_pass(img, pass_type, custom_val=val, scale=scale, gamma=gamma,
+                                input_gray=gray if scale == 1.0 else None, adjust_gamma=adjust_gamma)
+    padding = int(params.get("padding", 0))
+    if padding > 0:
+        processed = cv2.copyMakeBorder(processed, padding, padding, padding, padding, cv2.BORDER_CONSTANT, value=255)
+    return np.ascontiguousarray(processed)
+
+
+def gamma_lut(gamma: float) -> Optional[np.ndarray]:
+    if gamma == 1.0:
+        return None
+    inv_gamma = 1.0 / gamma
+    return np.array([((i / 255.0) ** inv_gamma) * 255 for i in np.arange(0, 256)]).astype("uint8")
+
+
+def read_value(region: str, text: str) -> str:
+    """Text as the app would use it: first number (Level/Runes), "JOUR II" or "" (Day)."""
+    if region == "Day":
+        norm = text.upper().replace(" ", "").replace("1", "I").replace("|", "I")
+        m = _DAY_PATTERN.search(norm)
+        return f"JOUR {m.group(1)}" if m else ""
+    for ch in "|Il[]!":
+        text = text.replace(ch, "1")
+    m = re.search(r"\d+", text)
+    return str(int(m.group(0))) if m else ""
+
+
+def is_correct(expected: Optional[str], value: str) -> bool:
+    if expected is None:
+        return value != ""
+    return value == expected
+
+
+class _LRUCache:
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._items: "OrderedDict[Any, Any]" = OrderedDict()
+
+    def get(self, key):
+        item = self._items.get(key)
+        if item is not None:
+            self._items.move_to_end(key)
+        return item
+
+    def put(self, key, value):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.capacity:
+            self._items.popitem(last=False)
+
+
+# --- Worker side (one per pool process) ---
+
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(dll_path: str, tessdata_path: str, region: str, words_file: str, cache_size: int):
+    if region == "Day":
+        # Same engine as VisionEngine's Day pool: fixed psm / allowlist, restricted vocabulary
+        variables = {"load_system_dawg": "0", "load_freq_dawg": "0", "user_words_file": words_file}
+        tess = TesseractAPI(dll_path, tessdata_path, lang="eng", allowlist=DAY_OCR_ALLOWLIST,
+                            psm=DAY_OCR_PSM, variables=variables)
+    else:
+        tess = TesseractAPI(dll_path, tessdata_path, lang="eng")
+    _worker.clear()
+    _worker.update({
+        "tess": tess,
+        "region": region,
+        "cache": _LRUCache(cache_size),
+        "gamma": {},
+        "vars": {},
+        "hits": 0,
+        "misses": 0,
+    })
+
+
+def _set_variable(name: str, value: str):
+    # Only touch Tesseract when the value changes (candidates are sorted by psm / mode)
+    if _worker["vars"].get(name) != value:
+        tess = _worker["tess"]
+        tess.lib.TessBaseAPISetVariable(tess.handle, name.encode("utf-8"), value.encode("utf-8"))
+        _worker["vars"][name] = value
+
+
+def _cached(key, build):
+    cache = _worker["cache"]
+    item = cache.get(key)
+    if item is None:
+        _worker["misses"] += 1
+        item = build()
+        cache.put(key, item)
+    else:
+        _worker["hits"] += 1
+    return item
+
+
+def _gamma_table(gamma: float):
+    gamma = float(gamma)
+    if gamma not in _worker["gamma"]:
+        _worker["gamma"][gamma] = gamma_lut(gamma)
+    return _worker["gamma"][gamma]
+
+
+def _adjust_gamma(image: np.ndarray, gamma: float) -> np.ndarray:
+    table = _gamma_table(gamma)
+    return image if table is None else cv2.LUT(image, table)
+
+
+def _preprocessed(sample: Dict[str, Any], params: Dict[str, Any]):
+    img = _cached((sample["key"], None), lambda: cv2.imread(sample["path"]))
+    if img is None:
+        return None
+    pre_key = tuple(params.get(k) for k in PREPROCESS_KEYS)
+    if _worker["region"] == "Day":
+        return _cached((sample["key"], pre_key), lambda: preprocess_day(img, params, _adjust_gamma))
+    table = _gamma_table(params.get("gamma", 1.0))
+    return _cached((sample["key"], pre_key), lambda: preprocess(img, params, table))
+
+
+def _run_trials(samples: List[Tuple[int, Dict[str, Any]]], candidates: List[Tuple[int, Dict[str, Any]]]):
+    """Every candidate on every sample of the chunk. Returns ([(cid, idx, correct, conf, value)], hits, misses)."""
+    region = _worker["region"]
+    hits, misses = _worker["hits"], _worker["misses"]
+    results = []
+    for cid, params in candidates:
+        if region != "Day":
+            _set_variable("tessedit_pageseg_mode", str(params.get("psm", 7)))
+            _set_variable("tessedit_char_whitelist", OCR_WHITELISTS.get(params.get("mode", "Digits"), ""))
+        for idx, sample in samples:
+            image = _preprocessed(sample, params)
+            if image is None:
+                results.append((cid, idx, False, 0.0, ""))
+                continue
+            text, conf = _worker["tess"].get_text(image)
+            value = read_value(region, text)
+            results.append((cid, idx, is_correct(sample["expected"], value), float(conf), value))
+    return results, _worker["hits"] - hits, _worker["misses"] - misses
+
+
+# --- Driver ---
+
+class OCRTuner:
+    """
+    Successive-halving search of one region's profile over a sample set.
+    `workers=1` runs the trials in this process (no pool), e.g. under a debugger.
+    """
+
+    def __init__(self, config: Dict[str, Any], region: str, workers: Optional[int] = None,
+                 cache_size: int = 1024, eta: int = 3, min_samples: int = 16, seed: int = 0):
+        if region not in DEFAULT_OCR_PARAMS:
+            raise ValueError(f"Unknown region {region!r} (expected one of {', '.join(DEFAULT_OCR_PARAMS)})")
+        self.config = config
+        self.region = region
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.cache_size = cache_size
+        self.eta = max(2, eta)
+        self.min_samples = max(1, min_samples)
+        self.seed = seed
+        self.dll_path, self.tessdata_path = library_paths(config)
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.words_file = os.path.join(project_root, "data", "ocr_words.txt")
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._local_worker = False
+        self._results: Dict[Tuple[int, int], Tuple[bool, float, str]] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def current_profile(self) -> Dict[str, Any]:
+        profile = dict(DEFAULT_OCR_PARAMS[self.region])
+        profile.update((self.config.get("ocr_params") or {}).get(self.region, {}))
+        return profile
+
+    def candidates(self, grid: Optional[Dict[str, List[Any]]] = None) -> List[Dict[str, Any]]:
+        """Current profile first, then every grid combination over it (duplicates dropped)."""
+        grid = DEFAULT_GRIDS[self.region] if grid is None else grid
+        if self.region == "Day":
+            ignored = sorted(set(grid) & set(DAY_IGNORED_KEYS))
+            if ignored:
+                raise ValueError(f"Day engines ignore {', '.join(ignored)} (psm {DAY_OCR_PSM}, fixed allowlist, no dilate)")
+        base = self.current_profile()
+        keys = sorted(grid)
+        out, seen = [], set()
+        for values in itertools.chain([None], itertools.product(*(grid[k] for k in keys))):
+            params = dict(base)
+            if values is not None:
+                params.update((k, coerce_param(k, v)) for k, v in zip(keys, values))
+            ident = tuple(sorted(params.items()))
+            if ident not in seen:
+                seen.add(ident)
+                out.append(params)
+        return out
+
+    def _ensure_pool(self):
+        if self._pool is None and self.workers > 1:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker,
+                initargs=(self.dll_path, self.tessdata_path, self.region, self.words_file, self.cache_size))
+        elif self.workers == 1 and not self._local_worker:
+            _init_worker(self.dll_path, self.tessdata_path, self.region, self.words_file, self.cache_size)
+            self._local_worker = True
+
+    def run_trials(self, candidates: List[Tuple[int, Dict[str, Any]]], samples: List[Tuple[int, Dict[str, Any]]]):
+        """
+        Reads every (candidate, sample) pair not read yet. Samples are split in
+        chunks across the workers, each chunk carrying all the candidates so a
+        worker binarizes a crop once for all psm / mode variants.
+        """
+        missing = {(cid, idx) for cid, _ in candidates for idx, _ in samples} - self._results.keys()
+        todo = [(cid, params) for cid, params in candidates if any(m[0] == cid for m in missing)]
+        samples = [(idx, sample) for idx, sample in samples if any(m[1] == idx for m in missing)]
+        if not todo or not samples:
+            return
+        # Candidates sharing preprocessing next to each other: cache hits, fewer SetVariable calls
+        todo.sort(key=lambda c: (tuple(c[1].get(k) for k in PREPROCESS_KEYS), c[1].get("psm"), c[1].get("mode")))
+        self._ensure_pool()
+        if self._pool is None:
+            outputs = [_run_trials(samples, todo)]
+        else:
+            size = max(1, math.ceil(len(samples) / (self.workers * 2)))
+            chunks = [samples[i:i + size] for i in range(0, len(samples), size)]
+            outputs = self._pool.map(_run_trials, chunks, [todo] * len(chunks))
+        for results, hits, misses in outputs:
+            self.cache_hits += hits
+            self.cache_misses += misses
+            for cid, idx, correct, conf, value in results:
+                self._results[(cid, idx)] = (correct, conf, value)
+
+    def trial(self, cid: int, idx: int) -> Optional[Tuple[bool, float, str]]:
+        """(correct, confidence, value read) of a candidate on a sample, None if not read."""
+        return self._results.get((cid, idx))
+
+    def score(self, cid: int, sample_ids: List[int]) -> Dict[str, Any]:
+        """Accuracy, then mean confidence of the correct reads (tie-break)."""
+        trials = [self._results[(cid, idx)] for idx in sample_ids if (cid, idx) in self._results]
+        correct = [conf for ok, conf, _ in trials if ok]
+        return {
+            "trials": len(trials),
+            "accuracy": round(len(correct) / len(trials), 4) if trials else 0.0,
+            "mean_conf": round(sum(correct) / len(correct), 1) if correct else 0.0,
+        }
+
+    def search(self, samples: List[Dict[str, Any]], grid: Optional[Dict[str, List[Any]]] = None,
+               progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        if not samples:
+            raise ValueError("No samples to tune on")
+        start = time.perf_counter()
+        order = list(enumerate(samples))
+        random.Random(self.seed).shuffle(order)
+        candidates = list(enumerate(self.candidates(grid)))
+        baseline_id = candidates[0][0]
+
+        def rank(alive, ids):
+            scored = [(self.score(cid, ids), cid, params) for cid, params in alive]
+            scored.sort(key=lambda s: (s[0]["accuracy"], s[0]["mean_conf"]), reverse=True)
+            return scored
+
+        alive = candidates
+        n = min(len(order), self.min_samples)
+        rungs = []
+        while True:
+            subset = order[:n]
+            self.run_trials(alive, subset)
+            ranked = rank(alive, [idx for idx, _ in subset])
+            rung = {"samples": n, "candidates": len(alive), "best": ranked[0][0]}
+            rungs.append(rung)
+            if progress:
+                progress(rung)
+            if len(alive) == 1 or n >= len(order):
+                break
+            keep = max(1, math.ceil(len(alive) / self.eta))
+            alive = [(cid, params) for _, cid, params in ranked[:keep]]
+            n = min(len(order), n * self.eta)
+
+        # The current profile gets a full-set score even when it was pruned early
+        all_ids = [idx for idx, _ in order]
+        self.run_trials([candidates[baseline_id]], order)
+        best_score, best_id, best_params = rank(alive, all_ids)[0]
+        n_trials = len(self._results)
+
+        return {
+            "region": self.region,
+            "samples": len(samples),
+            "labeled": sum(1 for s in samples if s["expected"] is not None),
+            "candidates": len(candidates),
+            "rungs": rungs,
+            "trials": n_trials,
+            "trials_exhaustive": len(candidates) * len(samples),
+            "cache": {"hits": self.cache_hits, "misses": self.cache_misses},
+            "workers": self.workers,
+            "elapsed_s": round(time.perf_counter() - start, 2),
+            "best": {"params": best_params, **best_score},
+            "baseline": {"params": candidates[baseline_id][1], **self.score(baseline_id, all_ids)},
+            "finalists": [{"params": params, **score} for score, _, params in rank(alive, all_ids)[:5]],
+        }
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+def write_profile(path: str, region: str, params: Dict[str, Any]) -> str:
+    """
+    Stores a region profile under "ocr_params" of a JSON file: the app's
+    config.json (other keys and regions kept) or a new standalone profile file.
+    """
+    data = {}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    profiles = data.setdefault("ocr_params", {})
+    profiles[region] = {k: coerce_param(k, v) for k, v in params.items()}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4)
+    return path
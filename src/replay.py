@@ -0,0 +1,389 @@
+"""
+Replay Engine - Re-runs the state logic on a recorded sensor stream
+
+Feeds a sensor recording (src/core/sensor_recording.py: OCR, Level, Runes,
+menu, tuner and hotkey inputs) through the real StateService, TicketManager and
+DatabaseService, entering through the same callbacks as the live vision thread.
+Time is a VirtualClock: between two recorded inputs the scheduler jobs
+(phase expiry, 1 Hz graph tick, ticket deadlines...) run at their exact
+deadlines, without sleeping, so a 40 min run replays in seconds.
+
+Outputs (phase transitions, GAME_EVENTs, deaths, tickets, rune curve) can be
+diffed against the recording's own reference lines, an application.jsonl
+log, or a previous replay (before/after a logic change).
+"""
+
+import os
+import time
+from collections import Counter, defaultdict, deque
+from typing import Any, Callable, Dict, List, Optional
+
+from src.core.clock import VirtualClock
+from src.core.events import bus, PhaseChangeEvent
+from src.core.sensor_recording import INPUT_KINDS, read_recording
+from src.headless import prepare_workdir
+from src.service_container import ServiceContainer
+from src.services.base_service import IConfigService, IVisionService, IOverlayService, IStateService, IDatabaseService, ITrayService, IAudioService
+from src.services.database_service import DatabaseService
+from src.services.state_service import StateService
+from src.services.headless_services import HeadlessOverlayService, HeadlessTrayService, HeadlessAudioService
+from src.logger import logger
+
+# Host-dependent events, never compared
+IGNORED_EVENTS = ("SYSTEM_RESOURCE_STATS",)
+
+
+class ReplayVisionService(IVisionService):
+    """
+    Vision stand-in for replays: re-emits the recorded readings to the observers
+    the StateService registered, and answers the synchronous calls (bursts,
+    victory scan) with the values recorded at the same moment of the live run.
+    """
+
+    STALE_ANSWER = 5.0   # A recorded answer older than this was consumed by a path the replay did not take
+    EARLY_ANSWER = 1.0   # ...and one further ahead than this belongs to a later call
+
+    DEFAULT_ANSWERS = {
+        "request_level_burst": (),
+        "request_runes_burst": (),
+        "scan_victory_region": ("", 0),
+    }
+
+    def __init__(self, clock: Callable[[], float]):
+        self.clock = clock
+        self.observers: List[Callable] = []
+        self.level_observers: List[Callable] = []
+        self.runes_observers: List[Callable] = []
+        self.tuning_observers: List[Callable] = []
+        self.menu_callback: Optional[Callable] = None
+
+        self._answers: Dict[str, deque] = defaultdict(deque)
+        self.calls: Counter = Counter()
+        self.unanswered: Counter = Counter()
+        self.scan_policy = None
+        self.scan_delay = None
+        self.level_scan_interval = None
+        self.last_capture_ts: Optional[float] = None
+
+    def initialize(self) -> bool:
+        return True
+
+    def shutdown(self) -> None:
+        pass
+
+    # --- Recorded answers ---
+
+    def queue_answer(self, t: float, call: str, value: Any):
+        self._answers[call].append((t, value))
+
+    def _answer(self, call: str):
+        self.calls[call] += 1
+        now = self.clock()
+        queue = self._answers[call]
+        while queue and queue[0][0] < now - self.STALE_ANSWER:
+            queue.popleft()
+        if queue and queue[0][0] <= now + self.EARLY_ANSWER:
+            return queue.popleft()[1]
+        self.unanswered[call] += 1
+        return self.DEFAULT_ANSWERS[call]
+
+    def request_level_burst(self) -> List[int]:
+        return self._answer("request_level_burst")
+
+    def request_runes_burst(self) -> List[int]:
+        return self._answer("request_runes_burst")
+
+    def scan_victory_region(self):
+        text, score = self._answer("scan_victory_region")
+        return text, score
+
+    # --- Observers (same registration API as VisionService) ---
+
+    def add_observer(self, callback: Callable) -> None:
+        self.observers.append(callback)
+
+    def add_level_observer(self, callback: Callable) -> None:
+        self.level_observers.append(callback)
+
+    def add_runes_observer(self, callback: Callable) -> None:
+        self.runes_observers.append(callback)
+
+    def add_tuning_observer(self, callback: Callable) -> None:
+        self.tuning_observers.append(callback)
+
+    def set_menu_callback(self, callback: Callable) -> None:
+        self.menu_callback = callback
+
+    def emit(self, record: dict):
+        """Delivers one recorded input like the vision threads would."""
+        kind = record["kind"]
+        if kind == "ocr":
+            self.last_capture_ts = record.get("capture_ts", record["t"])
+            for cb in self.observers:
+                cb(record.get("text", ""), record.get("width", 0), record.get("offset", 0),
+                   record.get("word_data"), record.get("brightness", 0), record.get("score", 0))
+        elif kind == "level":
+            for cb in self.level_observers:
+                cb(record["value"], record.get("confidence", 0))
+        elif kind == "runes":
+            for cb in self.runes_observers:
+                cb(record["value"], record.get("confidence", 0))
+        elif kind == "menu":
+            if self.menu_callback:
+                self.menu_callback(record["is_open"])
+        elif kind == "tuning":
+            for cb in self.tuning_observers:
+                cb(record["active"])
+
+    def get_last_capture_ts(self) -> Optional[float]:
+        return self.last_capture_ts
+
+    # --- Capture control (recorded, no effect) ---
+
+    def start_capture(self) -> None:
+        self.calls["start_capture"] += 1
+
+    def stop_capture(self) -> None:
+        self.calls["stop_capture"] += 1
+
+    def pause_capture(self) -> None:
+        self.calls["pause_capture"] += 1
+
+    def resume_capture(self) -> None:
+        self.calls["resume_capture"] += 1
+
+    def set_region(self, region: tuple) -> None:
+        pass
+
+    def set_level_region(self, region: tuple) -> None:
+        pass
+
+    def set_runes_region(self, region: tuple) -> None:
+        pass
+
+    def set_scan_policy(self, mode: str, ocr_enabled: bool, min_delay: float) -> None:
+        self.scan_policy = (mode, ocr_enabled, min_delay)
+
+    def set_scan_delay(self, delay: float) -> None:
+        self.scan_delay = delay
+
+    def set_level_scan_interval(self, interval: float) -> None:
+        self.level_scan_interval = interval
+
+    def save_labeled_sample(self, label: str) -> None:
+        self.calls["save_labeled_sample"] += 1
+
+    def log_debug(self, message: str) -> None:
+        pass
+
+    def get_debug_state(self) -> dict:
+        return {"replay": True}
+
+
+def diff_timeline(reference: List[dict], replayed: List[dict], key: str, tolerance: float = 2.0) -> Dict[str, Any]:
+    """
+    Greedy in-order matching of two timelines on `key` (event_type, phase name):
+    an item matches the first unused item with the same key within `tolerance` seconds.
+    """
+    used = [False] * len(replayed)
+    matched, shifts, missing = 0, [], []
+    for ref in reference:
+        for i, item in enumerate(replayed):
+            if used[i] or item[key] != ref[key]:
+                continue
+            shift = item["t"] - ref["t"]
+            if abs(shift) <= tolerance:
+                used[i] = True
+                matched += 1
+                shifts.append(shift)
+                break
+        else:
+            missing.append(ref)
+    extra = [item for i, item in enumerate(replayed) if not used[i]]
+    return {
+        "matched": matched,
+        "missing": missing,   # In the reference only
+        "extra": extra,       # In the replay only
+        "max_shift_s": round(max((abs(s) for s in shifts), default=0.0), 3),
+    }
+
+
+class ReplayEngine:
+    # No live game process; nothing to resume; keep every ticket for the report;
+    # a replay must not record itself
+    CONFIG_OVERRIDES = {
+        "auto_hibernate": False,
+        "resume_on_restart": False,
+        "record_sensors": False,
+        "ticket_retention": 1e9,
+    }
+    TAIL = 5.0  # Seconds simulated after the last input (pending tickets, phase expiry)
+
+    def __init__(self, recording: str, workdir: str, config_path: Optional[str] = None,
+                 config_overrides: Optional[Dict[str, Any]] = None):
+        self.recording = os.path.abspath(recording)
+        self.workdir = os.path.abspath(workdir)
+        self.config_path = os.path.abspath(config_path or os.path.join("data", "config.json"))
+        self.config_overrides = dict(self.CONFIG_OVERRIDES, **(config_overrides or {}))
+
+        self.inputs: List[dict] = []
+        self.reference_events: List[dict] = []
+        self.reference_phases: List[dict] = []
+        self.header: Dict[str, Any] = {}
+        self._load()
+
+        self.clock = VirtualClock(self.inputs[0]["t"] if self.inputs else 0.0)
+        self.state: Optional[StateService] = None
+
+        # Outputs
+        self.events: List[dict] = []
+        self.phases: List[dict] = []
+        self.input_counts: Counter = Counter()
+        self.wall_time = 0.0
+
+    def _load(self):
+        for record in read_recording(self.recording):
+            kind = record.get("kind")
+            if kind == "header":
+                self.header = record
+            elif kind in INPUT_KINDS:
+                self.inputs.append(record)
+            elif kind == "event":
+                if record.get("event_type") not in IGNORED_EVENTS:
+                    self.reference_events.append(record)
+            elif kind == "phase":
+                self.reference_phases.append(record)
+        self.inputs.sort(key=lambda r: r["t"])
+
+    # --- Setup ---
+
+    def setup(self):
+        container = ServiceContainer()
+        self.config = prepare_workdir(self.workdir, self.config_path, self.config_overrides)
+        container.register(IConfigService, self.config)
+
+        self.vision = ReplayVisionService(self.clock)
+        for record in self.inputs:
+            if record["kind"] == "vision":
+                self.vision.queue_answer(record["t"], record["call"], record["value"])
+        container.register(IVisionService, self.vision)
+
+        self.overlay = HeadlessOverlayService(clock=self.clock)
+        self.tray = HeadlessTrayService()
+        self.audio = HeadlessAudioService(clock=self.clock)
+        container.register(IOverlayService, self.overlay)
+        container.register(ITrayService, self.tray)
+        container.register(IAudioService, self.audio)
+
+        self.db = DatabaseService()
+        self.db.initialize()
+        container.register(IDatabaseService, self.db)
+
+        self.state = StateService(self.config, self.vision, self.overlay, self.db, self.audio, self.tray, clock=self.clock)
+        container.register(IStateService, self.state)
+        self.state.add_session_event_observer(self._on_session_event)
+        self._phase_subscription = bus.subscribe(PhaseChangeEvent, self._on_phase_change)
+        self.state.initialize(start_capture=False, hotkeys=False, actor_thread=False)
+
+        logger.info(f"Replay: {len(self.inputs)} inputs from {self.recording}")
+
+    def _on_session_event(self, event: dict):
+        if event["event_type"] in IGNORED_EVENTS:
+            return
+        self.events.append({"t": event["timestamp"], "event_type": event["event_type"], "data": event.get("data", {})})
+
+    def _on_phase_change(self, event: PhaseChangeEvent):
+        self.phases.append({"t": self.clock(), "index": event.new_phase_index, "name": event.phase_name, "manual": event.manual})
+
+    # --- Run ---
+
+    def advance_to(self, when: float):
+        """Runs every scheduler job due up to `when`, each at its own deadline."""
+        scheduler = self.state.scheduler
+        while True:
+            deadline = scheduler.next_deadline()
+            if deadline is None or deadline > when:
+                break
+            self.clock.set(deadline)
+            scheduler.run_due()
+        self.clock.set(when)
+
+    def run(self) -> Dict[str, Any]:
+        if self.state is None:
+            self.setup()
+
+        t_start = time.perf_counter()
+        for record in self.inputs:
+            kind = record["kind"]
+            if kind == "vision":
+                continue  # Answers, queued in setup()
+            self.advance_to(record["t"])
+            if kind == "hotkey":
+                self.state.trigger_hotkey(record["key"])
+            else:
+                self.vision.emit(record)
+            self.input_counts[kind] += 1
+            self.state.scheduler.run_due()
+
+        if self.inputs:
+            self.advance_to(self.inputs[-1]["t"] + self.TAIL)
+        self.wall_time = time.perf_counter() - t_start
+        return self.result()
+
+    # --- Report ---
+
+    def result(self) -> Dict[str, Any]:
+        session = self.state.session
+        span = (self.inputs[-1]["t"] - self.inputs[0]["t"]) if self.inputs else 0.0
+        tickets = sorted(self.state.ticket_manager.tickets.values(), key=lambda t: t.timestamp)
+        return {
+            "recording": self.recording,
+            "inputs": dict(self.input_counts),
+            "recording_s": round(span, 3),
+            "wall_s": round(self.wall_time, 3),
+            "speedup": round(span / self.wall_time, 1) if self.wall_time > 0 else 0.0,
+            "phases": self.phases,
+            "events": self.events,
+            "deaths": list(self.state.death_history),
+            "tickets": [
+                {"t": t.timestamp, "id": t.id, "type": t.transaction_type, "amount": t.amount,
+                 "state": t.state, "resolution": t.resolution}
+                for t in tickets
+            ],
+            "curve": list(session.run_accumulated_history),
+            "final": {
+                "phase_index": session.phase_index,
+                "level": session.current_run_level,
+                "runes": session.current_runes,
+                "deaths": session.death_count,
+            },
+            "vision": {"calls": dict(self.vision.calls), "unanswered": dict(self.vision.unanswered)},
+        }
+
+    def diff(self, reference: Optional[Dict[str, Any]] = None, tolerance: float = 2.0) -> Dict[str, Any]:
+        """
+        Compares the replay with `reference` (a previous result(), or {"events": ...}
+        from an application.jsonl log) or, by default, with the outputs recorded
+        alongside the inputs. Only the sections present in the reference are compared.
+        """
+        if reference is None:
+            reference = {"events": self.reference_events, "phases": self.reference_phases}
+        report = {}
+        if "events" in reference:
+            ref_events = [e for e in reference["events"] if e.get("event_type") not in IGNORED_EVENTS]
+            report["events"] = diff_timeline(ref_events, self.events, "event_type", tolerance)
+        if "phases" in reference:
+            report["phases"] = diff_timeline(reference["phases"], self.phases, "name", tolerance)
+        if "curve" in reference:
+            curve, ref_curve = list(self.state.session.run_accumulated_history), reference["curve"]
+            report["curve"] = {
+                "length": (len(ref_curve), len(curve)),
+                "max_abs_delta": max((abs(a - b) for a, b in zip(curve, ref_curve)), default=0),
+            }
+        return report
+
+    def shutdown(self):
+        if self.state:
+            self.state.shutdown()
+            self.db.shutdown()
+            bus.unsubscribe(self._phase_subscription)
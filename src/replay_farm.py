@@ -0,0 +1,163 @@
+"""
+Replay Farm - Regression run of the state logic over a corpus of sensor recordings
+
+Fans the recordings out over a process pool; each worker replays its session
+with src/replay.py (real StateService + PatternManager + TicketManager on a
+virtual clock, in its own workdir) and returns a compact report. The farm then
+aggregates transition accuracy, death/merchant classification counts and wall
+times into one report.
+
+Worker processes are reused across sessions: each StateService unsubscribes
+from the process-wide EventBus on shutdown, and the JSONL debug log is lowered
+to warnings in workers (hundreds of sessions would otherwise fight over the
+same rotating application.jsonl).
+"""
+
+import glob
+import logging
+import os
+import shutil
+import time
+import traceback
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional
+
+# GAME_EVENTs compared between the live run and the replay
+CLASSIFIED_EVENTS = ("DEATH", "SPENDING", "LEVEL_UP", "RUNE_RECOVERY", "SPENDING_REVERTED")
+
+
+def find_recordings(paths: List[str]) -> List[str]:
+    """Sensor recordings under the given files/directories (sensors_*.jsonl, recursive)."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            found.extend(glob.glob(os.path.join(path, "**", "sensors_*.jsonl"), recursive=True))
+        elif os.path.exists(path):
+            found.append(path)
+    return sorted(set(os.path.abspath(p) for p in found))
+
+
+def _init_worker(log_level: int):
+    logging.getLogger("EldenRingTimer").setLevel(log_level)
+
+
+def replay_session(recording: str, workdir: str, config_path: Optional[str] = None,
+                   tolerance: float = 2.0, keep_workdir: bool = False) -> Dict[str, Any]:
+    """Replays one recording (runs in a worker process). Never raises: failures are reported."""
+    from src.replay import ReplayEngine
+
+    t0 = time.perf_counter()
+    report: Dict[str, Any] = {"recording": recording, "ok": False}
+    engine = None
+    try:
+        engine = ReplayEngine(recording, workdir, config_path=config_path)
+        result = engine.run()
+        diff = engine.diff(tolerance=tolerance)
+
+        ref_counts = Counter(e["event_type"] for e in engine.reference_events if e["event_type"] in CLASSIFIED_EVENTS)
+        replay_counts = Counter(e["event_type"] for e in result["events"] if e["event_type"] in CLASSIFIED_EVENTS)
+        report.update({
+            "ok": True,
+            "recording_s": result["recording_s"],
+            "replay_s": result["wall_s"],
+            "phases": {
+                "reference": len(engine.reference_phases),
+                "matched": diff["phases"]["matched"],
+                "missing": [p["name"] for p in diff["phases"]["missing"]],
+                "extra": [p["name"] for p in diff["phases"]["extra"]],
+                "max_shift_s": diff["phases"]["max_shift_s"],
+            },
+            "events": {
+                "reference": dict(ref_counts),
+                "replay": dict(replay_counts),
+                "matched": diff["events"]["matched"],
+                "missing": len(diff["events"]["missing"]),
+                "extra": len(diff["events"]["extra"]),
+            },
+            "tickets": dict(Counter(t["resolution"] or t["state"] for t in result["tickets"])),
+            "final": result["final"],
+        })
+    except Exception as e:
+        report["error"] = f"{type(e).__name__}: {e}"
+        report["traceback"] = traceback.format_exc()
+    finally:
+        if engine is not None:
+            try:
+                engine.shutdown()
+            except Exception:
+                pass
+        if not keep_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+    report["wall_s"] = round(time.perf_counter() - t0, 3)
+    return report
+
+
+def aggregate(reports: List[Dict[str, Any]], wall_s: float) -> Dict[str, Any]:
+    ok = [r for r in reports if r["ok"]]
+    ref_phases = sum(r["phases"]["reference"] for r in ok)
+    matched_phases = sum(r["phases"]["matched"] for r in ok)
+    ref_events, replay_events = Counter(), Counter()
+    tickets = Counter()
+    for r in ok:
+        ref_events.update(r["events"]["reference"])
+        replay_events.update(r["events"]["replay"])
+        tickets.update(r["tickets"])
+    walls = sorted(r["wall_s"] for r in reports)
+    return {
+        "sessions": len(reports),
+        "failed": [{"recording": r["recording"], "error": r["error"]} for r in reports if not r["ok"]],
+        "transition_accuracy": round(matched_phases / ref_phases, 4) if ref_phases else None,
+        "sessions_exact": sum(1 for r in ok if not r["phases"]["missing"] and not r["phases"]["extra"]),
+        "events": {
+            kind: {"reference": ref_events.get(kind, 0), "replay": replay_events.get(kind, 0)}
+            for kind in CLASSIFIED_EVENTS
+        },
+        "tickets": dict(tickets),
+        "recorded_s": round(sum(r["recording_s"] for r in ok), 1),
+        "wall_s": round(wall_s, 2),
+        "session_wall_s": {
+            "median": walls[len(walls) // 2] if walls else 0.0,
+            "max": walls[-1] if walls else 0.0,
+            "total": round(sum(walls), 2),
+        },
+    }
+
+
+class ReplayFarm:
+    def __init__(self, recordings: List[str], workdir: str, config_path: Optional[str] = None,
+                 workers: Optional[int] = None, tolerance: float = 2.0, keep_workdirs: bool = False,
+                 log_level: int = logging.WARNING):
+        self.recordings = recordings
+        self.workdir = os.path.abspath(workdir)
+        self.config_path = os.path.abspath(config_path or os.path.join("data", "config.json"))
+        self.workers = workers or os.cpu_count() or 1
+        self.tolerance = tolerance
+        self.keep_workdirs = keep_workdirs
+        self.log_level = log_level
+
+    def _session_workdir(self, index: int, recording: str) -> str:
+        name = os.path.splitext(os.path.basename(recording))[0]
+        return os.path.join(self.workdir, f"{index:04d}_{name}")
+
+    def run(self, progress: Optional[Callable[[int, int, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        t0 = time.perf_counter()
+        reports = []
+        # Longest recordings first: the pool does not end on one big straggler
+        jobs = sorted(enumerate(self.recordings), key=lambda job: os.path.getsize(job[1]), reverse=True)
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(self.log_level,)) as pool:
+            futures = [
+                pool.submit(replay_session, recording, self._session_workdir(i, recording),
+                            self.config_path, self.tolerance, self.keep_workdirs)
+                for i, recording in jobs
+            ]
+            for future in as_completed(futures):
+                report = future.result()
+                reports.append(report)
+                if progress:
+                    progress(len(reports), len(futures), report)
+
+        reports.sort(key=lambda r: r["recording"])
+        summary = aggregate(reports, time.perf_counter() - t0)
+        summary["workers"] = self.workers
+        return {"summary": summary, "sessions": reports}
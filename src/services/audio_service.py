@@ -26,7 +26,7 @@ class AudioService(IAudioService):
         logger.info("AudioService: Initializing...")
         self.running = True
         self.config.add_observer(self.on_config_changed)
-        self.worker_thread = threading.Thread(target=self._worker, daemon=True)
+        self.worker_thread = threading.Thread(target=self._worker, name="Audio", daemon=True)
         self.worker_thread.start()
         return True
 
@@ -63,6 +63,14 @@ class IVisionService(IService):
         """Triggers a high-speed burst of level scans and returns the results."""
         pass
 
+    def request_runes_burst_async(self, callback: Callable[[List[int]], None]) -> None:
+        """Runs request_runes_burst off the caller's thread and hands the results to callback."""
+        callback(self.request_runes_burst())
+
+    def request_level_burst_async(self, callback: Callable[[List[int]], None]) -> None:
+        """Runs request_level_burst off the caller's thread and hands the results to callback."""
+        callback(self.request_level_burst())
+
     @abstractmethod
     def add_observer(self, callback: Callable[[str, Dict], None]) -> None:
         """Register a callback for OCR results."""
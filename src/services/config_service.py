@@ -63,3 +63,7 @@ class ConfigService(IConfigService):
 
     def get(self, key: str, default: Any = None) -> Any:
         return self._config.get(key, default)
+
+    def get_all(self) -> dict:
+        """Copy of the whole config (snapshots: sensor recordings)."""
+        return dict(self._config)
@@ -0,0 +1,126 @@
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.services.base_service import IOverlayService, ITrayService, IAudioService
+
+
+class HeadlessOverlayService(IOverlayService):
+    """
+    Qt-free overlay for headless runs: records what would have been drawn.
+    Only the last timer text / run stats are kept, plus per-method call counts.
+    """
+
+    def __init__(self, clock: Optional[Callable[[], float]] = None):
+        self.clock = clock or time.time
+        self.calls: Counter = Counter()
+        self.visible = False
+        self.timer_text = ""
+        self.status_text = ""
+        self.ocr_score = 0.0
+        self.last_stats: Dict[str, Any] = {}
+        self.phases: List[Tuple[float, str]] = []  # (time, phase name) as seen by the overlay
+
+    def initialize(self) -> bool:
+        return True
+
+    def shutdown(self) -> None:
+        pass
+
+    def show(self) -> None:
+        self.calls["show"] += 1
+        self.visible = True
+
+    def hide(self) -> None:
+        self.calls["hide"] += 1
+        self.visible = False
+
+    def update_timer(self, text: str) -> None:
+        self.calls["update_timer"] += 1
+        self.timer_text = text
+
+    def update_status(self, text: str) -> None:
+        self.calls["update_status"] += 1
+        self.status_text = text
+
+    def update_phase(self, phase_name: str, timer_text: str) -> None:
+        self.calls["update_phase"] += 1
+        self.timer_text = timer_text
+
+    def set_click_through(self, enabled: bool) -> None:
+        self.calls["set_click_through"] += 1
+
+    def set_ocr_score(self, score: float) -> None:
+        self.calls["set_ocr_score"] += 1
+        self.ocr_score = score
+
+    def update_run_stats(self, stats: Dict[str, Any]) -> None:
+        self.calls["update_run_stats"] += 1
+        phase_name = stats.get("phase_name")
+        if phase_name and (not self.phases or self.phases[-1][1] != phase_name):
+            self.phases.append((self.clock(), phase_name))
+        self.last_stats = stats
+
+    def show_recording(self, show: bool) -> None:
+        self.calls["show_recording"] += 1
+
+    def get_dispatch_stats(self) -> dict:
+        return {"headless": True, "calls": dict(self.calls)}
+
+    def schedule(self, delay_ms: int, callback: Callable) -> None:
+        """No UI thread: runs the callback on a timer thread."""
+        self.calls["schedule"] += 1
+        timer = threading.Timer(max(0, delay_ms) / 1000.0, callback)
+        timer.daemon = True
+        timer.start()
+
+
+class HeadlessTrayService(ITrayService):
+    """Tray stub: records messages; quit requests only set `quit_requested`."""
+
+    def __init__(self):
+        self.messages: List[Tuple[str, str]] = []
+        self.tooltip = ""
+        self.hibernating = False
+        self.quit_requested = threading.Event()
+
+    def initialize(self) -> bool:
+        return True
+
+    def shutdown(self) -> None:
+        pass
+
+    def set_tooltip(self, text: str) -> None:
+        self.tooltip = text
+
+    def show_message(self, title: str, message: str) -> None:
+        self.messages.append((title, message))
+
+    def set_hibernation_mode(self, active: bool) -> None:
+        self.hibernating = active
+
+    def quit_app(self) -> None:
+        self.quit_requested.set()
+
+
+class HeadlessAudioService(IAudioService):
+    """Audio stub: records announcements (time, text) instead of speaking them."""
+
+    def __init__(self, clock: Optional[Callable[[], float]] = None):
+        self.clock = clock or time.time
+        self.enabled = True
+        self.announcements: List[Tuple[float, str]] = []
+
+    def initialize(self) -> bool:
+        return True
+
+    def shutdown(self) -> None:
+        pass
+
+    def announce(self, text: str) -> None:
+        if self.enabled:
+            self.announcements.append((self.clock(), text))
+
+    def set_enabled(self, enabled: bool) -> None:
+        self.enabled = enabled
@@ -6,6 +6,7 @@ from src.ui.qt_overlay import UnifiedOverlay
 from src.ui.level_indicator import LevelIndicatorOverlay
 from src.ui.missing_runes_overlay import MissingRunesOverlay
 from src.ui.transaction_history_widget import TransactionHistoryWidget
+from src.ui.update_dispatcher import CoalescingDispatcher
 from src.service_container import ServiceContainer
 
 class OverlayMeta(type(QObject), ABCMeta):
@@ -26,6 +27,10 @@ class OverlayService(QObject, IOverlayService, metaclass=OverlayMeta):
         # Connect signal to slot (will execute in Main Thread)
         self._schedule_signal.connect(self._execute_schedule, Qt.ConnectionType.QueuedConnection)
 
+        # High-rate updates (timer, stats, score...) go through a latest-wins dispatcher
+        # drained once per frame, instead of one queued closure per call.
+        self.dispatcher = CoalescingDispatcher(fps=60, name="Overlay")
+
     def initialize(self) -> bool:
         self.create_overlay()
         return True
@@ -109,14 +114,15 @@ class OverlayService(QObject, IOverlayService, metaclass=OverlayMeta):
                 self.unified_overlay.show()
     
     def update_timer(self, text: str) -> None:
-        self.schedule(0, lambda: self.unified_overlay.set_timer_text(text) if self.unified_overlay else None)
+        self.dispatcher.post("timer", lambda: self.unified_overlay.set_timer_text(text) if self.unified_overlay else None)
 
     def update_status(self, text: str) -> None:
-        self.schedule(0, lambda: self.unified_overlay.set_timer_text(text) if self.unified_overlay else None)
+        # Same widget text as the timer -> same key (newest wins)
+        self.dispatcher.post("timer", lambda: self.unified_overlay.set_timer_text(text) if self.unified_overlay else None)
     
     def update_run_stats(self, stats: dict) -> None:
         # Clone stats if needed? Dicts are passed by reference, but usually stats is a new dict from StateService
-        self.schedule(0, lambda: self.unified_overlay.set_stats(stats) if self.unified_overlay else None)
+        self.dispatcher.post("stats", lambda: self.unified_overlay.set_stats(stats) if self.unified_overlay else None)
         
         # Update transaction history widget
         if "transaction_history" in stats:
@@ -131,7 +137,7 @@ class OverlayService(QObject, IOverlayService, metaclass=OverlayMeta):
                 if self.transaction_widget:
                     self.transaction_widget.update_transactions(stats["transaction_history"])
             
-            self.schedule(0, _u_transaction)
+            self.dispatcher.post("transactions", _u_transaction)
         
         # Update Circle Indicator if applicable
         if "level" in stats and "potential_level" in stats:
@@ -140,7 +146,7 @@ class OverlayService(QObject, IOverlayService, metaclass=OverlayMeta):
                     config = ServiceContainer().resolve(IConfigService)
                     region = config.get("level_region", [0, 0, 100, 100])
                     self.level_indicator.set_data(stats["level"], stats["potential_level"], region)
-            self.schedule(0, _u_indicator)
+            self.dispatcher.post("indicator", _u_indicator)
         
         # Update Missing Runes Overlay
         if "missing_runes" in stats and "is_max_level" in stats:
@@ -152,10 +158,7 @@ class OverlayService(QObject, IOverlayService, metaclass=OverlayMeta):
                     
                     # Calculate level cost for blink effect
                     current_level = stats.get("level", 1)
-                    next_level = current_level + 1
-                    current_total = RuneData.get_total_runes_for_level(current_level) or 0
-                    next_total = RuneData.get_total_runes_for_level(next_level) or 0
-                    level_cost = next_total - current_total
+                    level_cost = RuneData.runes_between(current_level, current_level + 1)
                     
                     self.missing_runes_overlay.set_data(
                         stats["missing_runes"], 
@@ -163,7 +166,7 @@ class OverlayService(QObject, IOverlayService, metaclass=OverlayMeta):
                         region, 
                         level_cost
                     )
-            self.schedule(0, _u_missing)
+            self.dispatcher.post("missing", _u_missing)
 
     def show_recording(self, show: bool):
         self.is_recording = show
@@ -171,16 +174,20 @@ class OverlayService(QObject, IOverlayService, metaclass=OverlayMeta):
             if self.unified_overlay:
                 self.unified_overlay.is_recording = show
                 self.unified_overlay.update()
-        self.schedule(0, _u)
+        self.dispatcher.post("recording", _u)
 
     def set_click_through(self, enabled: bool) -> None:
         def _u():
             if self.unified_overlay:
                 self.unified_overlay.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, enabled)
-        self.schedule(0, _u)
+        self.dispatcher.post("click_through", _u)
 
     def set_ocr_score(self, score: float) -> None:
-        self.schedule(0, lambda: self.unified_overlay.set_score(score) if self.unified_overlay else None)
+        self.dispatcher.post("score", lambda: self.unified_overlay.set_score(score) if self.unified_overlay else None)
+
+    def get_dispatch_stats(self) -> dict:
+        """Queue depth / drop counters of the UI dispatcher (for the inspector)."""
+        return self.dispatcher.get_stats()
 
     def schedule(self, delay_ms: int, callback: Callable) -> None:
         """Schedule a callback on the UI thread."""
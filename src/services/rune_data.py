@@ -1,4 +1,5 @@
-from typing import Dict, Optional
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
 
 class RuneData:
     """
@@ -47,6 +48,13 @@ class RuneData:
         15: 75358,
     }
 
+    MAX_LEVEL = 15
+
+    # Built once at import (see bottom of module):
+    # _CUMULATIVE[l] = total runes spent to go from Level 1 to Level l (l = 0..MAX_LEVEL)
+    _CUMULATIVE: List[int] = []
+    _np_cumulative = None  # Lazy NumPy copy for the vectorized helpers
+
     @staticmethod
     def get_runes_for_next_level(current_level: int) -> Optional[int]:
         """
@@ -58,32 +66,85 @@ class RuneData:
     @staticmethod
     def get_total_runes_for_level(target_level: int) -> Optional[int]:
         """
-        Returns cumulative cost? (Not strictly requested but user data had column for it)
+        Cumulative cost from Level 1 to target_level (None above MAX_LEVEL).
         User data row: Level 3 | 7,922 | 11,620 (3698 + 7922 = 11620).
-        So logic holds.
         """
-        if target_level > 15: return None
-        # Minimal implementation for now
-        total = 0
-        for l in range(2, target_level + 1):
-            cost = RuneData._LEVEL_COSTS.get(l, 0)
-            total += cost
-        return total
+        if target_level > RuneData.MAX_LEVEL: return None
+        if target_level <= 1: return 0
+        return RuneData._CUMULATIVE[target_level]
+
+    @staticmethod
+    def runes_between(from_level: int, to_level: int) -> int:
+        """Total cost of the levels from_level+1 .. to_level (0 if not a level-up)."""
+        lo = min(max(from_level, 1), RuneData.MAX_LEVEL)
+        hi = min(max(to_level, 1), RuneData.MAX_LEVEL)
+        if hi <= lo: return 0
+        return RuneData._CUMULATIVE[hi] - RuneData._CUMULATIVE[lo]
 
     @staticmethod
     def calculate_potential_level(current_level: int, current_runes: int) -> int:
         """
         Calculates the potential level reachable with current runes.
+        O(log n): highest level whose cumulative cost fits in (spent + runes).
+        """
+        if current_level < 1 or current_level >= RuneData.MAX_LEVEL or current_runes <= 0:
+            return current_level
+        cum = RuneData._CUMULATIVE
+        reachable = bisect_right(cum, cum[current_level] + current_runes, lo=current_level) - 1
+        return max(current_level, reachable)
+
+    @staticmethod
+    def level_marks(max_total: int) -> List[Tuple[int, int]]:
+        """(level, cumulative cost) for every level reachable with max_total runes (graph annotations)."""
+        cum = RuneData._CUMULATIVE
+        end = bisect_right(cum, max_total, lo=2)
+        return [(l, cum[l]) for l in range(2, end)]
+
+    # --- Vectorized variants (graph annotation, ideal-curve comparison, offline analysis) ---
+
+    @staticmethod
+    def _cumulative_array():
+        if RuneData._np_cumulative is None:
+            import numpy as np
+            RuneData._np_cumulative = np.asarray(RuneData._CUMULATIVE, dtype=np.int64)
+        return RuneData._np_cumulative
+
+    @staticmethod
+    def total_runes_for_levels(levels):
         """
-        potential_level = current_level
-        runes_left = current_runes
-        
-        while potential_level < 15:
-            cost = RuneData.get_runes_for_next_level(potential_level)
-            if cost is not None and runes_left >= cost:
-                runes_left -= cost
-                potential_level += 1
-            else:
-                break
-                
-        return potential_level
+        Array version of get_total_runes_for_level.
+        Levels are clamped to [1, MAX_LEVEL] (no None in arrays).
+        """
+        import numpy as np
+        cum = RuneData._cumulative_array()
+        idx = np.clip(np.asarray(levels, dtype=np.int64), 1, RuneData.MAX_LEVEL)
+        return cum[idx]
+
+    @staticmethod
+    def potential_levels(levels, runes):
+        """
+        Array version of calculate_potential_level (inputs broadcast together).
+        Levels outside [1, MAX_LEVEL) and non-positive runes are returned unchanged.
+        """
+        import numpy as np
+        cum = RuneData._cumulative_array()
+        levels, runes = np.broadcast_arrays(np.asarray(levels, dtype=np.int64), np.asarray(runes, dtype=np.int64))
+        valid = (levels >= 1) & (levels < RuneData.MAX_LEVEL) & (runes > 0)
+        idx = np.clip(levels, 1, RuneData.MAX_LEVEL)
+        reachable = np.searchsorted(cum, cum[idx] + runes, side="right") - 1
+        return np.where(valid, np.maximum(levels, reachable), levels)
+
+    @staticmethod
+    def levels_for_total_runes(totals):
+        """Level reached from Level 1 after spending `totals` runes on levels (array)."""
+        return RuneData.potential_levels(1, totals)
+
+
+def _build_cumulative() -> List[int]:
+    cum = [0, 0]  # Level 0 (unknown) and Level 1 (start)
+    for l in range(2, RuneData.MAX_LEVEL + 1):
+        cum.append(cum[-1] + RuneData._LEVEL_COSTS.get(l, 0))
+    return cum
+
+
+RuneData._CUMULATIVE = _build_cumulative()
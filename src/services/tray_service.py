@@ -39,6 +39,11 @@ class TrayService(QObject, ITrayService, metaclass=TrayMeta):
         action_debug = self.menu.addAction("Debug Inspector")
         action_debug.triggered.connect(self.launcher.show_inspector_ui)
         
+        # Sampling Profiler (label refreshed on open: the hotkey can toggle it too)
+        self.action_profiler = self.menu.addAction("Start Profiler")
+        self.action_profiler.triggered.connect(self.toggle_profiler)
+        self.menu.aboutToShow.connect(self._refresh_profiler_action)
+        
         self.menu.addSeparator()
         
         # Quit Action
@@ -74,6 +79,17 @@ class TrayService(QObject, ITrayService, metaclass=TrayMeta):
                 # Show menu at cursor position
                 self.menu.exec(QCursor.pos())
 
+    def toggle_profiler(self):
+        state = getattr(self.launcher, 'state_service', None)
+        if state:
+            state.toggle_profiler()
+        self._refresh_profiler_action()
+
+    def _refresh_profiler_action(self):
+        state = getattr(self.launcher, 'state_service', None)
+        active = bool(state and state.profiler_active())
+        self.action_profiler.setText("Stop Profiler" if active else "Start Profiler")
+
     def shutdown(self) -> None:
         if self.tray_icon:
             self.tray_icon.hide()
@@ -1,16 +1,19 @@
+import threading
 from typing import Any, Dict, Callable, List, Optional
+from src.logger import logger
 from src.services.base_service import IVisionService, IConfigService
 from src.vision_engine import VisionEngine
 
 class VisionService(IVisionService):
-    def __init__(self, config_service: IConfigService):
+    def __init__(self, config_service: IConfigService, clock: Optional[Callable[[], float]] = None):
         self.config_service = config_service
+        self.clock = clock # Capture timestamps (None = time.time)
         self.engine: Optional[VisionEngine] = None
         self.observers: List[Callable[[str, int, float, List[Dict], float], None]] = []
 
     def initialize(self) -> bool:
         # We assume ConfigService is already initialized
-        self.engine = VisionEngine(self.config_service)
+        self.engine = VisionEngine(self.config_service, clock=self.clock)
         # self.engine = None # DEBUG: Disabled to test crash
         
         # Subscribe to config changes
@@ -35,6 +38,40 @@ class VisionService(IVisionService):
         if self.engine:
             self.engine.stop()
 
+    def set_frame_source(self, source) -> None:
+        """Recorded frames instead of the screen (headless runs)."""
+        if self.engine:
+            self.engine.set_frame_source(source)
+
+    def run_main_cycle(self) -> float:
+        """
+        Headless: one synchronous Day loop cycle on the current frame (no capture threads).
+        Returns the delay the threaded loop would have slept.
+        """
+        if not self.engine:
+            return 0.0
+        self.engine.set_level_callback(self._level_multicast_callback)
+        self.engine.set_runes_callback(self._runes_multicast_callback)
+        return self.engine.run_main_cycle(self._multicast_callback)
+
+    def run_secondary_cycle(self) -> float:
+        """Headless: one synchronous Level/Runes/Menu pass on the last frame."""
+        if not self.engine:
+            return 0.0
+        return self.engine.run_secondary_cycle()
+
+    def get_last_capture_ts(self) -> Optional[float]:
+        """Clock time of the Day capture whose OCR result is being delivered (vision thread)."""
+        return self.engine.last_capture_ts if self.engine else None
+
+    def get_capture_stats(self) -> Dict[str, Any]:
+        """Day captures and OCR calls consumed so far (latency harness)."""
+        return self.engine.get_capture_stats() if self.engine else {}
+
+    def get_debug_state(self) -> Dict[str, Any]:
+        """Engine state for the inspector, metrics and resource stats (cycle time, power mode...)."""
+        return self.engine.get_debug_state() if self.engine else {}
+
     def pause_capture(self) -> None:
         if self.engine:
             self.engine.pause()
@@ -113,6 +150,23 @@ class VisionService(IVisionService):
             return self.engine.request_level_burst()
         return []
 
+    def request_runes_burst_async(self, callback: Callable[[List[int]], None]) -> None:
+        self._run_burst(self.request_runes_burst, callback)
+
+    def request_level_burst_async(self, callback: Callable[[List[int]], None]) -> None:
+        self._run_burst(self.request_level_burst, callback)
+
+    def _run_burst(self, burst: Callable[[], List[int]], callback: Callable[[List[int]], None]) -> None:
+        """A burst grabs and OCRs 5 frames back to back: run it on its own thread, never on the caller's."""
+        def _worker():
+            try:
+                results = burst()
+            except Exception as e:
+                logger.error(f"VisionService: burst failed: {e}")
+                results = []
+            callback(results)
+        threading.Thread(target=_worker, name="VisionBurst", daemon=True).start()
+
     def set_scan_delay(self, delay: float) -> None:
         if self.engine:
             self.engine.set_scan_delay(delay)
@@ -121,6 +175,14 @@ class VisionService(IVisionService):
         if self.engine:
             self.engine.set_day_ocr_enabled(enabled)
 
+    def set_scan_policy(self, mode: str, ocr_enabled: bool, min_delay: float) -> None:
+        if self.engine:
+            self.engine.set_scan_policy(mode, ocr_enabled, min_delay)
+
+    def set_level_scan_interval(self, interval: float) -> None:
+        if self.engine:
+            self.engine.set_level_scan_interval(interval)
+
     def save_labeled_sample(self, label: str) -> None:
         if self.engine:
             self.engine.save_labeled_sample(label)
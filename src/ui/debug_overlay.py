@@ -1,6 +1,7 @@
 from PyQt6.QtWidgets import QMainWindow, QLabel, QApplication
 from PyQt6.QtCore import Qt, pyqtSignal, QPoint, QTimer, QObject
 from PyQt6.QtGui import QPainter, QColor, QFont, QPen, QBrush
+from src.ui.update_dispatcher import CoalescingDispatcher
 
 class OCRDebugWidget(QMainWindow):
     position_changed = pyqtSignal(str, int, int) # name, x, y
@@ -149,16 +150,14 @@ class OCRDebugWidget(QMainWindow):
 
 
 class DebugOverlayManager(QObject):
-    update_signal = pyqtSignal(str, str, float)
-
     def __init__(self, config: dict):
         super().__init__()
         self.config = config
         self.widgets = {}
         self.positions = config.get("debug_overlay_positions", {})
         
-        # Connect Signal (Runs on Main Thread)
-        self.update_signal.connect(self._perform_update)
+        # OCR threads post at 30 FPS -> keep only the newest reading per zone (drained on Main Thread)
+        self.dispatcher = CoalescingDispatcher(fps=60, name="DebugOverlay")
         
         # Zones to create by default
         self.create_widget("Runes")
@@ -182,14 +181,17 @@ class DebugOverlayManager(QObject):
         self.positions[name] = {"x": x, "y": y}
         self.config["debug_overlay_positions"] = self.positions
 
-    def update(self, name: str, text: str, conf: float):
-        # This is called from Background Thread -> Emit Signal
-        self.update_signal.emit(name, text, conf)
+    def update(self, name: str, text: str, conf: float, burst_state: str = 'idle'):
+        # This is called from Background Thread -> coalesced per zone
+        self.dispatcher.post(name, lambda: self._perform_update(name, text, conf, burst_state))
 
-    def _perform_update(self, name: str, text: str, conf: float):
+    def _perform_update(self, name: str, text: str, conf: float, burst_state: str = 'idle'):
         # This runs on Main Thread
         if name in self.widgets:
-            self.widgets[name].update_state(text, conf, burst_state='idle')
+            self.widgets[name].update_state(text, conf, burst_state=burst_state)
+
+    def get_dispatch_stats(self) -> dict:
+        return self.dispatcher.get_stats()
 
     def set_visible(self, visible: bool):
         for w in self.widgets.values():
@@ -118,12 +118,18 @@ class OCRTunerWindow(QMainWindow):
             return
             
         import time
-        self.state_service.session.graph_events.append({
+        event = {
             "t": time.time(),
             "type": evt_type,
             "details": details
-        })
-        print(f"Simulated {evt_type} event added.")
+        }
+        # Session state belongs to the state actor: mutate it there, not on the Qt thread
+        self.state_service.mailbox.post("call", self._apply_simulated_event, event)
+        print(f"Simulated {evt_type} event posted.")
+
+    def _apply_simulated_event(self, event):
+        """Runs on the state actor thread."""
+        self.state_service.session.graph_events.append(event)
         # Trigger UI Update
         if hasattr(self.state_service, "update_runes_display"):
             self.state_service.update_runes_display(self.state_service.session.current_run_level)
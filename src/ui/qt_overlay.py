@@ -2,6 +2,7 @@ from PyQt6.QtWidgets import QMainWindow, QApplication, QWidget
 from PyQt6.QtCore import Qt, QTimer, QPoint, pyqtSignal
 from PyQt6.QtGui import QPainter, QColor, QFont, QPen, QFontMetrics, QPainterPath
 from src.services.rune_data import RuneData
+from src.core.history_cleaning import clean_history
 
 class DraggableWindow(QMainWindow):
     position_changed = pyqtSignal(int, int)
@@ -126,35 +127,8 @@ class UnifiedOverlay(DraggableWindow):
         painter.drawText(x, y, text) or 0
 
     def get_clean_history(self, history):
-        """
-        Simple outlier removal for the Green Curve.
-        Removes single-point spikes that do not sustain.
-        """
-        if len(history) < 3: return history
-        
-        cleaned = list(history)
-        # We only check internal points
-        for i in range(1, len(history) - 1):
-            prev = cleaned[i-1]
-            curr = cleaned[i]
-            nex = history[i+1] # Look ahead in original or cleaned? Original is safer for "next".
-            
-            # 1. Check for Spike (Up or Down)
-            # If current deviates signficantly from prev AND next is closer to prev
-            diff_prev = abs(curr - prev)
-            diff_next = abs(curr - nex)
-            
-            # Threshold: 10% change or > 5000 runes absolute?
-            # Let's say if jump is > 2000 and return is > 2000
-            if diff_prev > 2000 and diff_next > 2000:
-                # Check if we return somewhat to baseline
-                # If prev and next are close (within 20% of each other spread)
-                spread = abs(prev - nex)
-                if spread < diff_prev * 0.5: 
-                    # It was a spike, smooth it
-                    cleaned[i] = (prev + nex) / 2
-        
-        return cleaned
+        """Simple outlier removal for the Green Curve (see src/core/history_cleaning.py)."""
+        return clean_history(history)
 
     def paintEvent(self, event):
         painter = QPainter(self)
@@ -334,49 +308,20 @@ class UnifiedOverlay(DraggableWindow):
         step_x = graph_w / x_range_max
         
         # --- IDEAL CURVE (Piecewise) ---
-        nr_config = self.stats.get("nr_config")
-        if nr_config:
+        # Precomputed by StateService (IdealCurve, 1 s resolution): same buffer as the grade
+        ideal_curve = self.stats.get("ideal_curve")
+        if ideal_curve is not None:
             path_ideal = QPainterPath()
+            ideal_values = ideal_curve.ideal_for(int(x_range_max) + 1)
             
-            # Constants matching StateService
-            # Constants matching StateService (Phase 4: 14m cycles)
-            day1_dur = 840  # 14 mins
-            day2_dur = 840  # 14 mins
-            farming_goal = self.stats.get("nr_config", {}).get("goal", 337578)
-            nr_total_time = self.stats.get("nr_config", {}).get("duration", 1680)
-            
-            boss1_drop = 50000
+            # One vertex per pixel is enough (the buffer has one point per second)
+            stride = max(1, int(1.0 / step_x)) if step_x > 0 else 1
+            samples = list(range(0, len(ideal_values), stride))
+            if samples[-1] != len(ideal_values) - 1:
+                samples.append(len(ideal_values) - 1)
             
-            # Calculate Day 1 End Value (Continuous Farming)
-            # Formula: Goal * (ratio ** 1.35)
-            # Ratio at 1200s = 1200/2400 = 0.5
-            val_d1_farming = farming_goal * (0.5 ** 1.35)
-            
-            start_d2 = val_d1_farming + boss1_drop
-            target_end = 437578 # Lvl 14 Total
-            
-            rem_farming = target_end - start_d2 # Growth needed in Day 2 (excluding Boss 2 drop which is at end)
-            # Actually, target_end is reached BEFORE Boss 2 drop? 
-            # "Level 14 au debut du boss". Yes.
-            
-            for t in range(x_range_max + 1):
-                val = 0
-                
-                if t < day1_dur:
-                    # Phase 1: Day 1 (0 -> 14m)
-                    # Power 1.35
-                    ratio = t / nr_total_time
-                    val = farming_goal * (ratio ** 1.35)
-                    
-                else:
-                    # Phase 2: Day 2 (20m -> 40m)
-                    # Power 1.15
-                    t_d2 = t - day1_dur
-                    ratio_d2 = t_d2 / float(day2_dur)
-                    if ratio_d2 > 1.0: ratio_d2 = 1.0
-                    
-                    val = start_d2 + rem_farming * (ratio_d2 ** 1.15)
-                
+            for t in samples:
+                val = ideal_values[t]
                 px = graph_x + t * step_x
                 py = graph_y + graph_h - (val / y_range_max * graph_h)
                 
@@ -464,16 +409,8 @@ class UnifiedOverlay(DraggableWindow):
         # Key Levels: Dynamic based on Y-Range
         # User request: "ne pas en afficher plus de 5"
         visible_levels = []
-        # Optimization: Only check relevant range. 
-        # Start from current level? Or Level 1?
-        # Let's check levels 1 to 25 first (most common) then sparse.
-        
-        candidates = []
-        for l in range(1, 150):
-            req = self.get_total_runes_for_level(l)
-            if req is None or req > y_range_max: break # Optimization + None safety
-            if req > 0:
-                candidates.append((l, req))
+        # Levels whose cumulative cost fits in the Y range (bisect on the precomputed table)
+        candidates = RuneData.level_marks(y_range_max)
                 
         # Filter to max 5 items, prioritizing higher levels (targets) or spread?
         # Let's try to keep them spread out.
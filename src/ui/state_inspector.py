@@ -2,13 +2,60 @@ import sys
 import datetime
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                              QLabel, QGroupBox, QListWidget, QProgressBar, 
-                             QFormLayout, QGridLayout)
-from PyQt6.QtCore import QTimer, Qt
+                             QFormLayout, QGridLayout, QTableWidget, QTableWidgetItem,
+                             QCheckBox, QPushButton, QHeaderView, QLineEdit)
+from PyQt6.QtCore import QTimer, Qt, QPointF
+from PyQt6.QtGui import QPainter, QColor, QPen
+from src.core.tracing import tracer
+from src.core.reading_timeline import readings, parse_query, VERDICTS
+
+# Reading verdict colors (same order as VERDICTS)
+VERDICT_COLORS = [QColor(150, 150, 150), QColor(60, 180, 75), QColor(220, 50, 50), QColor(240, 160, 30)]
+
+
+class Sparkline(QWidget):
+    """Confidence of one region's readings over the last minute, one dot per reading colored by verdict."""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.points = []
+        self.window_s = 60.0
+        self.now = 0.0
+        self.setMinimumHeight(36)
+    
+    def set_points(self, points, now, window_s):
+        self.points = points
+        self.now = now
+        self.window_s = window_s
+        self.update()
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.fillRect(self.rect(), QColor(30, 30, 30))
+        w, h = self.width(), self.height()
+        
+        # 70% confidence guide
+        painter.setPen(QPen(QColor(90, 90, 90), 1, Qt.PenStyle.DashLine))
+        y70 = h - 2 - 0.7 * (h - 4)
+        painter.drawLine(0, int(y70), w, int(y70))
+        if not self.points:
+            return
+        
+        coords = [QPointF(w * (1 - (self.now - t) / self.window_s), h - 2 - min(max(v, 0.0), 100.0) / 100.0 * (h - 4))
+                  for t, v, _ in self.points]
+        painter.setPen(QPen(QColor(100, 160, 255), 1))
+        painter.drawPolyline(coords)
+        for pt, (_, _, verdict) in zip(coords, self.points):
+            painter.setPen(QPen(VERDICT_COLORS[verdict], 3))
+            painter.drawPoint(pt)
+
 
 class StateInspectorWindow(QMainWindow):
-    def __init__(self, state_service):
+    def __init__(self, state_service, debug_overlay=None):
         super().__init__()
         self.state_service = state_service
+        self.debug_overlay = debug_overlay  # DebugOverlayManager (its own UI dispatcher)
         self.setWindowTitle("ER Timer - State Inspector")
         self.setMinimumSize(500, 600)
         
@@ -75,15 +122,154 @@ class StateInspectorWindow(QMainWindow):
         self.lbl_buffers = QLabel("Trigger: 0 | Consensus: 0")
         ocr_layout.addWidget(self.lbl_buffers, 3, 1)
         
+        ocr_layout.addWidget(QLabel("UI Dispatch:"), 4, 0)
+        self.lbl_ui_dispatch = QLabel("Depth: 0 | Dropped: 0")
+        ocr_layout.addWidget(self.lbl_ui_dispatch, 4, 1)
+        
+        ocr_layout.addWidget(QLabel("Scan Window:"), 5, 0)
+        self.lbl_scan_window = QLabel("-")
+        ocr_layout.addWidget(self.lbl_scan_window, 5, 1)
+        
+        ocr_layout.addWidget(QLabel("Level Gate:"), 6, 0)
+        self.lbl_level_gate = QLabel("-")
+        self.lbl_level_gate.setWordWrap(True)
+        ocr_layout.addWidget(self.lbl_level_gate, 6, 1)
+        
+        ocr_layout.addWidget(QLabel("State Mailbox:"), 7, 0)
+        self.lbl_mailbox = QLabel("Depth: 0")
+        ocr_layout.addWidget(self.lbl_mailbox, 7, 1)
+        
         self.main_layout.addWidget(self.grp_ocr)
         
-        # 3. Doubts / Warnings Log
+        # 3. Pipeline Spans (where the 33ms frame budget goes)
+        self.grp_spans = QGroupBox("Pipeline Spans")
+        spans_layout = QVBoxLayout(self.grp_spans)
+        controls = QHBoxLayout()
+        self.chk_tracing = QCheckBox("Enabled")
+        self.chk_tracing.setChecked(tracer.enabled)
+        self.chk_tracing.toggled.connect(self.on_tracing_toggled)
+        btn_reset = QPushButton("Reset")
+        btn_reset.clicked.connect(lambda: tracer.reset())
+        btn_dump = QPushButton("Dump JSON")
+        btn_dump.clicked.connect(self.on_dump_spans)
+        self.lbl_spans = QLabel("-")
+        controls.addWidget(self.chk_tracing)
+        controls.addWidget(btn_reset)
+        controls.addWidget(btn_dump)
+        controls.addWidget(self.lbl_spans, 1)
+        spans_layout.addLayout(controls)
+        
+        self.tbl_spans = QTableWidget(0, 7)
+        self.tbl_spans.setHorizontalHeaderLabels(["Span", "Count", "p50 ms", "p90 ms", "p99 ms", "Max ms", "Mean ms"])
+        self.tbl_spans.verticalHeader().setVisible(False)
+        self.tbl_spans.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.tbl_spans.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        spans_layout.addWidget(self.tbl_spans)
+        self.main_layout.addWidget(self.grp_spans)
+        
+        # 4. OCR Readings (full-rate timeline per region)
+        self.grp_readings = QGroupBox("OCR Readings (last 60s, confidence)")
+        readings_layout = QVBoxLayout(self.grp_readings)
+        spark_grid = QGridLayout()
+        self.sparklines = {}
+        self.lbl_reading_stats = {}
+        for row, region in enumerate(("Day", "Level", "Runes")):
+            spark_grid.addWidget(QLabel(f"{region}:"), row, 0)
+            self.sparklines[region] = Sparkline()
+            spark_grid.addWidget(self.sparklines[region], row, 1)
+            self.lbl_reading_stats[region] = QLabel("-")
+            spark_grid.addWidget(self.lbl_reading_stats[region], row, 2)
+        spark_grid.setColumnStretch(1, 1)
+        readings_layout.addLayout(spark_grid)
+        
+        query_row = QHBoxLayout()
+        self.txt_reading_query = QLineEdit("runes 30s conf<70")
+        self.txt_reading_query.setPlaceholderText("region 30s conf<70 rejected text")
+        btn_dump_readings = QPushButton("Dump JSON")
+        btn_dump_readings.clicked.connect(self.on_dump_readings)
+        self.lbl_reading_query = QLabel("-")
+        query_row.addWidget(self.txt_reading_query, 1)
+        query_row.addWidget(btn_dump_readings)
+        query_row.addWidget(self.lbl_reading_query)
+        readings_layout.addLayout(query_row)
+        
+        self.tbl_readings = QTableWidget(0, 7)
+        self.tbl_readings.setHorizontalHeaderLabels(["Age s", "Text", "Conf", "Pass", "Bright", "Verdict", "Reason"])
+        self.tbl_readings.verticalHeader().setVisible(False)
+        self.tbl_readings.horizontalHeader().setSectionResizeMode(6, QHeaderView.ResizeMode.Stretch)
+        self.tbl_readings.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        readings_layout.addWidget(self.tbl_readings)
+        self.main_layout.addWidget(self.grp_readings)
+        
+        # 5. Doubts / Warnings Log
         self.grp_log = QGroupBox("Doubts / Warnings Log")
         log_layout = QVBoxLayout(self.grp_log)
         self.list_log = QListWidget()
         log_layout.addWidget(self.list_log)
         self.main_layout.addWidget(self.grp_log)
         
+    def on_tracing_toggled(self, checked):
+        # Through the config so the setting survives a restart (StateService applies it)
+        self.state_service.config.set("trace_spans", checked)
+        tracer.set_enabled(checked)
+
+    def on_dump_spans(self):
+        path = self.state_service.dump_trace()
+        self.lbl_spans.setText(f"Saved: {path}" if path else "Dump failed (see log)")
+
+    def update_spans(self, tracing):
+        spans = tracing.get("spans", {})
+        rows = [(name, st) for name, st in spans.items() if st.get("count")]
+        self.tbl_spans.setRowCount(len(rows))
+        for row, (name, st) in enumerate(rows):
+            values = [name, str(st["count"])] + [f"{st[k] / 1000:.2f}" for k in ("p50_us", "p90_us", "p99_us", "max_us", "mean_us")]
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if col > 0:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.tbl_spans.setItem(row, col, item)
+        cycle = spans.get("main.cycle", {})
+        if cycle.get("count"):
+            self.lbl_spans.setText(f"Day cycle p50 {cycle['p50_us'] / 1000:.1f}ms / 33ms budget")
+        elif not tracing.get("enabled"):
+            self.lbl_spans.setText("Disabled")
+
+    def on_dump_readings(self):
+        path = self.state_service.dump_readings()
+        self.lbl_reading_query.setText(f"Saved: {path}" if path else "Dump failed (see log)")
+
+    def update_readings(self, stats):
+        now = self.state_service.clock()
+        for region, spark in self.sparklines.items():
+            spark.set_points(readings.series(region, "conf", 60.0, now=now), now, 60.0)
+            st = stats.get(region)
+            if st:
+                self.lbl_reading_stats[region].setText(
+                    f"{st['recorded']} | ok {st['accepted']} / rej {st['rejected']} / held {st['held']}")
+        
+        region, seconds, filters = parse_query(self.txt_reading_query.text(), list(self.sparklines))
+        if region is None:
+            self.tbl_readings.setRowCount(0)
+            self.lbl_reading_query.setText("No region")
+            return
+        rows = readings.last(region, seconds or 60.0, now=now, limit=200, **filters)
+        self.lbl_reading_query.setText(f"{len(rows)} readings")
+        self.tbl_readings.setRowCount(len(rows))
+        for row, r in enumerate(reversed(rows)):  # Newest top
+            values = [f"{now - r['t']:.1f}", r["text"], f"{r['conf']:.0f}", r["pass"],
+                      f"{r['brightness']:.0f}" if r["brightness"] >= 0 else "-", r["verdict"], r["reason"]]
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if col == 5:
+                    item.setForeground(VERDICT_COLORS[VERDICTS.index(r["verdict"])])
+                self.tbl_readings.setItem(row, col, item)
+
+    @staticmethod
+    def _format_dispatch(name, stats):
+        return (f"{name}: depth {stats.get('depth', 0)} (max {stats.get('max_depth', 0)}) | "
+                f"Dropped: {stats.get('dropped', 0)}/{stats.get('posted', 0)} | "
+                f"Lag: {stats.get('last_lag_ms', 0):.0f}ms (max {stats.get('max_lag_ms', 0):.0f})")
+
     def update_ui(self):
         if not self.state_service: return
         
@@ -137,6 +323,47 @@ class StateInspectorWindow(QMainWindow):
         
         self.lbl_buffers.setText(f"Trigger: {debug_data.get('buffer_size')} | Consensus: {debug_data.get('level_consensus')}")
         
+        # Both latest-wins dispatchers: overlay (timer, stats...) and debug LEDs
+        dispatch_lines = []
+        ui = debug_data.get("ui_dispatch", {})
+        if ui:
+            dispatch_lines.append(self._format_dispatch("Overlay", ui))
+        if self.debug_overlay is not None:
+            dispatch_lines.append(self._format_dispatch("Debug", self.debug_overlay.get_dispatch_stats()))
+        if dispatch_lines:
+            self.lbl_ui_dispatch.setText("\n".join(dispatch_lines))
+        
+        sw = debug_data.get("scan_window", {})
+        mode = sw.get("mode", "-")
+        self.lbl_scan_window.setText(f"{mode} - {sw.get('reason', '')} ({vision_data.get('scan_delay', 0) * 1000:.0f}ms)")
+        self.lbl_scan_window.setStyleSheet("color: green;" if mode == "ARMED" else "color: gray;")
+        
+        lg = debug_data.get("level_gate", {})
+        lg_mode = lg.get("mode", "-")
+        self.lbl_level_gate.setText(f"{lg_mode} every {lg.get('interval', 0):.1f}s - {lg.get('reason', '')} (switches: {lg.get('switches', 0)})")
+        self.lbl_level_gate.setStyleSheet("color: orange;" if lg_mode == "FULL" else "color: gray;")
+        
+        mb = debug_data.get("mailbox", {})
+        if mb:
+            lat = mb.get("latency", {})
+            worst = max((v.get("max_ms", 0) for v in lat.values()), default=0)
+            self.lbl_mailbox.setText(
+                f"Depth: {mb.get('depth', 0)} (max {mb.get('max_depth', 0)}) | "
+                f"Dropped: {mb.get('dropped', 0)}/{mb.get('posted', 0)} | "
+                f"OCR lat: {lat.get('ocr', {}).get('avg_ms', 0):.1f}ms (worst {worst:.0f})"
+            )
+        
+        tracing = debug_data.get("tracing")
+        if tracing is not None:
+            if self.chk_tracing.isChecked() != tracing.get("enabled", False):
+                self.chk_tracing.blockSignals(True)
+                self.chk_tracing.setChecked(tracing.get("enabled", False))
+                self.chk_tracing.blockSignals(False)
+            self.update_spans(tracing)
+        
+        if "readings" in debug_data and self.grp_readings.isVisible():
+            self.update_readings(debug_data["readings"])
+        
         # Update Log
         current_rows = self.list_log.count()
         warnings = debug_data.get("recent_warnings", [])
@@ -0,0 +1,120 @@
+import threading
+import time
+from typing import Callable, Dict, Hashable, Tuple
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal, Qt
+
+from src.logger import logger
+
+
+class CoalescingDispatcher(QObject):
+    """
+    Latest-wins UI update dispatcher.
+
+    Background threads post (key, callback) pairs. Only the newest callback per
+    key is kept; pending callbacks are drained once per UI frame on the GUI thread.
+    A stale closure that gets replaced before the frame is counted as a drop.
+    """
+    # Emitted only on the empty -> non-empty transition (at most once per frame)
+    _arm_signal = pyqtSignal()
+
+    def __init__(self, fps: int = 60, name: str = "UI"):
+        super().__init__()
+        self.name = name
+        self.frame_ms = max(1, int(1000 / fps))
+
+        self._lock = threading.Lock()
+        self._pending: Dict[Hashable, Tuple[Callable, float]] = {}
+        self._armed = False
+
+        # Stats
+        self.posted = 0
+        self.dropped = 0
+        self.drained = 0
+        self.frames = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+
+        # Timer lives on the GUI thread (dispatcher must be created there)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._drain)
+        self._arm_signal.connect(self._arm, Qt.ConnectionType.QueuedConnection)
+
+    def post(self, key: Hashable, callback: Callable) -> None:
+        """Queue callback for the next UI frame, replacing any pending callback with the same key."""
+        now = time.perf_counter()
+        with self._lock:
+            self.posted += 1
+            previous = self._pending.get(key)
+            if previous is not None:
+                # Stale payload replaced -> keep original enqueue time to measure real lag
+                self.dropped += 1
+                self._pending[key] = (callback, previous[1])
+            else:
+                self._pending[key] = (callback, now)
+            depth = len(self._pending)
+            if depth > self.max_depth:
+                self.max_depth = depth
+            need_arm = not self._armed
+            self._armed = True
+
+        if need_arm:
+            self._arm_signal.emit()
+
+    def _arm(self):
+        # GUI thread: wait for the end of the current frame
+        if not self._timer.isActive():
+            self._timer.start(self.frame_ms)
+
+    def _drain(self):
+        with self._lock:
+            batch = self._pending
+            self._pending = {}
+            self._armed = False
+
+        if not batch:
+            return
+
+        now = time.perf_counter()
+        self.frames += 1
+        for key, (callback, enqueued_at) in batch.items():
+            lag_ms = (now - enqueued_at) * 1000
+            self.last_lag_ms = lag_ms
+            if lag_ms > self.max_lag_ms:
+                self.max_lag_ms = lag_ms
+            try:
+                callback()
+                self.drained += 1
+            except RuntimeError:
+                # Widget deleted (C++ object gone) - ignore like OverlayService.schedule
+                pass
+            except Exception as e:
+                self.errors += 1
+                logger.exception(f"[{self.name} Dispatcher] Error on '{key}': {e}")
+
+    @property
+    def depth(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            depth = len(self._pending)
+        return {
+            "depth": depth,
+            "max_depth": self.max_depth,
+            "posted": self.posted,
+            "dropped": self.dropped,
+            "drained": self.drained,
+            "frames": self.frames,
+            "errors": self.errors,
+            "last_lag_ms": round(self.last_lag_ms, 2),
+            "max_lag_ms": round(self.max_lag_ms, 2),
+        }
+
+    def reset_peaks(self):
+        self.max_depth = 0
+        self.max_lag_ms = 0.0
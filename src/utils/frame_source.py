@@ -0,0 +1,115 @@
+import glob
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+class RecordedFrameSource:
+    """
+    Plays back recorded screen frames in place of the live capture (headless runs).
+
+    `path` is either a video file (read with OpenCV) or a directory of images
+    (png/jpg/bmp, played in name order). A directory may hold a `frames.json`
+    manifest: {"origin": [left, top], "fps": 30, "timestamps": [...]}.
+    `origin` is the global screen position of the recorded frame's top-left
+    pixel, so the configured regions (global coordinates) crop the same pixels
+    as on the live screen.
+    """
+
+    IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+    MANIFEST = "frames.json"
+
+    def __init__(self, path: str, origin: Tuple[int, int] = (0, 0), fps: Optional[float] = None):
+        self.path = path
+        self.origin = origin
+        self.fps = fps
+        self.timestamps: Optional[List[float]] = None
+
+        self._files: List[str] = []
+        self._video = None
+        if os.path.isdir(path):
+            self._files = sorted(
+                f for f in glob.glob(os.path.join(path, "*"))
+                if f.lower().endswith(self.IMAGE_EXTENSIONS)
+            )
+            self._load_manifest()
+        else:
+            self._video = cv2.VideoCapture(path)
+            if not self._video.isOpened():
+                raise FileNotFoundError(f"Cannot open recording: {path}")
+            if self.fps is None:
+                self.fps = self._video.get(cv2.CAP_PROP_FPS) or None
+
+        if not self.fps:
+            self.fps = 30.0  # Main loop target rate
+
+        self.frame: Optional[np.ndarray] = None
+        self.index = -1
+        self.timestamp = 0.0  # Seconds since the first frame (recording time)
+
+    def _load_manifest(self):
+        manifest_path = os.path.join(self.path, self.MANIFEST)
+        if not os.path.exists(manifest_path):
+            return
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if "origin" in manifest:
+            self.origin = tuple(manifest["origin"])
+        if self.fps is None:
+            self.fps = manifest.get("fps")
+        self.timestamps = manifest.get("timestamps")
+
+    def __len__(self) -> int:
+        if self._video is not None:
+            return int(self._video.get(cv2.CAP_PROP_FRAME_COUNT))
+        return len(self._files)
+
+    @property
+    def duration(self) -> float:
+        """Recording length in seconds."""
+        if self.timestamps:
+            return self.timestamps[-1] - self.timestamps[0]
+        return len(self) / self.fps
+
+    def advance(self) -> bool:
+        """Loads the next frame. Returns False at the end of the recording."""
+        if self._video is not None:
+            ok, frame = self._video.read()
+            if not ok:
+                self.frame = None
+                return False
+        else:
+            if self.index + 1 >= len(self._files):
+                self.frame = None
+                return False
+            frame = cv2.imread(self._files[self.index + 1], cv2.IMREAD_COLOR)
+            if frame is None:
+                raise ValueError(f"Unreadable frame: {self._files[self.index + 1]}")
+
+        self.index += 1
+        self.frame = frame
+        if self.timestamps and self.index < len(self.timestamps):
+            self.timestamp = self.timestamps[self.index] - self.timestamps[0]
+        else:
+            self.timestamp = self.index / self.fps
+        return True
+
+    def grab(self, monitor: Dict[str, int]) -> Optional[np.ndarray]:
+        """Crops a region given in global screen coordinates (same dict as mss)."""
+        if self.frame is None:
+            return None
+        x = int(monitor.get("left", 0)) - self.origin[0]
+        y = int(monitor.get("top", 0)) - self.origin[1]
+        w, h = int(monitor.get("width", 0)), int(monitor.get("height", 0))
+        fh, fw = self.frame.shape[:2]
+        if w <= 0 or h <= 0 or x < 0 or y < 0 or x + w > fw or y + h > fh:
+            return None
+        return self.frame[y:y + h, x:x + w].copy()
+
+    def close(self):
+        if self._video is not None:
+            self._video.release()
+            self._video = None
@@ -0,0 +1,107 @@
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class RollingCounterDetector:
+    """
+    Cheap motion detector for an animated numeric HUD counter (Runes).
+
+    When runes are gained the in-game counter rolls through intermediate
+    values. Consecutive binarized crops are compared (fraction of changed
+    pixels): while the counter moves it is "rolling" and OCR is skipped.
+    Once the crop has been stable for `settle_frames` frames, OCR runs once
+    and its result is cached; further identical crops re-emit the cached
+    value instead of calling Tesseract again (refreshed every `max_cache_age` s).
+    """
+
+    def __init__(self, diff_threshold: float = 0.004, settle_frames: int = 2, max_cache_age: float = 2.0):
+        self.diff_threshold = diff_threshold  # Fraction of changed pixels considered "motion"
+        self.settle_frames = settle_frames
+        self.max_cache_age = max_cache_age
+
+        self.prev_binary: Optional[np.ndarray] = None
+        self.stable_count = 0
+        self.is_rolling = False
+
+        # Settled value cache
+        self.cached_binary: Optional[np.ndarray] = None
+        self.cached_value: Optional[Tuple[int, float]] = None
+        self.cached_at = 0.0
+
+        # Stats
+        self.frames = 0
+        self.roll_events = 0
+        self.skipped_frames = 0
+        self.cache_hits = 0
+        self.ocr_calls = 0
+
+    @staticmethod
+    def diff_ratio(a: Optional[np.ndarray], b: Optional[np.ndarray]) -> float:
+        """Fraction of pixels that differ between two binarized crops (1.0 if not comparable)."""
+        if a is None or b is None or a.shape != b.shape:
+            return 1.0
+        return np.count_nonzero(a != b) / a.size
+
+    def observe(self, binary: np.ndarray, now: Optional[float] = None) -> str:
+        """
+        Feeds the binarized crop of the current frame.
+        Returns "skip" (rolling / settling), "cached" (re-emit cached value) or "ocr".
+        """
+        if now is None:
+            now = time.time()
+        self.frames += 1
+
+        moving = self.diff_ratio(binary, self.prev_binary) > self.diff_threshold
+        self.prev_binary = binary
+
+        if moving:
+            if not self.is_rolling:
+                self.roll_events += 1
+            self.is_rolling = True
+            self.stable_count = 0
+            self.skipped_frames += 1
+            return "skip"
+
+        self.stable_count += 1
+        if self.stable_count < self.settle_frames:
+            self.skipped_frames += 1
+            return "skip"
+        self.is_rolling = False
+
+        if (self.cached_value is not None
+                and now - self.cached_at < self.max_cache_age
+                and self.diff_ratio(binary, self.cached_binary) <= self.diff_threshold):
+            self.cache_hits += 1
+            return "cached"
+
+        self.ocr_calls += 1
+        return "ocr"
+
+    def store(self, binary: np.ndarray, value: Optional[int], conf: float, now: Optional[float] = None):
+        """Caches the OCR result of a settled crop (None clears the cache: nothing readable)."""
+        if value is None:
+            self.cached_binary = None
+            self.cached_value = None
+            return
+        self.cached_binary = binary
+        self.cached_value = (value, conf)
+        self.cached_at = now if now is not None else time.time()
+
+    def reset(self):
+        self.prev_binary = None
+        self.cached_binary = None
+        self.cached_value = None
+        self.stable_count = 0
+        self.is_rolling = False
+
+    def get_stats(self) -> dict:
+        return {
+            "rolling": self.is_rolling,
+            "frames": self.frames,
+            "roll_events": self.roll_events,
+            "skipped": self.skipped_frames,
+            "cache_hits": self.cache_hits,
+            "ocr_calls": self.ocr_calls,
+        }
@@ -0,0 +1,192 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.logger import logger
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler of every Python thread (vision loops, OCR pass
+    workers, state actor, audio, Qt), started and stopped while the game runs.
+
+    A daemon thread reads sys._current_frames() `rate_hz` times per second and
+    counts identical stacks, so the cost is one stack walk per thread per sample
+    whatever the code does. Each sample is tagged with the game context returned
+    by `context()` (phase, fast mode...) so hot spots can be attributed to game
+    situations. stop() writes a speedscope profile (https://www.speedscope.app,
+    one sampled profile per thread and context) and a collapsed-stack file
+    (flamegraph.pl / inferno) to `out_dir`.
+    """
+
+    MAX_DEPTH = 64
+
+    def __init__(self, out_dir: str, rate_hz: float = 200.0,
+                 context: Optional[Callable[[], Dict[str, Any]]] = None):
+        self.out_dir = out_dir
+        self.interval = 1.0 / max(1.0, rate_hz)
+        self.context = context
+
+        self.samples: Counter = Counter()   # (context, thread, stack) -> count
+        self.context_samples: Counter = Counter()
+        self.sample_count = 0
+        self.sampling_time = 0.0            # Time spent inside the sampler (overhead)
+        self.started_at = 0.0
+        self.stopped_at = 0.0
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._code_labels: Dict[Any, str] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        with self._lock:
+            if self.running:
+                return False
+            self.samples.clear()
+            self.context_samples.clear()
+            self.sample_count = 0
+            self.sampling_time = 0.0
+            self.started_at = time.time()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="SamplingProfiler", daemon=True)
+            self._thread.start()
+        logger.info(f"Profiler: sampling all threads every {self.interval * 1000:.1f}ms")
+        return True
+
+    def stop(self) -> Optional[Dict[str, str]]:
+        """Stops sampling and writes the profile files. Returns their paths (None if not running)."""
+        with self._lock:
+            if not self.running:
+                return None
+            self._stop.set()
+            self._thread.join(timeout=2.0)
+            self._thread = None
+            self.stopped_at = time.time()
+        return self.write()
+
+    # --- Sampling ---
+
+    def _label(self, code) -> str:
+        label = self._code_labels.get(code)
+        if label is None:
+            label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            self._code_labels[code] = label
+        return label
+
+    def _context_key(self) -> str:
+        if not self.context:
+            return "-"
+        try:
+            ctx = self.context()
+        except Exception:
+            return "?"
+        return " ".join(f"{k}={v}" for k, v in ctx.items())
+
+    def _run(self):
+        own_id = threading.get_ident()
+        next_at = time.perf_counter()
+        while not self._stop.is_set():
+            t0 = time.perf_counter()
+            names = {t.ident: t.name for t in threading.enumerate()}
+            ctx = self._context_key()
+            for ident, frame in sys._current_frames().items():
+                if ident == own_id:
+                    continue
+                stack: List[str] = []
+                while frame is not None and len(stack) < self.MAX_DEPTH:
+                    stack.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                stack.reverse()
+                self.samples[(ctx, names.get(ident, f"Thread-{ident}"), tuple(stack))] += 1
+            self.context_samples[ctx] += 1
+            self.sample_count += 1
+            self.sampling_time += time.perf_counter() - t0
+
+            next_at += self.interval
+            delay = next_at - time.perf_counter()
+            if delay < 0:
+                next_at = time.perf_counter()  # Behind schedule: drop samples rather than burst
+                delay = 0
+            self._stop.wait(delay)
+
+    # --- Output ---
+
+    def get_stats(self) -> Dict[str, Any]:
+        end = self.stopped_at if not self.running and self.stopped_at else time.time()
+        duration = max(1e-6, end - self.started_at) if self.started_at else 0.0
+        return {
+            "running": self.running,
+            "duration_s": round(duration, 1),
+            "samples": self.sample_count,
+            "rate_hz": round(self.sample_count / duration, 1) if duration else 0.0,
+            "overhead_pct": round(100.0 * self.sampling_time / duration, 2) if duration else 0.0,
+            "contexts": dict(self.context_samples),
+        }
+
+    def collapsed(self) -> List[str]:
+        """flamegraph.pl lines: thread;[context];frame;...;leaf count"""
+        lines = []
+        for (ctx, thread, stack), count in sorted(self.samples.items(), key=lambda kv: -kv[1]):
+            lines.append(";".join((thread, f"[{ctx}]") + stack) + f" {count}")
+        return lines
+
+    def speedscope(self) -> Dict[str, Any]:
+        frames: List[Dict[str, str]] = []
+        frame_index: Dict[str, int] = {}
+        profiles: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for (ctx, thread, stack), count in self.samples.items():
+            profile = profiles.get((thread, ctx))
+            if profile is None:
+                profile = profiles[(thread, ctx)] = {
+                    "type": "sampled", "name": f"{thread} [{ctx}]", "unit": "seconds",
+                    "startValue": 0, "endValue": 0, "samples": [], "weights": [],
+                }
+            ids = []
+            for label in stack:
+                idx = frame_index.get(label)
+                if idx is None:
+                    idx = frame_index[label] = len(frames)
+                    frames.append({"name": label})
+                ids.append(idx)
+            weight = count * self.interval
+            profile["samples"].append(ids)
+            profile["weights"].append(weight)
+            profile["endValue"] += weight
+
+        ordered = sorted(profiles.values(), key=lambda p: -p["endValue"])
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": ordered,
+            "name": f"ER Timer profile {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.started_at))}",
+            "exporter": "eldenring-timer SamplingProfiler",
+            "activeProfileIndex": 0,
+        }
+
+    def write(self) -> Dict[str, str]:
+        os.makedirs(self.out_dir, exist_ok=True)
+        base = os.path.join(self.out_dir, f"profile_{time.strftime('%Y%m%d_%H%M%S', time.localtime(self.started_at))}")
+        paths = {
+            "speedscope": base + ".speedscope.json",
+            "collapsed": base + ".folded",
+            "summary": base + ".summary.json",
+        }
+        with open(paths["speedscope"], "w", encoding="utf-8") as f:
+            json.dump(self.speedscope(), f)
+        with open(paths["collapsed"], "w", encoding="utf-8") as f:
+            f.write("\n".join(self.collapsed()) + "\n")
+        with open(paths["summary"], "w", encoding="utf-8") as f:
+            json.dump(self.get_stats(), f, indent=2)
+        stats = self.get_stats()
+        logger.info(f"Profiler: {stats['samples']} samples over {stats['duration_s']}s "
+                    f"(overhead {stats['overhead_pct']}%) -> {paths['speedscope']}")
+        return paths
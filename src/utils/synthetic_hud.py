@@ -0,0 +1,292 @@
+import glob
+import io
+import json
+import os
+import random
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter, ImageFont
+
+# Banner texts and the PatternManager target they must map to
+BANNER_TEXTS = {"JOUR I": "DAY 1", "JOUR II": "DAY 2", "JOUR III": "DAY 3"}
+VICTORY_TEXT = "RÉSULTAT"
+# Decoys for false-positive rates (label None)
+DECOY_TEXTS = ("JOUR", "TOUR II", "JOURNAL", "BONJOUR", "RÉSUMÉ", "SOUS-BOIS", "")
+
+# Serif faces close to the in-game banner font, then common fallbacks
+FONT_CANDIDATES = (
+    "C:/Windows/Fonts/times.ttf", "C:/Windows/Fonts/georgia.ttf", "C:/Windows/Fonts/garabd.ttf",
+    "C:/Windows/Fonts/arial.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSerif.ttf", "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationSerif-Regular.ttf",
+)
+
+ROI_KEYS = {
+    "banner": "monitor_region",
+    "negative": "monitor_region",
+    "victory": "victory_region",
+    "level": "level_region",
+    "runes": "runes_region",
+}
+
+
+@dataclass
+class HudStyle:
+    """Rendering parameters of one synthetic sample (stored with its label)."""
+    font: str = ""
+    scale: float = 1.0          # Text height relative to the nominal HUD size
+    color: Tuple[int, int, int] = (235, 230, 215)
+    glow: float = 0.0           # Glow radius (px), 0 = none
+    glow_strength: float = 0.8
+    blur: float = 0.0           # Gaussian blur radius of the final image
+    noise: float = 0.0          # Gaussian sensor noise sigma (0-255 scale)
+    jpeg_quality: int = 0       # 0 = lossless, else re-encoded at this quality
+    background: str = "dark"    # dark | bright | busy | plate:<path>
+    dx: int = 0                 # Text offset from its nominal position
+    dy: int = 0
+
+
+class SyntheticHUD:
+    """
+    Renders labeled HUD crops (day banner, RÉSULTAT, level digits, rune count)
+    at the exact ROI sizes of config.json, so OCR throughput and accuracy can be
+    measured on reproducible corpora instead of (unshareable) game captures.
+    Images are BGR uint8 arrays, like the screen captures.
+    """
+
+    # Nominal text height as a fraction of the ROI height
+    TEXT_HEIGHT = {"banner": 0.42, "negative": 0.42, "victory": 0.45, "level": 0.70, "runes": 0.55}
+
+    def __init__(self, config: Dict[str, Any], fonts: Optional[List[str]] = None,
+                 plates_dir: Optional[str] = None, seed: int = 0):
+        self.regions = {kind: config.get(key, {}) for kind, key in ROI_KEYS.items()}
+        self.fonts = [f for f in (fonts or FONT_CANDIDATES) if os.path.exists(f)]
+        self.plates = []
+        if plates_dir:
+            self.plates = sorted(p for p in glob.glob(os.path.join(plates_dir, "*"))
+                                 if p.lower().endswith((".png", ".jpg", ".jpeg", ".bmp")))
+        self.rng = random.Random(seed)
+        self._font_cache: Dict[Tuple[str, int], Any] = {}
+        self._plate_cache: Dict[str, Image.Image] = {}
+
+    # --- Styles ---
+
+    def random_style(self, kind: str) -> HudStyle:
+        rng = self.rng
+        backgrounds = ["dark", "bright", "busy"] + [f"plate:{p}" for p in self.plates]
+        gold = kind == "victory"  # RÉSULTAT is drawn in gold
+        return HudStyle(
+            font=rng.choice(self.fonts) if self.fonts else "",
+            scale=rng.uniform(0.85, 1.15),
+            color=(rng.randint(200, 255), rng.randint(170, 215), rng.randint(60, 120)) if gold
+            else tuple(rng.randint(200, 255) for _ in range(3)),
+            glow=rng.choice([0.0, 0.0, 2.0, 4.0, 6.0]),
+            glow_strength=rng.uniform(0.4, 1.0),
+            blur=rng.choice([0.0, 0.0, 0.5, 1.0, 1.5]),
+            noise=rng.choice([0.0, 3.0, 6.0, 10.0]),
+            jpeg_quality=rng.choice([0, 0, 90, 70, 50]),
+            background=rng.choice(backgrounds),
+            dx=rng.randint(-3, 3),
+            dy=rng.randint(-2, 2),
+        )
+
+    # --- Rendering ---
+
+    def _font(self, path: str, size: int):
+        key = (path, size)
+        if key not in self._font_cache:
+            if path:
+                self._font_cache[key] = ImageFont.truetype(path, size)
+            else:
+                self._font_cache[key] = ImageFont.load_default(size=size)
+        return self._font_cache[key]
+
+    def _background(self, style: HudStyle, size: Tuple[int, int]) -> Image.Image:
+        w, h = size
+        if style.background.startswith("plate:"):
+            path = style.background[len("plate:"):]
+            if path not in self._plate_cache:
+                self._plate_cache[path] = Image.open(path).convert("RGB")
+            plate = self._plate_cache[path]
+            if plate.width < w or plate.height < h:
+                plate = plate.resize((max(w, plate.width), max(h, plate.height)))
+            x = self.rng.randint(0, plate.width - w)
+            y = self.rng.randint(0, plate.height - h)
+            return plate.crop((x, y, x + w, y + h))
+
+        # Procedural plates: seeded by the rng so a corpus is reproducible
+        np_rng = np.random.default_rng(self.rng.getrandbits(32))
+        if style.background == "bright":
+            base = np_rng.uniform(150, 230)
+            grad = np.linspace(0, np_rng.uniform(-40, 40), w)[None, :]
+            img = np.clip(base + grad + np_rng.normal(0, 8, (h, w)), 0, 255)
+            img = np.repeat(img[:, :, None], 3, axis=2) * np.array([1.0, 0.97, 0.9])
+        elif style.background == "busy":
+            small = np_rng.uniform(20, 200, (max(2, h // 8), max(2, w // 8), 3))
+            img = np.asarray(Image.fromarray(small.astype(np.uint8)).resize((w, h), Image.BICUBIC), dtype=np.float64)
+        else:  # dark
+            base = np_rng.uniform(5, 40)
+            img = np.clip(base + np_rng.normal(0, 4, (h, w, 3)), 0, 255)
+        return Image.fromarray(np.clip(img, 0, 255).astype(np.uint8), "RGB")
+
+    def render(self, kind: str, text: str, style: Optional[HudStyle] = None,
+               size: Optional[Tuple[int, int]] = None) -> np.ndarray:
+        """Renders `text` into an ROI-sized crop (BGR uint8)."""
+        style = style or self.random_style(kind)
+        if size is None:
+            region = self.regions[kind]
+            size = (int(region.get("width", 0)), int(region.get("height", 0)))
+        w, h = size
+        img = self._background(style, size)
+
+        if text:
+            font = self._font(style.font, max(6, int(h * self.TEXT_HEIGHT[kind] * style.scale)))
+            layer = Image.new("L", size, 0)
+            draw = ImageDraw.Draw(layer)
+            left, top, right, bottom = draw.textbbox((0, 0), text, font=font)
+            tw, th = right - left, bottom - top
+            if kind == "runes":
+                x = w - tw - max(2, w // 30)  # Right-aligned counter
+            else:
+                x = (w - tw) // 2
+            x += style.dx - left
+            y = (h - th) // 2 + style.dy - top
+            draw.text((x, y), text, fill=255, font=font)
+
+            if kind in ("level", "runes"):
+                # Numeric HUD: dark outline for readability on any background
+                outline = layer.filter(ImageFilter.MaxFilter(3))
+                img.paste(Image.new("RGB", size, (10, 10, 10)), (0, 0), outline)
+            if style.glow > 0:
+                halo = layer.filter(ImageFilter.GaussianBlur(style.glow))
+                halo = halo.point(lambda v: int(v * style.glow_strength))
+                img.paste(Image.new("RGB", size, tuple(style.color)), (0, 0), halo)
+            img.paste(Image.new("RGB", size, tuple(style.color)), (0, 0), layer)
+
+        if style.blur > 0:
+            img = img.filter(ImageFilter.GaussianBlur(style.blur))
+        if style.jpeg_quality:
+            buf = io.BytesIO()
+            img.save(buf, format="JPEG", quality=style.jpeg_quality)
+            buf.seek(0)
+            img = Image.open(buf).convert("RGB")
+
+        out = np.asarray(img, dtype=np.uint8)
+        if style.noise > 0:
+            np_rng = np.random.default_rng(self.rng.getrandbits(32))
+            out = np.clip(out + np_rng.normal(0, style.noise, out.shape), 0, 255).astype(np.uint8)
+        return np.ascontiguousarray(out[:, :, ::-1])  # RGB -> BGR (capture convention)
+
+    # --- Labeled samples ---
+
+    def sample(self, kind: str) -> Tuple[np.ndarray, Dict[str, Any]]:
+        """Random labeled sample: (image, {"kind", "text", "label", "style"})."""
+        rng = self.rng
+        if kind == "banner":
+            text = rng.choice(list(BANNER_TEXTS))
+            label = BANNER_TEXTS[text]
+        elif kind == "victory":
+            text, label = VICTORY_TEXT, "VICTORY"
+        elif kind == "level":
+            label = rng.randint(1, 15)
+            text = str(label)
+        elif kind == "runes":
+            # Log-uniform: small counts are as common as large ones in a run
+            label = int(10 ** rng.uniform(0, 6.3))
+            text = str(label)
+        elif kind == "negative":
+            text, label = rng.choice(DECOY_TEXTS), None
+        else:
+            raise ValueError(f"Unknown sample kind: {kind}")
+        style = self.random_style(kind)
+        image = self.render(kind, text, style)
+        return image, {"kind": kind, "text": text, "label": label, "style": asdict(style)}
+
+
+class SyntheticFrameSource:
+    """
+    Frame source for VisionEngine.set_frame_source(): every grab() of a configured
+    ROI returns a freshly rendered sample, any other region a background plate.
+    `labels` holds the ground truth of the current frame, per kind.
+    """
+
+    def __init__(self, hud: SyntheticHUD, kinds: Tuple[str, ...] = ("banner", "level", "runes"),
+                 frames: int = 1000, fps: float = 30.0):
+        self.hud = hud
+        self.kinds = kinds
+        self.frames = frames
+        self.fps = fps
+        self.index = -1
+        self.timestamp = 0.0
+        self.labels: Dict[str, Any] = {}
+        self._crops: Dict[Tuple[int, int, int, int], np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return self.frames
+
+    @property
+    def duration(self) -> float:
+        return self.frames / self.fps
+
+    def advance(self) -> bool:
+        if self.index + 1 >= self.frames:
+            return False
+        self.index += 1
+        self.timestamp = self.index / self.fps
+        self._crops = {}
+        self.labels = {}
+        for kind in self.kinds:
+            image, meta = self.hud.sample(kind)
+            region = self.hud.regions[kind]
+            key = (int(region.get("left", 0)), int(region.get("top", 0)), int(region.get("width", 0)), int(region.get("height", 0)))
+            self._crops[key] = image
+            self.labels[kind] = meta["label"]
+        return True
+
+    def grab(self, monitor: Dict[str, int]) -> Optional[np.ndarray]:
+        x, y = int(monitor.get("left", 0)), int(monitor.get("top", 0))
+        w, h = int(monitor.get("width", 0)), int(monitor.get("height", 0))
+        if w <= 0 or h <= 0:
+            return None
+        for (cx, cy, cw, ch), crop in self._crops.items():
+            if cx <= x and cy <= y and x + w <= cx + cw and y + h <= cy + ch:
+                return crop[y - cy:y - cy + h, x - cx:x - cx + w].copy()
+        style = HudStyle(background="dark")
+        return self.hud.render("banner", "", style, size=(w, h))
+
+    def close(self):
+        pass
+
+
+def write_corpus(hud: SyntheticHUD, out_dir: str, counts: Dict[str, int], fmt: str = "png") -> str:
+    """
+    Writes `counts[kind]` samples per kind to out_dir/<kind>/NNNNNN.<fmt>
+    and their ground truth to out_dir/labels.jsonl. Returns the labels path.
+    """
+    labels_path = os.path.join(out_dir, "labels.jsonl")
+    os.makedirs(out_dir, exist_ok=True)
+    with open(labels_path, "w", encoding="utf-8") as f:
+        for kind, count in counts.items():
+            kind_dir = os.path.join(out_dir, kind)
+            os.makedirs(kind_dir, exist_ok=True)
+            for i in range(count):
+                image, meta = hud.sample(kind)
+                rel = f"{kind}/{i:06d}.{fmt}"
+                Image.fromarray(image[:, :, ::-1]).save(os.path.join(out_dir, rel))
+                meta["file"] = rel
+                f.write(json.dumps(meta, ensure_ascii=False) + "\n")
+    return labels_path
+
+
+def read_corpus(out_dir: str) -> List[Dict[str, Any]]:
+    """Labels of a corpus written by write_corpus (each with its absolute `path`)."""
+    entries = []
+    with open(os.path.join(out_dir, "labels.jsonl"), "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                entry["path"] = os.path.join(out_dir, entry["file"])
+                entries.append(entry)
+    return entries
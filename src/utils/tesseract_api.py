@@ -3,6 +3,20 @@ import os
 import cv2
 import numpy as np
 
+DEFAULT_TESSERACT_CMD = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+
+
+def library_paths(config):
+    """
+    (shared library, tessdata dir) from a config dict: `tesseract_lib` / `tessdata_dir`
+    overrides (non-Windows installs), else next to `tesseract_cmd`.
+    """
+    base_path = os.path.dirname(config.get("tesseract_cmd") or DEFAULT_TESSERACT_CMD)
+    dll_path = config.get("tesseract_lib") or os.path.join(base_path, "libtesseract-5.dll")
+    tessdata_path = config.get("tessdata_dir") or os.path.join(base_path, "tessdata")
+    return dll_path, tessdata_path
+
+
 class TesseractAPI:
     def __init__(self, dll_path, tessdata_path, lang="fra", allowlist=None, psm=7, variables=None):
         if not os.path.exists(dll_path):
@@ -1,46 +1,20 @@
 import matplotlib.pyplot as plt
 import numpy as np
 
+from src.core.ideal_curve import IdealCurve
+
 # Apply style BEFORE creating the figure
 plt.style.use('dark_background')
 
+# Same model as StateService (defaults = Phase 4 constants, 437k Lvl 14 target)
+curve = IdealCurve()
+
 def get_ideal_runes_at_time(t):
-    # Constants from StateService (Phase 3 Fix)
-    NR_DAY_DURATION = 840      # 14 minutes
-    NR_TOTAL_TIME = 1680       # 28 minutes
-    NR_FARMING_GOAL = 337578   # Target - Boss Drops (437k - 100k)
-    NR_BOSS_DROPS = 50000      # 50k per boss
-    NR_SNOWBALL_D1 = 1.35
-    NR_SNOWBALL_D2 = 1.15
-    NR_IDEAL_TARGET = 437578   # Lvl 14
-    
-    # Piecewise Logic
-    if t < NR_DAY_DURATION:
-        # Day 1: 0 -> 14m
-        ratio = t / NR_TOTAL_TIME
-        val = NR_FARMING_GOAL * (ratio ** NR_SNOWBALL_D1)
-        return val
-    elif t < NR_TOTAL_TIME:
-        # Day 2: 14m -> 28m
-        # Calculate Day 1 end point (Farming only)
-        val_d1_end = NR_FARMING_GOAL * ((NR_DAY_DURATION / NR_TOTAL_TIME) ** NR_SNOWBALL_D1)
-        start_d2 = val_d1_end + NR_BOSS_DROPS
-        
-        # Growth needed in Day 2 to reach Target (437k)
-        rem_farming = NR_IDEAL_TARGET - start_d2
-        
-        # Progress in Day 2
-        t_d2 = t - NR_DAY_DURATION
-        ratio_d2 = t_d2 / NR_DAY_DURATION
-        val = start_d2 + rem_farming * (ratio_d2 ** NR_SNOWBALL_D2)
-        return val
-    else:
-        # Post Day 2: Flat + Boss 2 Drop
-        return NR_IDEAL_TARGET + NR_BOSS_DROPS
+    return curve.value_at(t)
 
 # Generate Data
 times = np.linspace(0, 2400, 2400) # Up to 40 mins for comparison
-runes = [get_ideal_runes_at_time(t) for t in times]
+runes = curve.ideal_for(len(times))
 
 # Plot
 plt.figure(figsize=(12, 6))
@@ -0,0 +1,71 @@
+from src.core.reading_filter import ReadingFilter, level_transition_prior, runes_transition_prior
+
+
+def feed(f, values, current, conf=95.0, start=100.0, step=0.2):
+    decision = None
+    for i, value in enumerate(values):
+        decision = f.add(value, conf, current, ts=start + i * step)
+    return decision
+
+
+def test_current_value_is_stable():
+    f = ReadingFilter("Level", level_transition_prior)
+    assert feed(f, [5, 5, 5], current=5).status == "stable"
+
+
+def test_new_value_confirmed_on_second_confident_reading():
+    f = ReadingFilter("Level", level_transition_prior)
+    first = f.add(6, 95.0, 5, ts=100.0)
+    assert (first.status, first.value) == ("pending", 6)
+    second = f.add(6, 95.0, 5, ts=100.2)
+    assert (second.status, second.value) == ("confirmed", 6)
+    assert f.confirmations == 1
+
+
+def test_low_confidence_needs_more_readings():
+    f = ReadingFilter("Level", level_transition_prior)
+    assert feed(f, [6, 6], current=5, conf=60.0).status == "pending"
+    assert feed(f, [6, 6], current=5, conf=60.0, start=100.4).status == "confirmed"
+
+
+def test_old_readings_of_the_current_value_do_not_outvote_a_change():
+    f = ReadingFilter("Runes", runes_transition_prior)
+    feed(f, [1000] * 8, current=1000)
+    decision = feed(f, [1500, 1500], current=1000, start=101.6)
+    assert (decision.status, decision.value) == ("confirmed", 1500)
+
+
+def test_split_readings_become_contested():
+    f = ReadingFilter("Level", level_transition_prior)
+    statuses = [f.add(v, 95.0, 5, ts=100.0 + i * 0.2).status for i, v in enumerate([6, 8, 6, 8, 6])]
+    assert statuses[-2] == "pending"  # Not enough readings to call it yet
+    assert statuses[-1] == "contested"
+    assert f.contested == 1
+
+
+def test_reading_the_current_value_again_ends_the_contest():
+    f = ReadingFilter("Level", level_transition_prior)
+    feed(f, [6, 8, 6, 8, 6], current=5)
+    assert f.add(5, 95.0, 5, ts=101.0).status == "stable"
+
+
+def test_implausible_jump_needs_sustained_evidence():
+    f = ReadingFilter("Level", level_transition_prior)
+    statuses = [f.add(30, 95.0, 5, ts=100.0 + i * 0.2).status for i in range(9)]
+    assert statuses[:8] == ["pending"] * 8
+    assert statuses[8] == "confirmed"
+
+
+def test_readings_older_than_max_age_leave_the_window():
+    f = ReadingFilter("Level", level_transition_prior, max_age=4.0)
+    f.add(6, 95.0, 5, ts=100.0)
+    # The first 6 expired: the second one starts over
+    assert f.add(6, 95.0, 5, ts=105.0).status == "pending"
+
+
+def test_reset_clears_the_window():
+    f = ReadingFilter("Level", level_transition_prior)
+    f.add(6, 95.0, 5, ts=100.0)
+    f.reset()
+    assert f.add(6, 95.0, 5, ts=100.2).status == "pending"
+    assert f.streak == 1
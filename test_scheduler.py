@@ -0,0 +1,102 @@
+from src.core.clock import VirtualClock
+from src.core.scheduler import EventScheduler, PhaseTimeline
+
+
+def make_scheduler(start=1000.0):
+    clock = VirtualClock(start)
+    return clock, EventScheduler(clock=clock)
+
+
+def test_jobs_run_in_deadline_order():
+    clock, scheduler = make_scheduler()
+    ran = []
+    scheduler.schedule_in(3.0, lambda: ran.append("c"), name="c")
+    scheduler.schedule_in(1.0, lambda: ran.append("a"), name="a")
+    scheduler.schedule_in(2.0, lambda: ran.append("b"), name="b")
+
+    assert scheduler.run_due() == 0
+    clock.advance(2.0)
+    assert scheduler.run_due() == 2
+    assert ran == ["a", "b"]
+    clock.advance(1.0)
+    scheduler.run_due()
+    assert ran == ["a", "b", "c"]
+
+
+def test_same_deadline_keeps_insertion_order():
+    clock, scheduler = make_scheduler()
+    ran = []
+    for name in "xyz":
+        scheduler.schedule_at(clock() + 1.0, lambda n=name: ran.append(n), name=name)
+    clock.advance(1.0)
+    scheduler.run_due()
+    assert ran == ["x", "y", "z"]
+
+
+def test_cancelled_job_is_skipped_and_leaves_the_heap():
+    clock, scheduler = make_scheduler()
+    ran = []
+    first = scheduler.schedule_in(1.0, lambda: ran.append("first"))
+    scheduler.schedule_in(2.0, lambda: ran.append("second"))
+    scheduler.cancel(first)
+
+    # Lazy deletion: the next deadline already ignores the cancelled head
+    assert scheduler.next_deadline() == clock() + 2.0
+    assert scheduler.get_stats()["pending"] == 1
+    clock.advance(5.0)
+    scheduler.run_due()
+    assert ran == ["second"]
+
+
+def test_cancel_group_stops_a_recurring_job_from_its_own_callback():
+    clock, scheduler = make_scheduler()
+    ticks = []
+
+    def tick():
+        ticks.append(clock())
+        if len(ticks) == 2:
+            scheduler.cancel_group("timer")
+
+    scheduler.schedule_every(1.0, tick, group="timer")
+    scheduler.schedule_in(10.0, lambda: None, group="other")
+    for _ in range(5):
+        clock.advance(1.0)
+        scheduler.run_due()
+
+    assert len(ticks) == 2
+    assert scheduler.pending("timer") == []
+    assert len(scheduler.pending("other")) == 1
+
+
+def test_recurring_job_skips_missed_beats_without_drift():
+    clock, scheduler = make_scheduler(start=0.0)
+    ticks = []
+    scheduler.schedule_every(1.0, lambda: ticks.append(clock()))
+
+    clock.set(3.5)  # Suspended for several periods: one catch-up run, not three
+    assert scheduler.run_due() == 1
+    assert scheduler.next_deadline() == 4.0
+
+
+def test_crashing_job_does_not_stop_the_others():
+    clock, scheduler = make_scheduler()
+    ran = []
+    scheduler.schedule_in(1.0, lambda: 1 / 0, name="boom")
+    scheduler.schedule_in(1.0, lambda: ran.append("ok"))
+    clock.advance(1.0)
+    scheduler.run_due()
+    assert ran == ["ok"]
+    assert scheduler.errors == 1
+
+
+def test_phase_timeline_expiry_and_announcements():
+    phases = [{"name": "Day 1 - Storm", "duration": 270}, {"name": "Boss 1", "duration": 0}]
+    timeline = PhaseTimeline.build(phases, 0, start_time=100.0, announce_at=(300, 120, 30, 5))
+
+    assert timeline.expiry == 370.0
+    # Announcements longer than the phase are dropped, the rest sorted by instant
+    assert timeline.announcements == [(250.0, 120), (340.0, 30), (365.0, 5)]
+    assert timeline.next_second_boundary(100.4) == 101.005
+
+    stopwatch = PhaseTimeline.build(phases, 1, start_time=100.0, announce_at=(30,))
+    assert stopwatch.expiry is None and stopwatch.announcements == []
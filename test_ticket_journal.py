@@ -0,0 +1,115 @@
+import os
+
+from src.core.clock import VirtualClock
+from src.core.ticket_journal import TicketJournal
+from src.core.ticket_manager import TicketManager
+
+
+def make_journaled(journal_dir, clock, snapshot_every=1000):
+    tm = TicketManager({}, clock=clock)
+    journal = TicketJournal(str(journal_dir), snapshot_every=snapshot_every, clock=clock)
+    journal.snapshot_provider = lambda: {"tickets": tm.to_snapshot()}
+    tm.journal = journal
+    return tm, journal
+
+
+def restore(journal_dir, clock):
+    journal = TicketJournal(str(journal_dir), clock=clock)
+    state, tail = journal.load()
+    tm = TicketManager({}, clock=clock)
+    if state is not None:
+        tm.load_snapshot(state["tickets"])
+    for event in tail:
+        tm.apply_event(event)
+    return tm, journal, state, tail
+
+
+def assert_same_state(restored, live):
+    a, b = restored.to_snapshot(), live.to_snapshot()
+    assert a["next_ticket_id"] == b["next_ticket_id"]
+    assert sorted(a["tickets"], key=lambda t: t["id"]) == sorted(b["tickets"], key=lambda t: t["id"])
+    # Same tickets still to apply (the queue may hold stale ids that drain_validated skips)
+    assert [t.id for t in restored.drain_validated()] == [t.id for t in live.drain_validated()]
+
+
+def play_some_tickets(tm, clock):
+    gain = tm.create_ticket(500, 1000, 1500, transaction_type="GAIN")
+    tm.resolve_ticket(gain.id)
+    tm.mark_applied(gain.id)
+    merchant = tm.create_ticket(300, 1500, 1200)
+    clock.advance(TicketManager.MERCHANT_DELAY)
+    tm.check_pending_tickets()
+    return gain, merchant
+
+
+def test_full_replay_without_snapshot(tmp_path):
+    clock = VirtualClock(1000.0)
+    tm, journal = make_journaled(tmp_path, clock)
+    play_some_tickets(tm, clock)
+    tm.create_ticket(123, 1200, 1077)
+    journal.close()
+
+    restored, _, state, tail = restore(tmp_path, clock)
+    assert state is None
+    assert [e["seq"] for e in tail] == list(range(1, journal.seq + 1))
+    assert_same_state(restored, tm)
+
+
+def test_snapshot_offset_then_tail_replay(tmp_path):
+    clock = VirtualClock(1000.0)
+    tm, journal = make_journaled(tmp_path, clock)
+    play_some_tickets(tm, clock)
+    journal.snapshot()
+    covered = journal.seq
+
+    late = tm.create_ticket(123, 1200, 1077)
+    tm.add_evidence(late.id, "ghost_recovery", True)
+    journal.close()
+
+    restored, restored_journal, state, tail = restore(tmp_path, clock)
+    assert state is not None
+    # Only the events written after the snapshot are parsed
+    assert [e["seq"] for e in tail] == list(range(covered + 1, journal.seq + 1))
+    assert restored_journal.seq == journal.seq
+    assert_same_state(restored, tm)
+    assert restored.tickets[late.id].resolution == "GHOST"
+
+
+def test_restored_manager_keeps_ticket_ids_and_deadlines(tmp_path):
+    clock = VirtualClock(1000.0)
+    tm, journal = make_journaled(tmp_path, clock)
+    pending = tm.create_ticket(123, 1000, 877)
+    journal.close()
+
+    restored, _, _, _ = restore(tmp_path, clock)
+    assert restored.create_ticket(50, 877, 827).id != pending.id
+    clock.advance(TicketManager.RESOLVE_TIMEOUT)
+    restored.check_pending_tickets()
+    assert restored.tickets[pending.id].resolution == "ERROR"
+
+
+def test_truncated_last_line_is_ignored(tmp_path):
+    clock = VirtualClock(1000.0)
+    tm, journal = make_journaled(tmp_path, clock)
+    play_some_tickets(tm, clock)
+    journal.close()
+    with open(journal.journal_path, "a", encoding="utf-8") as f:
+        f.write('{"seq": 99, "type": "crea')  # Crash mid-write
+
+    restored, _, _, tail = restore(tmp_path, clock)
+    assert all(e["seq"] != 99 for e in tail)
+    assert_same_state(restored, tm)
+
+
+def test_rotate_archives_the_run_and_drops_the_snapshot(tmp_path):
+    clock = VirtualClock(1000.0)
+    tm, journal = make_journaled(tmp_path, clock)
+    play_some_tickets(tm, clock)
+    journal.snapshot()
+    journal.rotate("run1")
+
+    assert os.path.exists(tmp_path / "tickets_run1.jsonl")
+    assert not os.path.exists(journal.snapshot_path)
+    assert journal.seq == 0
+    state, tail = TicketJournal(str(tmp_path), clock=clock).load()
+    assert state is None and tail == []
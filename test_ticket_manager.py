@@ -0,0 +1,90 @@
+from src.core.clock import VirtualClock
+from src.core.ticket_manager import TicketManager
+
+
+def make_manager(retention=300.0):
+    clock = VirtualClock(1000.0)
+    return clock, TicketManager({"ticket_retention": retention}, clock=clock)
+
+
+def test_gain_and_level_up_resolve_instantly():
+    clock, tm = make_manager()
+    gain = tm.create_ticket(500, 1000, 1500, transaction_type="GAIN")
+    tm.resolve_ticket(gain.id)
+    assert (gain.state, gain.resolution) == ("VALIDATED", "GAIN")
+
+    spend = tm.create_ticket(673, 2000, 1327)
+    tm.add_evidence(spend.id, "level_up_detected", True)
+    assert (spend.state, spend.resolution) == ("VALIDATED", "LEVEL_UP")
+    assert [t.id for t in tm.drain_validated()] == [gain.id, spend.id]
+    assert tm.drain_validated() == []
+
+
+def test_merchant_deadline_after_half_a_second():
+    clock, tm = make_manager()
+    ticket = tm.create_ticket(300, 1000, 700)
+    assert tm.next_deadline() == clock() + TicketManager.MERCHANT_DELAY
+
+    clock.advance(0.4)
+    tm.check_pending_tickets()
+    assert ticket.state == "PENDING"
+    clock.advance(0.1)
+    tm.check_pending_tickets()
+    assert (ticket.state, ticket.resolution) == ("VALIDATED", "MERCHANT")
+
+
+def test_unexplained_drop_is_rejected_at_the_timeout():
+    clock, tm = make_manager()
+    ticket = tm.create_ticket(123, 1000, 877)
+    assert tm.next_deadline() == clock() + TicketManager.RESOLVE_TIMEOUT
+
+    clock.advance(1.9)
+    assert tm.check_pending_tickets() == 0
+    clock.advance(0.1)
+    assert tm.check_pending_tickets() == 1
+    assert (ticket.state, ticket.resolution) == ("REJECTED", "ERROR")
+
+
+def test_evidence_after_resolution_is_ignored():
+    clock, tm = make_manager()
+    ticket = tm.create_ticket(123, 1000, 877)
+    tm.add_evidence(ticket.id, "ghost_recovery", True)
+    assert ticket.resolution == "GHOST"
+    tm.add_evidence(ticket.id, "level_up_detected", True)
+    assert ticket.resolution == "GHOST"
+
+
+def test_terminal_tickets_expire_after_the_retention():
+    clock, tm = make_manager(retention=60.0)
+    applied = tm.create_ticket(500, 1000, 1500, transaction_type="GAIN")
+    tm.resolve_ticket(applied.id)
+    tm.mark_applied(applied.id)
+    validated = tm.create_ticket(600, 1500, 2100, transaction_type="GAIN")
+    tm.resolve_ticket(validated.id)
+
+    clock.advance(59.0)
+    tm.check_pending_tickets()
+    assert applied.id in tm.tickets
+    clock.advance(1.0)
+    tm.check_pending_tickets()
+    # Retention counts from creation and only removes terminal tickets
+    assert applied.id not in tm.tickets
+    assert validated.id in tm.tickets
+    assert tm.get_stats()["applied"] == 0
+
+
+def test_snapshot_round_trip_rebuilds_deadlines():
+    clock, tm = make_manager()
+    pending = tm.create_ticket(300, 1000, 700)
+    done = tm.create_ticket(500, 700, 1200, transaction_type="GAIN")
+    tm.resolve_ticket(done.id)
+
+    _, restored = make_manager()
+    restored.clock = clock
+    restored.load_snapshot(tm.to_snapshot())
+    assert restored.next_ticket_id == tm.next_ticket_id
+    assert [t.id for t in restored.drain_validated()] == [done.id]
+
+    clock.advance(TicketManager.MERCHANT_DELAY)
+    restored.check_pending_tickets()
+    assert restored.tickets[pending.id].resolution == "MERCHANT"
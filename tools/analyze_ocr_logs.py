@@ -1,108 +1,95 @@
+import sys
 import os
-import re
 import json
-import glob
-from collections import defaultdict, Counter
-import datetime
-
-def parse_timestamp(ts_str):
-    # format: HH:MM:SS
-    try:
-        return datetime.datetime.strptime(ts_str, "%H:%M:%S")
-    except:
-        return None
-
-def analyze_ocr_logs():
-    print("LOG ANALYZER: Starting analysis...")
-    
-    app_log_path = os.path.join(os.getcwd(), "application.log")
-    
-    ocr_events = []
-    sys_stats = []
-    
-    # Regex patterns
-    # 2026-01-25 12:56:06,239 - ...
-    log_pattern = re.compile(r"(\d{2}:\d{2}:\d{2}),\d+.*OCR: '([^']*)' \(Filter: (True|False), Score: (\d+)\) Br:([\d.]+) Dur:(\d+)ms")
-    # [SESSION LOG] SYSTEM_RESOURCE_STATS: {'cpu': 28.0, 'ram': 77.3}
-    sys_pattern = re.compile(r"(\d{2}:\d{2}:\d{2}),\d+.*SYSTEM_RESOURCE_STATS: \{'cpu': ([\d.]+), 'ram': ([\d.]+)\}")
-    
-    if os.path.exists(app_log_path):
-        print(f"Reading {app_log_path}...")
-        try:
-            with open(app_log_path, "r", encoding="utf-8") as f:
-                for line in f:
-                    # Parse OCR
-                    match_ocr = log_pattern.search(line)
-                    if match_ocr:
-                        timestamp, text, filtered, score, brightness, duration = match_ocr.groups()
-                        ocr_events.append({
-                            "time": timestamp,
-                            "dt": parse_timestamp(timestamp),
-                            "text": text,
-                            "duration": int(duration)
-                        })
-                        continue # Optimization
-                        
-                    # Parse Sys Stats
-                    match_sys = sys_pattern.search(line)
-                    if match_sys:
-                         timestamp, cpu, ram = match_sys.groups()
-                         sys_stats.append({
-                             "time": timestamp,
-                             "dt": parse_timestamp(timestamp),
-                             "cpu": float(cpu),
-                             "ram": float(ram)
-                         })
-
-        except Exception as e:
-            print(f"Error reading log: {e}")
-
-    print(f"Found {len(ocr_events)} OCR events and {len(sys_stats)} System Stat entries.")
-    
-    if not sys_stats:
-        print("No System Stats found in log. Cannot perform correlation.")
+import argparse
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.log_analyzer import LogAnalyzer
+
+DEFAULT_LOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'application.jsonl')
+
+
+def _fmt_latency(name, st):
+    return f"  {name:<22} n={st['count']:<5} p50={st['p50']:.1f}ms p90={st['p90']:.1f}ms p99={st['p99']:.1f}ms max={st['max']:.1f}ms"
+
+
+def print_session(s, trend_step):
+    print(f"\n=== Session {s['session_id']}: {s['first']} -> {s['last']} ({s['lines']} lines) ===")
+    if s["phases"]:
+        print(f"Phases   : {' > '.join(s['phases'][:12])}{' ...' if len(s['phases']) > 12 else ''}")
+    m = s["merchant"]
+    print(f"Deaths   : {s['deaths']} | Level ups: {s['level_ups']} | "
+          f"Merchant: {m['count']} purchases, {m['net']} runes (reverted {m['reverted']})")
+    warnings = s["levels"].get("WARNING", 0)
+    errors = s["levels"].get("ERROR", 0) + s["levels"].get("CRITICAL", 0)
+    print(f"Warnings : {warnings} | Errors: {errors}")
+
+    if s["latency_ms"]:
+        print("Latency:")
+        for name, st in s["latency_ms"].items():
+            print(_fmt_latency(name, st))
+
+    triggers = [t for t in s["triggers"] if t["kind"] != "candidate"]
+    if triggers:
+        print("Triggers:")
+        for t in triggers:
+            if t["kind"] == "latency":
+                print(f"  {t['time']}  {t['target']} restarted after {t['latency_ms']:.0f}ms "
+                      f"({t['readings']} readings, last frame {t['pipeline_ms']:.0f}ms)")
+            else:
+                print(f"  {t['time']}  {t['target']} activated (phase: {t['phase']})")
+
+    res = s["resources"]
+    if res["trend"]:
+        print(f"Resources: CPU max {res['cpu_max']}% | Memory max {res['memory_max_mb']}MB")
+        for r in res["trend"][::trend_step]:
+            print(f"  +{r['minute']:>3}min  CPU {r['cpu']:>5.1f}%  RAM {r['ram']:>5.1f}%  Mem {r['memory_mb']:>7.1f}MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-session report of application.jsonl and its rotated files (single streaming pass + sidecar offset index).")
+    parser.add_argument("--log", default=DEFAULT_LOG, help="Live log file (rotated .1 ... .5 are read too)")
+    parser.add_argument("--session", default=None, help="Only this context.session_id (seeks through the index)")
+    parser.add_argument("--event", default=None, help="Print the records of one event type (DEATH, SPENDING, TRIGGER_LATENCY...)")
+    parser.add_argument("--list", action="store_true", help="List the indexed sessions")
+    parser.add_argument("--trend-step", type=int, default=5, help="Resource trend: one line every N minutes")
+    parser.add_argument("--reindex", action="store_true", help="Drop the sidecar index and rebuild it")
+    parser.add_argument("--json", default=None, help="Write the report to this file")
+    args = parser.parse_args()
+
+    log_path = os.path.abspath(args.log)
+    analyzer = LogAnalyzer(log_path)
+    if args.reindex:
+        analyzer.index.files = {}
+
+    if args.list or args.event:
+        analyzer.refresh_index()
+        if args.list:
+            for sid in analyzer.index.sessions():
+                print(f"  {sid}")
+        else:
+            for record in analyzer.events(args.event, session=args.session):
+                print(json.dumps({k: record.get(k) for k in ("timestamp", "context", "message", "data")}))
         return
 
-    print("\n--- ANALYSIS: CPU SPIKES (>25%) ---")
-    high_cpu_events = [s for s in sys_stats if s["cpu"] > 25.0]
-    
-    print(f"Found {len(high_cpu_events)} High CPU events.")
-    
-    for stat in high_cpu_events[:10]: # Check first 10
-        # Find OCR activity in the 2 seconds surrounding this spike
-        target_dt = stat["dt"]
-        if not target_dt: continue
-        
-        nearby_ocr = [
-            o for o in ocr_events 
-            if o["dt"] and abs((o["dt"] - target_dt).total_seconds()) < 2
-        ]
-        
-        ocr_count = len(nearby_ocr)
-        avg_dur = sum(o["duration"] for o in nearby_ocr) / ocr_count if ocr_count > 0 else 0
-        
-        print(f"[{stat['time']}] CPU: {stat['cpu']}% | Nearby OCR scans: {ocr_count} | Avg OCR Dur: {avg_dur:.1f}ms")
-        if ocr_count > 10:
-             print("   -> ⚠️ HIGH OCR TRAFFIC")
-        if avg_dur > 200:
-             print("   -> ⚠️ SLOW OCR SCANS")
-             
-    # Correlation Summary
-    print("\n--- CORRELATION SUMMARY ---")
-    if high_cpu_events:
-        total_high = len(high_cpu_events)
-        correlated = 0
-        for stat in high_cpu_events:
-            target_dt = stat["dt"]
-            if not target_dt: continue
-            # Look for > 5 scans per second (approx Fast Mode)
-            nearby_ocr = [o for o in ocr_events if o["dt"] and abs((o["dt"] - target_dt).total_seconds()) < 1]
-            if len(nearby_ocr) > 5:
-                correlated += 1
-        
-        print(f"{correlated}/{total_high} ({correlated/total_high*100:.1f}%) of CPU spikes align with High OCR Activity (Fast Mode/Burst).")
-        
-    print("\nDone.")
+    report = analyzer.analyze(session=args.session, progress=lambda path: print(f"Reading {path}..."))
+    summary = f"{len(report['files'])} file(s), {report['bytes_read'] / 1e6:.1f} MB parsed"
+    if args.session:
+        summary += f" ({report['bytes_seeked'] / 1e6:.1f} MB through index seeks)"
+    print(summary)
+
+    if not report["sessions"]:
+        print("No session found.")
+    for s in report["sessions"]:
+        print_session(s, max(1, args.trend_step))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport: {args.json}")
+
 
 if __name__ == "__main__":
-    analyze_ocr_logs()
+    main()
@@ -0,0 +1,96 @@
+import sys
+import os
+import json
+import argparse
+import logging
+
+# Add src to path
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(PROJECT_ROOT)
+
+from src.benchmarks import BenchmarkSuite, compare
+
+
+def _print_entry(name, entry):
+    if "median_us" in entry:
+        print(f"{name:45s} median={entry['median_us']:>10.2f}us  p99={entry['p99_us']:>10.2f}us  (n={entry['iterations']})")
+    elif "skipped" in entry:
+        print(f"{name:45s} SKIPPED: {entry['skipped']}")
+    else:
+        print(f"{name:45s} ERROR: {entry['error']}")
+
+
+def cmd_run(args):
+    # The hot paths log per call (e.g. failed Level reads on blank frames): keep that out of the timings
+    logging.getLogger("EldenRingTimer").setLevel(getattr(logging, args.log_level))
+
+    with open(args.config, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    if args.tess_lib:
+        config["tesseract_lib"] = args.tess_lib
+    if args.tessdata:
+        config["tessdata_dir"] = args.tessdata
+
+    suite = BenchmarkSuite(config, tess=args.tess, seed=args.seed, min_time=args.min_time,
+                           config_path=os.path.abspath(args.config))
+    only = args.only.split(",") if args.only else None
+    try:
+        results = suite.run(only, progress=_print_entry)
+    finally:
+        suite.close()
+
+    print(f"\nTesseract backend: {results['meta']['tesseract']}")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results: {args.out}")
+
+
+def cmd_compare(args):
+    with open(args.base, "r", encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.new, "r", encoding="utf-8") as f:
+        new = json.load(f)
+
+    if base["meta"].get("tesseract") != new["meta"].get("tesseract"):
+        print(f"WARNING: Tesseract backends differ ({base['meta'].get('tesseract')} vs {new['meta'].get('tesseract')})")
+    rows = compare(base, new, threshold=args.threshold, noise_floor_us=args.noise_floor)
+    for row in rows:
+        print(f"{row['name']:45s} {row['base_median_us']:>10.2f} -> {row['median_us']:>10.2f}us  x{row['ratio']:<6}  "
+              f"p99 {row['base_p99_us']:.2f} -> {row['p99_us']:.2f}  {row['status']}")
+
+    regressions = [r for r in rows if r["status"] == "REGRESSION"]
+    print(f"\n{len(regressions)} regression(s) over {len(rows)} benchmarks (threshold {args.threshold:.0%})")
+    sys.exit(1 if regressions else 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks of the vision and state hot paths.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Run the suite and write a JSON result file")
+    run.add_argument("--config", default=os.path.join(PROJECT_ROOT, "data", "config.json"))
+    run.add_argument("--out", default=None, help="Result file (JSON)")
+    run.add_argument("--only", default=None, help="Comma list of name fragments (e.g. preprocess,tickets)")
+    run.add_argument("--tess", default="auto", choices=["auto", "lib", "stub"], help="OCR backend")
+    run.add_argument("--tess-lib", default=None, help="libtesseract path (e.g. /usr/lib/x86_64-linux-gnu/libtesseract.so.5)")
+    run.add_argument("--tessdata", default=None, help="tessdata directory")
+    run.add_argument("--min-time", type=float, default=0.5, help="Seconds per benchmark")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--log-level", default="WARNING", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                     help="Application log level while benchmarking")
+    run.set_defaults(func=cmd_run)
+
+    cmp_ = sub.add_parser("compare", help="Flag regressions between two result files")
+    cmp_.add_argument("base")
+    cmp_.add_argument("new")
+    cmp_.add_argument("--threshold", type=float, default=0.10, help="Relative median increase flagged as a regression")
+    cmp_.add_argument("--noise-floor", type=float, default=1.0, help="Ignore median changes below this (us)")
+    cmp_.set_defaults(func=cmd_compare)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
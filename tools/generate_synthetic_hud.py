@@ -0,0 +1,43 @@
+import sys
+import os
+import json
+import argparse
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.synthetic_hud import SyntheticHUD, write_corpus, ROI_KEYS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a labeled corpus of synthetic HUD crops (banner, RÉSULTAT, level, runes).")
+    parser.add_argument("out", help="Output directory (labels.jsonl + one folder per kind)")
+    parser.add_argument("--count", type=int, default=200, help="Samples per kind")
+    parser.add_argument("--kinds", default="banner,negative,victory,level,runes", help=f"Comma list among {','.join(ROI_KEYS)}")
+    parser.add_argument("--config", default=os.path.join("data", "config.json"), help="Config with the ROI geometries")
+    parser.add_argument("--fonts", default=None, help="Comma list of .ttf files (default: serif system fonts)")
+    parser.add_argument("--plates", default=None, help="Directory of background images (random crops)")
+    parser.add_argument("--seed", type=int, default=0, help="Same seed + same fonts/plates = same corpus")
+    parser.add_argument("--format", default="png", choices=["png", "bmp"], help="Lossless container (JPEG noise is part of the style)")
+    args = parser.parse_args()
+
+    with open(args.config, "r", encoding="utf-8") as f:
+        config = json.load(f)
+
+    kinds = [k.strip() for k in args.kinds.split(",") if k.strip()]
+    unknown = [k for k in kinds if k not in ROI_KEYS]
+    if unknown:
+        parser.error(f"Unknown kinds: {unknown}")
+
+    fonts = args.fonts.split(",") if args.fonts else None
+    hud = SyntheticHUD(config, fonts=fonts, plates_dir=args.plates, seed=args.seed)
+    if not hud.fonts:
+        print("WARNING: no font found, using Pillow's default font")
+
+    labels = write_corpus(hud, args.out, {kind: args.count for kind in kinds}, fmt=args.format)
+    print(f"{args.count * len(kinds)} samples written ({', '.join(kinds)})")
+    print(f"Labels: {labels}")
+
+
+if __name__ == "__main__":
+    main()
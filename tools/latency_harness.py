@@ -0,0 +1,94 @@
+import sys
+import os
+import json
+import argparse
+import tempfile
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.latency_harness import LatencyHarness, BannerTiming, RecordedBannerSequence, BANNER_PHASES
+
+
+def _fmt(dist, unit=""):
+    if not dist.get("n"):
+        return "n/a"
+    return f"p50={dist['p50']}{unit} p90={dist['p90']}{unit} p99={dist['p99']}{unit} max={dist['max']}{unit}"
+
+
+def print_report(report):
+    s = report["summary"]
+    print(f"\n{report['banner']}: {s['detected']}/{s['trials']} detected ({s['missed']} missed) in {report['wall_s']}s")
+    print(f"Onset -> timer restart : {_fmt(s['latency_ms'], 'ms')}")
+    print(f"Onset -> first reading : {_fmt(s['first_reading_ms'], 'ms')}")
+    print(f"Deciding frame         : {_fmt(s['pipeline_ms'], 'ms')}")
+    print(f"Readings in consensus  : {_fmt(s['readings'])}")
+    print(f"Frames since onset     : {_fmt(s['frames'])}")
+    print(f"OCR calls since onset  : {_fmt(s['ocr_calls'])}")
+    if s["missed"]:
+        print(f"Frames seen on misses  : {_fmt(s['frames_missed'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Banner-to-timer latency: replays day banners through the real OCR and trigger logic.")
+    parser.add_argument("--banner", default="JOUR II", choices=list(BANNER_PHASES))
+    parser.add_argument("--trials", type=int, default=20, help="Synthetic banner fades (random styles)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--frames", default=None, help="Recorded banner (video or frame directory) instead of synthetic fades")
+    parser.add_argument("--onset", type=float, default=0.0, help="Banner onset in the recording (s)")
+    parser.add_argument("--origin", default="0,0", help="Screen position of the recorded frame's top-left pixel (x,y)")
+    parser.add_argument("--lead", type=float, default=3.0, help="Synthetic: gameplay before the banner (s)")
+    parser.add_argument("--fade-in", type=float, default=0.6)
+    parser.add_argument("--hold", type=float, default=2.5)
+    parser.add_argument("--fonts", default=None, help="Comma list of .ttf files")
+    parser.add_argument("--plates", default=None, help="Directory of background images")
+    parser.add_argument("--config", default=None, help="Config to run with (default: data/config.json)")
+    parser.add_argument("--tess-lib", default=None, help="libtesseract path")
+    parser.add_argument("--tessdata", default=None, help="tessdata directory")
+    parser.add_argument("--workdir", default=None, help="Workdir (default: temp dir)")
+    parser.add_argument("--json", default=None, help="Write the report (per trial) to this file")
+    args = parser.parse_args()
+
+    overrides = {}
+    if args.tess_lib:
+        overrides["tesseract_lib"] = args.tess_lib
+    if args.tessdata:
+        overrides["tessdata_dir"] = args.tessdata
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="er_latency_")
+    # Resolved before the harness moves into its workdir
+    config_path = os.path.abspath(args.config) if args.config else None
+    frames = os.path.abspath(args.frames) if args.frames else None
+    json_path = os.path.abspath(args.json) if args.json else None
+
+    harness = LatencyHarness(workdir, config_path=config_path, text=args.banner, config_overrides=overrides)
+    try:
+        harness.setup()
+        if frames:
+            origin = tuple(int(v) for v in args.origin.split(","))
+            sequences = (RecordedBannerSequence(frames, args.onset, harness.clock, origin=origin) for _ in range(args.trials))
+        else:
+            timing = BannerTiming(lead=args.lead, fade_in=args.fade_in, hold=args.hold)
+            fonts = args.fonts.split(",") if args.fonts else None
+            sequences = harness.synthetic_sequences(args.trials, seed=args.seed, timing=timing, fonts=fonts, plates_dir=args.plates)
+
+        def progress(trial):
+            if trial["detected"]:
+                print(f"[{trial['trial'] + 1}/{args.trials}] {trial['latency_ms']:.0f}ms "
+                      f"({trial['frames']} frames, {trial['ocr_calls']} OCR calls)")
+            else:
+                print(f"[{trial['trial'] + 1}/{args.trials}] MISSED ({trial['frames']} frames)")
+
+        report = harness.run(sequences, progress)
+    finally:
+        harness.shutdown()
+
+    print_report(report)
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"\nReport: {json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import sys
+import os
+import json
+import argparse
+import tempfile
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.replay_farm import ReplayFarm, find_recordings
+
+
+def print_report(report):
+    summary = report["summary"]
+    print(f"\nSessions: {summary['sessions']} ({len(summary['failed'])} failed) on {summary['workers']} workers")
+    print(f"Wall time: {summary['wall_s']:.1f}s for {summary['recorded_s'] / 3600:.1f}h of recordings "
+          f"(per session: median {summary['session_wall_s']['median']:.2f}s, max {summary['session_wall_s']['max']:.2f}s)")
+    acc = summary["transition_accuracy"]
+    print(f"Transition accuracy: {acc * 100:.1f}%" if acc is not None else "Transition accuracy: n/a (no reference phases)")
+    print(f"Sessions with identical transitions: {summary['sessions_exact']}")
+    print("Classification (reference -> replay):")
+    for kind, counts in summary["events"].items():
+        marker = "" if counts["reference"] == counts["replay"] else "  <--"
+        print(f"  {kind:18s} {counts['reference']:5d} -> {counts['replay']:5d}{marker}")
+    print(f"Ticket resolutions: {summary['tickets']}")
+
+    diverging = [s for s in report["sessions"] if s["ok"] and (s["phases"]["missing"] or s["phases"]["extra"])]
+    if diverging:
+        print("\nDiverging transitions:")
+        for s in diverging:
+            print(f"  {os.path.basename(s['recording'])}: missing={s['phases']['missing']} extra={s['phases']['extra']}")
+    for failed in summary["failed"]:
+        print(f"FAILED {os.path.basename(failed['recording'])}: {failed['error']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay every sensor recording of a corpus in parallel and report regressions.")
+    parser.add_argument("paths", nargs="+", help="Recordings or directories (sensors_*.jsonl, recursive)")
+    parser.add_argument("--workers", type=int, default=None, help="Processes (default: CPU count)")
+    parser.add_argument("--config", default=None, help="Config to replay with (default: data/config.json)")
+    parser.add_argument("--workdir", default=None, help="Root of the per-session workdirs (default: temp dir)")
+    parser.add_argument("--keep", action="store_true", help="Keep the per-session workdirs (stats.db, journals)")
+    parser.add_argument("--tolerance", type=float, default=2.0, help="Max time shift (s) for two transitions to match")
+    parser.add_argument("--json", default=None, help="Write the full report (per session) to this file")
+    args = parser.parse_args()
+
+    recordings = find_recordings(args.paths)
+    if not recordings:
+        print("No sensor recordings found.")
+        sys.exit(1)
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="er_farm_")
+    farm = ReplayFarm(recordings, workdir, config_path=args.config, workers=args.workers,
+                      tolerance=args.tolerance, keep_workdirs=args.keep)
+
+    def progress(done, total, report):
+        status = f"{report['wall_s']:.2f}s" if report["ok"] else "FAILED"
+        print(f"[{done}/{total}] {os.path.basename(report['recording'])} {status}")
+
+    report = farm.run(progress)
+    print_report(report)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"\nReport: {args.json}")
+
+    sys.exit(1 if report["summary"]["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
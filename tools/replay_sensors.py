@@ -0,0 +1,72 @@
+import sys
+import os
+import json
+import argparse
+import tempfile
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.replay import ReplayEngine
+from src.core.sensor_recording import load_game_events
+
+
+def print_timeline_diff(name, diff):
+    print(f"{name}: matched={diff['matched']} missing={len(diff['missing'])} extra={len(diff['extra'])} "
+          f"max_shift={diff['max_shift_s']}s")
+    key = "event_type" if name == "events" else "name"
+    for item in diff["missing"]:
+        print(f"  - {item['t']:.2f} {item[key]}")
+    for item in diff["extra"]:
+        print(f"  + {item['t']:.2f} {item[key]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a sensor recording through the state logic (virtual clock) and diff the outputs.")
+    parser.add_argument("recording", help="data/recordings/sensors_*.jsonl (config 'record_sensors': true)")
+    parser.add_argument("--workdir", default=None, help="Where the run writes data/ (default: temp dir)")
+    parser.add_argument("--config", default=None, help="Config to use (default: data/config.json)")
+    parser.add_argument("--against", default=None, help="Previous replay output (--json) to diff against")
+    parser.add_argument("--log", default=None, help="application.jsonl whose GAME_EVENTs are the reference")
+    parser.add_argument("--tolerance", type=float, default=2.0, help="Max time shift (s) for two events to match")
+    parser.add_argument("--json", action="store_true", help="Print the full result (phases, events, tickets, curve) as JSON")
+    args = parser.parse_args()
+
+    reference = None
+    if args.against:
+        with open(args.against, "r", encoding="utf-8") as f:
+            reference = json.load(f)
+    elif args.log:
+        reference = {"events": load_game_events(args.log)}
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="er_replay_")
+    engine = ReplayEngine(args.recording, workdir, config_path=args.config)
+    try:
+        result = engine.run()
+        diff = engine.diff(reference, tolerance=args.tolerance)
+    finally:
+        engine.shutdown()
+
+    if args.json:
+        result["diff"] = diff
+        print(json.dumps(result, indent=2, default=str))
+        return
+
+    print(f"WORKDIR: {workdir}")
+    print(f"Inputs: {result['inputs']}")
+    print(f"Replayed {result['recording_s']:.1f}s in {result['wall_s']:.2f}s (x{result['speedup']})")
+    for phase in result["phases"]:
+        print(f"  {phase['t']:.2f} PHASE {phase['name']}{' (manual)' if phase['manual'] else ''}")
+    print(f"Events: {len(result['events'])}  Deaths: {len(result['deaths'])}  Tickets: {len(result['tickets'])}  Curve: {len(result['curve'])} pts")
+    print(f"Final: {result['final']}")
+    if result["vision"]["unanswered"]:
+        print(f"Unanswered vision calls: {result['vision']['unanswered']}")
+    for name in ("events", "phases"):
+        if name in diff:
+            print_timeline_diff(name, diff[name])
+    if "curve" in diff:
+        print(f"curve: lengths {diff['curve']['length']} max |delta| {diff['curve']['max_abs_delta']}")
+
+
+if __name__ == "__main__":
+    main()
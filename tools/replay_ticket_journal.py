@@ -0,0 +1,92 @@
+import sys
+import os
+import glob
+import argparse
+from collections import Counter
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.ticket_journal import TicketJournal
+from src.core.ticket_manager import TicketManager
+
+JOURNAL_DIR = os.path.join(os.getcwd(), "data", "tickets")
+
+
+def replay_rules(path, merchant_delay=None, timeout=None):
+    """
+    Re-runs the current resolution rules over a recorded journal:
+    creations and evidence are fed at their recorded times, the recorded
+    resolutions are only used for comparison.
+    """
+    tm = TicketManager({"debug_mode": False, "ticket_retention": float("inf")})  # Keep every ticket for comparison
+    if merchant_delay is not None:
+        tm.MERCHANT_DELAY = merchant_delay
+    if timeout is not None:
+        tm.RESOLVE_TIMEOUT = timeout
+
+    recorded = {}
+    created = 0
+    last_t = 0.0
+
+    for event in TicketJournal.read_events(path):
+        t = event.get("t", last_t)
+        last_t = t
+        # Let due deadlines fire first (same order as the live scheduler)
+        tm.check_pending_tickets(now=t)
+
+        kind = event.get("type")
+        if kind == "created":
+            tm.apply_event(event)
+            created += 1
+        elif kind == "evidence":
+            tm.add_evidence(event["id"], event["key"], event["value"], now=t)
+        elif kind == "resolved":
+            recorded[event["id"]] = event["resolution"]
+
+    # Flush everything still pending
+    tm.check_pending_tickets(now=last_t + tm.RESOLVE_TIMEOUT + 1)
+
+    replayed = {tid: t.resolution for tid, t in tm.tickets.items()}
+    return created, recorded, replayed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a ticket journal through the TicketManager rules.")
+    parser.add_argument("journal", nargs="?", default=os.path.join(JOURNAL_DIR, "tickets_current.jsonl"))
+    parser.add_argument("--list", action="store_true", help="List archived journals")
+    parser.add_argument("--merchant-delay", type=float, default=None, help="Override MERCHANT_DELAY (s)")
+    parser.add_argument("--timeout", type=float, default=None, help="Override RESOLVE_TIMEOUT (s)")
+    args = parser.parse_args()
+
+    if args.list:
+        for path in sorted(glob.glob(os.path.join(JOURNAL_DIR, "tickets_*.jsonl"))):
+            print(f"{os.path.basename(path):50s} {os.path.getsize(path) / 1024:8.1f} KB")
+        return
+
+    if not os.path.exists(args.journal):
+        print(f"Journal not found: {args.journal}")
+        return
+
+    created, recorded, replayed = replay_rules(args.journal, args.merchant_delay, args.timeout)
+
+    print(f"JOURNAL: {args.journal}")
+    print(f"Tickets created: {created}")
+    print(f"Recorded resolutions: {dict(Counter(recorded.values()))}")
+    print(f"Replayed resolutions: {dict(Counter(r for r in replayed.values() if r))}")
+
+    unresolved_live = [tid for tid in replayed if tid not in recorded]
+    if unresolved_live:
+        print(f"Still pending when the journal ends: {len(unresolved_live)} (flushed with the timeout rule)")
+
+    mismatches = [(tid, recorded[tid], res) for tid, res in sorted(replayed.items()) if tid in recorded and recorded[tid] != res]
+    if mismatches:
+        print(f"\n{len(mismatches)} ticket(s) resolve differently with the current rules:")
+        for tid, live, new in mismatches:
+            print(f"  {tid}: live={live} -> replay={new}")
+    else:
+        print("\nAll resolutions match.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import sys
+import os
+import json
+import argparse
+import tempfile
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.headless import HeadlessPipeline
+from src.core.tracing import tracer
+
+
+def print_summary(summary):
+    print(f"Frames: {summary['frames']} ({summary['secondary_cycles']} Level/Runes passes)")
+    print(f"Wall time: {summary['wall_s']:.2f}s for {summary['recording_s']:.2f}s of recording "
+          f"-> {summary['fps']:.1f} fps, x{summary['speedup']:.1f} real time")
+    for name in ("main_ms", "secondary_ms"):
+        lat = summary[name]
+        print(f"{name:13s} p50={lat['p50']:.2f}  p95={lat['p95']:.2f}  max={lat['max']:.2f}")
+    print(f"Sensors: {summary['sensors']}")
+    mailbox = summary["mailbox"]
+    print(f"State mailbox: processed={mailbox.get('processed')} dropped={mailbox.get('dropped')} max_depth={mailbox.get('max_depth')}")
+    for kind, lat in mailbox.get("latency", {}).items():
+        print(f"  {kind:8s} avg={lat['avg_ms']:.2f}ms max={lat['max_ms']:.2f}ms ({int(lat['count'])})")
+    print(f"Tickets: {summary['tickets']}")
+    print(f"Final state: {summary['final']}")
+    print(f"Overlay calls: {summary['overlay_calls']}  Announcements: {summary['announcements']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the production pipeline headless on a recorded session.")
+    parser.add_argument("recording", help="Video file or directory of frames (optional frames.json manifest)")
+    parser.add_argument("--workdir", default=None, help="Where the run writes data/ (default: temp dir)")
+    parser.add_argument("--config", default=os.path.join(os.getcwd(), "data", "config.json"), help="Config to copy into the workdir")
+    parser.add_argument("--origin", default="0,0", help="Global screen position of the frames' top-left pixel (x,y)")
+    parser.add_argument("--fps", type=float, default=None, help="Recording frame rate (default: manifest/video/30)")
+    parser.add_argument("--max-frames", type=int, default=None)
+    parser.add_argument("--realtime", action="store_true", help="Play frames at recording speed")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    parser.add_argument("--trace", default=None, help="Record pipeline spans and write the histograms to this JSON file")
+    args = parser.parse_args()
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="er_headless_")
+    origin = tuple(int(v) for v in args.origin.split(","))
+    trace_path = os.path.abspath(args.trace) if args.trace else None
+
+    pipeline = HeadlessPipeline(args.recording, workdir, config_path=args.config, origin=origin,
+                                fps=args.fps, realtime=args.realtime,
+                                config_overrides={"trace_spans": True} if trace_path else None)
+    try:
+        summary = pipeline.run(max_frames=args.max_frames)
+    finally:
+        pipeline.shutdown()
+
+    if args.json:
+        print(json.dumps(summary, indent=2, default=str))
+    else:
+        print(f"WORKDIR: {workdir}")
+        print_summary(summary)
+    if trace_path:
+        tracer.dump_json(trace_path)
+        print(f"Spans: {trace_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import sys
+import os
+import json
+import argparse
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.ocr_tuning import OCRTuner, DEFAULT_GRIDS, coerce_param, load_samples, write_profile
+
+
+def _fmt_params(params):
+    return " ".join(f"{k}={v}" for k, v in sorted(params.items()))
+
+
+def _parse_grid(region, specs):
+    """["gamma=0.4,0.6", "psm=7"] over the region's default search space."""
+    grid = {k: list(v) for k, v in DEFAULT_GRIDS[region].items()}
+    for spec in specs or []:
+        key, _, values = spec.partition("=")
+        if not values:
+            raise SystemExit(f"Bad --grid entry {spec!r} (expected key=v1,v2)")
+        grid[key] = [coerce_param(key, v) for v in values.split(",")]
+    return grid
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search the best ocr_params profile of a region on labeled crops (process pool, preprocessing cache, successive halving).")
+    parser.add_argument("samples", help="Synthetic corpus (labels.jsonl) or folder of PNG crops labeled by name")
+    parser.add_argument("--region", default="Level", choices=sorted(DEFAULT_GRIDS))
+    parser.add_argument("--config", default=os.path.join("data", "config.json"), help="Current profiles and Tesseract paths")
+    parser.add_argument("--tess-lib", default=None, help="Override config tesseract_lib")
+    parser.add_argument("--tessdata", default=None, help="Override config tessdata_dir")
+    parser.add_argument("--grid", nargs="*", help="Search space overrides: gamma=0.4,0.6 thresh=150,160")
+    parser.add_argument("--workers", type=int, default=None, help="Processes (default: CPU count - 1, 1 = in-process)")
+    parser.add_argument("--eta", type=int, default=3, help="Keep the best 1/eta candidates per rung")
+    parser.add_argument("--min-samples", type=int, default=16, help="Samples read by every candidate on the first rung")
+    parser.add_argument("--cache-size", type=int, default=1024, help="Preprocessed crops kept per worker")
+    parser.add_argument("--limit", type=int, default=None, help="Use only the first N samples")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--write", action="store_true", help="Store the winner in --config (ocr_params)")
+    parser.add_argument("--out", default=None, help="Store the winner in this profile file instead")
+    parser.add_argument("--json", default=None, help="Write the search report to this file")
+    args = parser.parse_args()
+
+    with open(args.config, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    if args.tess_lib:
+        config["tesseract_lib"] = args.tess_lib
+    if args.tessdata:
+        config["tessdata_dir"] = args.tessdata
+
+    samples = load_samples(args.samples, args.region, limit=args.limit)
+    if not samples:
+        print(f"No {args.region} samples in {args.samples}")
+        return
+    grid = _parse_grid(args.region, args.grid)
+
+    tuner = OCRTuner(config, args.region, workers=args.workers, cache_size=args.cache_size,
+                     eta=args.eta, min_samples=args.min_samples, seed=args.seed)
+    try:
+        n_candidates = len(tuner.candidates(grid))
+    except ValueError as e:
+        raise SystemExit(str(e))
+    print(f"{args.region}: {len(samples)} samples, {n_candidates} candidates, {tuner.workers} worker(s)")
+    try:
+        report = tuner.search(samples, grid, progress=lambda r: print(
+            f"  rung: {r['candidates']:>4} candidates x {r['samples']:>5} samples -> "
+            f"best {r['best']['accuracy']:.1%} (conf {r['best']['mean_conf']})"))
+    finally:
+        tuner.close()
+
+    cache = report["cache"]
+    lookups = cache["hits"] + cache["misses"]
+    print(f"\n{report['trials']} trials instead of {report['trials_exhaustive']} (exhaustive), "
+          f"cache hit rate {cache['hits'] / lookups if lookups else 0:.1%}, {report['elapsed_s']}s")
+    if report["labeled"] < report["samples"]:
+        print(f"Warning: {report['samples'] - report['labeled']} unlabeled samples (any number counts as correct)")
+
+    base, best = report["baseline"], report["best"]
+    print(f"\nCurrent : {base['accuracy']:.1%} (conf {base['mean_conf']})  {_fmt_params(base['params'])}")
+    print(f"Best    : {best['accuracy']:.1%} (conf {best['mean_conf']})  {_fmt_params(best['params'])}")
+    print("\nFinalists:")
+    for i, r in enumerate(report["finalists"], 1):
+        print(f"  {i}. {r['accuracy']:.1%} (conf {r['mean_conf']})  {_fmt_params(r['params'])}")
+
+    if args.write or args.out:
+        path = write_profile(args.out or args.config, args.region, best["params"])
+        print(f"\nProfile {args.region} written to {path}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report: {args.json}")
+
+
+if __name__ == "__main__":
+    main()